@@ -0,0 +1,19 @@
+"""
+Async (ASGI-native) versions of the hot read endpoints, mounted under ``/api/async/``.
+
+Each path mirrors its sync DRF counterpart, e.g. ``/api/async/tasks/`` answers
+like ``/api/tasks/``. They also work under WSGI, where Django runs them in an
+event loop per request.
+"""
+from django.urls import path
+
+from project.async_views import ProjectListView
+from task.async_views import OverdueTaskListView, TaskListView
+from user.async_views import ProfileView
+
+urlpatterns = [
+    path('auth/profile/', ProfileView.as_view(), name='async-profile'),
+    path('projects/', ProjectListView.as_view(), name='async-project-list'),
+    path('tasks/', TaskListView.as_view(), name='async-task-list'),
+    path('tasks/overdue/', OverdueTaskListView.as_view(), name='async-task-overdue'),
+]
@@ -0,0 +1,105 @@
+"""
+Async read endpoints served next to the DRF viewsets.
+
+DRF views are synchronous, so under ASGI every request holds a thread-pool
+slot while it waits on the database. ``AsyncReadView`` is a plain Django class
+view with ``async`` handlers: authentication and queries go through the async
+ORM, and serializers only run over rows that were already fetched (with
+``select_related``), so they never touch the database.
+
+Responses are rendered with the API's JSON renderer and use the same
+envelope, so an async endpoint returns the same bytes as its sync
+counterpart. Queries go to a read replica when one is configured (see
+``Trackly/db_router.py``). The async endpoints do not use the response cache
+or conditional requests.
+"""
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound
+
+from user.authentication import CachedJWTAuthentication
+from . import db_router, search
+from .fieldsets import InvalidFieldset
+from .renderers import FastJSONRenderer
+
+
+class AsyncReadView(View):
+    """
+    Authenticated, read-only async view.
+
+    Subclasses implement ``respond``. ``request.user`` and
+    ``request.query_params`` are set before it runs, so DRF paginators and
+    query-parameter helpers work unchanged.
+    """
+    http_method_names = ['get', 'head', 'options']
+    authentication_class = CachedJWTAuthentication
+    renderer = FastJSONRenderer()
+    failure_message = 'Request failed'
+
+    async def get(self, request, *args, **kwargs):
+        authenticator = self.authentication_class()
+        try:
+            result = await authenticator.aauthenticate(request)
+            if result is None:
+                raise NotAuthenticated()
+        except APIException as exc:
+            response = self.render({'detail': exc.detail}, exc.status_code)
+            response['WWW-Authenticate'] = authenticator.authenticate_header(request)
+            return response
+
+        request.user, request.auth = result
+        request.query_params = request.GET
+        alias = db_router.choose_replica(request.user)
+        token = db_router.activate(alias)
+        try:
+            if not search.is_prepared(alias or DEFAULT_DB_ALIAS):
+                await sync_to_async(search.prepare)(alias or DEFAULT_DB_ALIAS)
+            return await self.respond(request, *args, **kwargs)
+        except InvalidFieldset as exc:
+            return self.render(
+                {
+                    'success': False,
+                    'message': exc.message,
+                    'errors': exc.detail
+                },
+                status.HTTP_400_BAD_REQUEST
+            )
+        except NotFound as exc:
+            return self.render(
+                {
+                    'success': False,
+                    'message': str(exc.detail)
+                },
+                status.HTTP_404_NOT_FOUND
+            )
+        except Exception as exc:
+            return self.render(
+                {
+                    'success': False,
+                    'message': self.failure_message,
+                    'errors': str(exc)
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        finally:
+            db_router.deactivate(token)
+
+    async def respond(self, request, *args, **kwargs):
+        """
+        Build the response for an authenticated request; every subclass overrides it.
+
+        Returns ``self.render(data, status)``. ``InvalidFieldset`` and
+        ``NotFound`` raised here become 400 and 404 envelopes, anything else a
+        500 with ``failure_message``.
+        """
+        raise NotImplementedError(f'{type(self).__name__} must implement respond()')
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(
+            self.renderer.render(data),
+            status=status_code,
+            content_type=self.renderer.media_type,
+        )
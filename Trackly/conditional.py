@@ -0,0 +1,109 @@
+"""
+Conditional GET (ETag / Last-Modified) for viewset list and retrieve actions.
+
+Validators come from one aggregate query over the action's queryset: the
+latest ``updated_at``, the row count, and any extra aggregates the view
+declares in ``validator_aggregates``. The ETag also mixes in the owner's
+response-cache version and the request filters. The row count and the
+version both change when rows are deleted, so a delete cannot be hidden
+behind an unchanged ``Max(updated_at)``.
+
+``Last-Modified`` has one-second resolution; clients that need to see writes
+made within the same second should prefer ``If-None-Match``.
+"""
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+
+from . import db_router, response_cache
+
+
+def compute_validators(view, request, kwargs):
+    """
+    Return ``(etag, last_modified_timestamp)`` or ``None`` when there is nothing to validate.
+
+    The result is memoized in the response cache under the owner's current
+    version, so repeated requests between writes skip the aggregate query.
+    Validators read from a replica are not memoized, as they may lag.
+    """
+    lookup = None
+    if view.action == 'retrieve':
+        lookup = kwargs[view.lookup_url_kwarg or view.lookup_field]
+
+    if hasattr(request.query_params, 'lists'):
+        params = sorted((key, sorted(items)) for key, items in request.query_params.lists())
+    else:
+        params = sorted(request.query_params.items())
+    endpoint = f'{view.basename}-{view.action}'
+
+    memoize = response_cache.get_config()['ENABLED']
+    if memoize:
+        cache = response_cache.get_cache()
+        key = response_cache.build_key(
+            request.user.pk, f'{endpoint}:validators',
+            {'lookup': repr(lookup), 'params': repr(params), 'media_type': request.accepted_media_type},
+        )
+        validators = cache.get(key)
+        if validators is not None:
+            return validators or None
+
+    queryset = view.get_queryset()
+    if lookup is not None:
+        queryset = queryset.filter(**{view.lookup_field: lookup})
+    aggregates = {'last_modified': Max('updated_at'), 'rows': Count('pk')}
+    aggregates.update(getattr(view, 'validator_aggregates', {}))
+    try:
+        values = queryset.order_by().aggregate(**aggregates)
+    except (ValueError, TypeError, ValidationError):
+        # Malformed lookup; let the action produce its normal error response
+        return None
+
+    if lookup is not None and not values['rows']:
+        validators = ()
+    else:
+        version = response_cache.get_user_version(request.user.pk)
+        timestamps = [value for value in values.values() if isinstance(value, datetime)]
+        timestamps.append(datetime.fromtimestamp(version / 1e9, tz=dt_timezone.utc))
+        fingerprint = repr((endpoint, lookup, params, sorted(values.items()), version, request.accepted_media_type))
+        etag = '"%s"' % hashlib.sha256(fingerprint.encode()).hexdigest()[:40]
+        validators = (etag, int(max(timestamps).timestamp()))
+
+    if memoize and not db_router.reading_from_replica():
+        cache.set(key, validators, response_cache.get_config()['TIMEOUT'])
+    return validators or None
+
+
+def conditional_response(method):
+    """
+    Answer ``If-None-Match``/``If-Modified-Since`` with 304 before the action runs.
+
+    Successful responses carry ``ETag`` and ``Last-Modified`` headers.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not request.user.is_authenticated:
+            return method(self, request, *args, **kwargs)
+
+        validators = compute_validators(self, request, kwargs)
+        if validators is None:
+            return method(self, request, *args, **kwargs)
+        etag, last_modified = validators
+
+        not_modified = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            not_modified['Last-Modified'] = http_date(last_modified)
+            return not_modified
+
+        response = method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+    return wrapper
@@ -0,0 +1,129 @@
+"""
+Read-replica routing for the API's read-only requests.
+
+While a safe-method (GET, HEAD, OPTIONS) request handled by a view with
+``ReplicaReadMixin`` runs, ``ReplicaRouter`` sends reads of ``Project``,
+``Task`` and ``User`` to one of ``TRACKLY_READ_REPLICAS['ALIASES']``, chosen
+round-robin per request. Writes, unsafe requests and everything outside such
+a request use ``default``. Responses streamed after the view returns (the
+task export) read from ``default`` as well.
+
+Replicas lag behind the primary, so after a user's successful write request
+their reads stay on the primary for ``STICKY_SECONDS`` and they see their own
+changes. The pins live in the ``CACHE_ALIAS`` cache (``responses`` by
+default), which must be shared (file or Redis) when the API runs in several
+processes.
+
+Responses read from a replica are not stored in the response cache, and
+their ETag validators are not memoized: both are kept until the owner's
+next write, so a lagging read would outlive the lag.
+"""
+import itertools
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+
+DEFAULT_READ_REPLICAS = {
+    'ALIASES': [],
+    'STICKY_SECONDS': 5,
+    'CACHE_ALIAS': 'responses',
+    'MODELS': ('project.Project', 'task.Task', 'auth.User'),
+}
+
+_read_alias = ContextVar('trackly_read_alias', default=None)
+_next_replica = itertools.count()
+
+
+def get_config():
+    return {**DEFAULT_READ_REPLICAS, **getattr(settings, 'TRACKLY_READ_REPLICAS', {})}
+
+
+def pin_key(user_id):
+    return f'trackly:db-pin:{user_id}'
+
+
+def pin_to_primary(user):
+    """Send ``user``'s reads to the primary for the next ``STICKY_SECONDS``."""
+    config = get_config()
+    if config['ALIASES'] and config['STICKY_SECONDS']:
+        caches[config['CACHE_ALIAS']].set(pin_key(user.pk), True, config['STICKY_SECONDS'])
+
+
+def is_pinned(user):
+    return bool(caches[get_config()['CACHE_ALIAS']].get(pin_key(user.pk)))
+
+
+def choose_replica(user):
+    """The replica alias for a read request by ``user``, or ``None`` for the primary."""
+    aliases = get_config()['ALIASES']
+    if not aliases or (user.is_authenticated and is_pinned(user)):
+        return None
+    return aliases[next(_next_replica) % len(aliases)]
+
+
+def activate(alias):
+    """Route replica-eligible reads in the current context to ``alias``; returns a reset token."""
+    return _read_alias.set(alias)
+
+
+def deactivate(token):
+    _read_alias.reset(token)
+
+
+def reading_from_replica():
+    """Whether reads in the current context go to a replica."""
+    return _read_alias.get() is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is not None and model._meta.label in get_config()['MODELS']:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Instances read from a replica would otherwise be saved back to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_config()['ALIASES']}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary and receive its schema from there
+        if db in get_config()['ALIASES']:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Serve the view's safe-method requests from a read replica.
+
+    The replica is chosen after authentication, so the user lookup and the
+    sticky-primary check use the primary's view of the user.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = activate(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            deactivate(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            activate(choose_replica(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in SAFE_METHODS and response.status_code < 400 and request.user.is_authenticated:
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
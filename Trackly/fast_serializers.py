@@ -0,0 +1,170 @@
+"""
+Read-only fast path for list endpoints.
+
+``ValuesSerializer`` is derived from a DRF serializer class: it reads exactly
+that serializer's output columns (following ``source`` across joins, e.g.
+``project.owner.username`` -> ``project__owner__username``) with ``values()``
+and builds the same dicts without instantiating a field per row. Dates and
+datetimes are formatted a column at a time, the same way DRF formats them,
+so the rendered JSON is byte-identical.
+
+It can also be limited to some of the serializer's fields (sparse fieldsets,
+see ``Trackly/fieldsets.py``), in which case only their columns and joins
+are read.
+
+Only plain scalar fields, dates/datetimes and primary-key relations are
+supported; a serializer with anything else (method fields, nested
+serializers, decimals) raises ``ImproperlyConfigured`` and the views fall
+back to the DRF serializer.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+def format_datetime(value):
+    """Format like ``serializers.DateTimeField``: current timezone, ``Z`` for UTC."""
+    if value is None:
+        return None
+    if settings.USE_TZ and timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def format_date(value):
+    return value.isoformat() if value is not None else None
+
+
+def format_datetimes(values):
+    """``format_datetime`` over a whole column, resolving the timezone once."""
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+    formatted = []
+    for value in values:
+        if value is None:
+            formatted.append(None)
+            continue
+        if tz is not None and value.tzinfo is not None:
+            value = value.astimezone(tz)
+        value = value.isoformat()
+        formatted.append(value[:-6] + 'Z' if value.endswith('+00:00') else value)
+    return formatted
+
+
+def format_dates(values):
+    return [value.isoformat() if value is not None else None for value in values]
+
+
+# Fields whose representation of a values() cell is the cell itself
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ReadOnlyField,
+)
+
+
+def column_formatter(name, field):
+    """Return the bulk formatter for ``field`` or ``None`` for passthrough columns."""
+    if isinstance(field, serializers.DateTimeField):
+        if getattr(field, 'format', api_settings.DATETIME_FORMAT) != ISO_8601:
+            raise ImproperlyConfigured(f'{name}: only ISO 8601 datetimes are supported')
+        return format_datetimes
+    if isinstance(field, serializers.DateField):
+        if getattr(field, 'format', api_settings.DATE_FORMAT) != ISO_8601:
+            raise ImproperlyConfigured(f'{name}: only ISO 8601 dates are supported')
+        return format_dates
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    if isinstance(field, PASSTHROUGH_FIELDS) and not isinstance(field, serializers.RelatedField):
+        return None
+    raise ImproperlyConfigured(f'{name}: {type(field).__name__} is not supported by ValuesSerializer')
+
+
+class ValuesSerializer:
+    """Serialize ``values()`` rows exactly like ``serializer_class`` serializes instances."""
+    _instances = {}
+
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        self.columns = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            if field.source == '*':
+                raise ImproperlyConfigured(f"{name}: source='*' is not supported by ValuesSerializer")
+            self.columns.append((name, '__'.join(field.source_attrs), column_formatter(name, field)))
+        self.names = [name for name, _, _ in self.columns]
+        self.lookups = list(dict.fromkeys(lookup for _, lookup, _ in self.columns))
+
+    @classmethod
+    def for_serializer(cls, serializer_class, fields=None):
+        """
+        Cached instance for ``serializer_class``, limited to the ``fields`` tuple if given.
+
+        Raises ``ImproperlyConfigured`` if unsupported.
+        """
+        key = (serializer_class, fields)
+        if key not in cls._instances:
+            cls._instances[key] = cls(serializer_class, fields)
+        return cls._instances[key]
+
+    def get_queryset(self, queryset, ordering=()):
+        """
+        ``queryset.values()`` with the output columns.
+
+        Fields named in ``ordering`` are selected too so keyset pagination can
+        build its cursors from the rows.
+        """
+        extra = [field.lstrip('-') for field in ordering]
+        return queryset.values(*dict.fromkeys(self.lookups + extra))
+
+    def to_representation(self, rows):
+        rows = rows if isinstance(rows, list) else list(rows)
+        columns = []
+        for _, lookup, formatter in self.columns:
+            values = [row[lookup] for row in rows]
+            columns.append(formatter(values) if formatter else values)
+        names = self.names
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+class ValuesListMixin:
+    """
+    Viewset mixin that serializes list pages through ``ValuesSerializer``.
+
+    Falls back to the DRF serializer when it has fields the fast path does not
+    support.
+    """
+
+    def get_fieldset(self):
+        """Names of the fields to return, or ``None`` for all (see ``SparseFieldsetMixin``)."""
+        return None
+
+    def get_values_serializer(self):
+        try:
+            return ValuesSerializer.for_serializer(self.get_serializer_class(), self.get_fieldset())
+        except ImproperlyConfigured:
+            return None
+
+    def serialize_rows(self, queryset):
+        """Representation of every row of ``queryset``."""
+        fast = self.get_values_serializer()
+        if fast is None:
+            return self.get_serializer(queryset, many=True).data
+        return fast.to_representation(fast.get_queryset(queryset))
+
+    def paginate_rows(self, queryset):
+        """Paginate ``queryset`` and return the representation of the page."""
+        fast = self.get_values_serializer()
+        if fast is None:
+            page = self.paginate_queryset(queryset)
+            return self.get_serializer(page, many=True).data
+        get_ordering = getattr(self.paginator, 'get_ordering', None)
+        ordering = get_ordering(queryset) if get_ordering else ()
+        return fast.to_representation(self.paginate_queryset(fast.get_queryset(queryset, ordering)))
@@ -0,0 +1,143 @@
+"""
+Sparse fieldsets: ``?fields=`` and ``?exclude=`` on read endpoints.
+
+``?fields=id,title,status,due_date`` returns only those serializer fields and
+``?exclude=description`` all but those; both take comma-separated names and
+combine. Narrowing also reaches the SQL: list pages select just the columns
+behind the requested fields (see ``ValuesSerializer``), and querysets read
+for instances get ``only()`` those columns, with ``select_related`` cut down
+to the relations a requested field crosses. A task list without
+``project_name``/``project_owner`` therefore never joins the owner, and one
+without ``description`` never reads it.
+
+Unknown names are rejected with ``InvalidFieldset`` (400) instead of being
+ignored, so typos don't silently return less than expected.
+"""
+import functools
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .fast_serializers import ValuesSerializer
+
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+
+
+class InvalidFieldset(ValidationError):
+    message = 'Invalid fieldset'
+
+
+@functools.lru_cache(maxsize=None)
+def readable_fields(serializer_class):
+    """``{name: lookup}`` of the fields ``serializer_class`` outputs, in output order."""
+    return {
+        name: '__'.join(field.source_attrs)
+        for name, field in serializer_class().fields.items()
+        if not field.write_only
+    }
+
+
+def parse_names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def select_fields(query_params, serializer_class):
+    """
+    Names of ``serializer_class``'s fields chosen by ``?fields=``/``?exclude=``, or ``None`` for all.
+
+    The names keep the serializer's order, whatever order they were requested in.
+    """
+    requested = parse_names(query_params.get(FIELDS_PARAM, ''))
+    excluded = parse_names(query_params.get(EXCLUDE_PARAM, ''))
+    if not requested and not excluded:
+        return None
+
+    available = readable_fields(serializer_class)
+    errors = {}
+    for param, names in ((FIELDS_PARAM, requested), (EXCLUDE_PARAM, excluded)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = [f'Unknown fields: {", ".join(unknown)}. Available: {", ".join(available)}']
+    if errors:
+        raise InvalidFieldset(errors)
+
+    selected = tuple(
+        name for name in available
+        if (not requested or name in requested) and name not in excluded
+    )
+    if not selected:
+        raise InvalidFieldset({EXCLUDE_PARAM: ['At least one field must remain']})
+    return selected
+
+
+def narrow_queryset(queryset, lookups):
+    """``only()`` the columns behind ``lookups``, joining just the relations they cross."""
+    relations = {lookup.rsplit('__', 1)[0] for lookup in lookups if '__' in lookup}
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*dict.fromkeys(lookups))
+
+
+def values_serializer(serializer_class, query_params):
+    """``ValuesSerializer`` for the fields ``query_params`` selects; for views without a viewset."""
+    return ValuesSerializer.for_serializer(serializer_class, select_fields(query_params, serializer_class))
+
+
+class SparseFieldsetMixin:
+    """
+    Viewset mixin applying ``?fields=``/``?exclude=`` to ``fieldset_actions``.
+
+    Only actions whose response is the serializer's representation are
+    listed: write actions validate input with every field, and other reads
+    (such as a project's progress) need columns the fieldset would defer.
+    """
+    fieldset_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Reject unknown names before the action's own error handling can see them
+        self.get_fieldset()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, InvalidFieldset):
+            return Response(
+                {
+                    'success': False,
+                    'message': exc.message,
+                    'errors': exc.detail
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return super().handle_exception(exc)
+
+    def get_fieldset(self):
+        """Selected field names for this request, or ``None`` for all fields."""
+        if self.action not in self.fieldset_actions:
+            return None
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = select_fields(self.request.query_params, self.get_serializer_class())
+        return self._fieldset
+
+    def filter_queryset(self, queryset):
+        # Instances are read through here (``get_object``); list pages go
+        # through ``ValuesSerializer``, which is narrowed by ``get_fieldset``
+        queryset = super().filter_queryset(queryset)
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return queryset
+        available = readable_fields(self.get_serializer_class())
+        return narrow_queryset(queryset, [available[name] for name in fieldset])
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for name in list(fields):
+                if name not in fieldset:
+                    fields.pop(name)
+        return serializer
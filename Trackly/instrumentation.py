@@ -0,0 +1,275 @@
+"""
+Per-request performance instrumentation.
+
+``InstrumentationMiddleware`` measures, for every request:
+
+    queries  number of SQL statements, on any database alias
+    db       time spent executing them (``connection.execute_wrapper``)
+    view     time from calling the view until it returned its response
+    render   time spent rendering a DRF ``Response`` (the JSON renderer)
+    total    time spent inside the middleware stack
+
+Each measurement goes into a per-process histogram keyed by method and URL
+name (``GET task-list``), readable with ``get_stats()``, and the request is
+counted in the Prometheus metrics served at ``/metrics`` (see
+``Trackly/metrics.py``). With
+``SERVER_TIMING`` the timings are also sent back in a ``Server-Timing``
+header, which browser dev tools show next to the request.
+
+Queries are timed by one execute wrapper (see ``connection.execute_wrapper``)
+installed on every database connection when it opens, which records into the
+current request's ``RequestMetrics`` through a context variable. The
+variable follows the request into ``sync_to_async`` threads, so async views
+are measured too, and installing the wrapper once keeps the per-request cost
+to setting that variable.
+
+The middleware removes itself from the stack at startup when ``ENABLED`` is
+off, so disabled instrumentation costs nothing per request.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from . import metrics as prometheus
+
+
+DEFAULT_INSTRUMENTATION = {
+    'ENABLED': True,
+    'SERVER_TIMING': False,
+    'BUCKETS_MS': (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+    'QUERY_BUCKETS': (0, 1, 2, 3, 5, 10, 20, 50, 100),
+}
+
+TIMINGS = ('total', 'view', 'db', 'render')
+UNMATCHED = 'unmatched'
+
+_current = ContextVar('trackly_request_metrics', default=None)
+_stats_lock = threading.Lock()
+_histograms = {}
+
+
+def get_config():
+    return {**DEFAULT_INSTRUMENTATION, **getattr(settings, 'TRACKLY_INSTRUMENTATION', {})}
+
+
+def duration_bounds(config=None):
+    """``BUCKETS_MS`` in seconds, the bounds of the exported latency histogram."""
+    return tuple(bound / 1000 for bound in (config or get_config())['BUCKETS_MS'])
+
+
+def append_server_timing(response, entry):
+    existing = response.get('Server-Timing')
+    response['Server-Timing'] = f'{existing}, {entry}' if existing else entry
+
+
+class Histogram:
+    """Counts of observations at or below each of ``bounds``, plus one overflow bucket."""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the ``fraction`` quantile (``None`` past the last bound)."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def as_dict(self):
+        cumulative = []
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            cumulative.append((bound, seen))
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'p50': self.percentile(0.50),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            # Cumulative counts of observations <= each bound
+            'buckets': cumulative,
+        }
+
+
+class RequestMetrics:
+    """Timings of one request, in seconds."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_ended = None
+        self.render_started = None
+        self.render_ended = None
+        self.finished = None
+        self.queries = 0
+        self.db_seconds = 0.0
+
+    def rendered(self, response):
+        self.render_ended = time.perf_counter()
+
+    def finish(self):
+        self.finished = time.perf_counter()
+        if self.view_started is not None and self.view_ended is None:
+            # Responses that are not rendered later (streaming, plain HttpResponse)
+            self.view_ended = self.finished
+
+    def timings(self):
+        """Milliseconds per phase of ``TIMINGS``."""
+        view = self.view_ended - self.view_started if self.view_started is not None else 0.0
+        render = self.render_ended - self.render_started if self.render_ended is not None else 0.0
+        return {
+            'total': (self.finished - self.started) * 1000,
+            'view': view * 1000,
+            'db': self.db_seconds * 1000,
+            'render': render * 1000,
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper adding the query to the current request's metrics, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_seconds += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def install_query_wrapper(sender=None, connection=None, **kwargs):
+    """``connection_created`` receiver; also called for connections opened before the middleware loaded."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED
+    return match.view_name or match.route or UNMATCHED
+
+
+def record(method, endpoint, metrics, config=None):
+    config = config or get_config()
+    timings = metrics.timings()
+    with _stats_lock:
+        histograms = _histograms.get((method, endpoint))
+        if histograms is None:
+            histograms = {name: Histogram(config['BUCKETS_MS']) for name in TIMINGS}
+            histograms['queries'] = Histogram(config['QUERY_BUCKETS'])
+            _histograms[(method, endpoint)] = histograms
+        for name in TIMINGS:
+            histograms[name].observe(timings[name])
+        histograms['queries'].observe(metrics.queries)
+    return timings
+
+
+def get_stats():
+    """Histograms for this process: ``{'GET task-list': {'total': {...}, 'queries': {...}, ...}}``."""
+    with _stats_lock:
+        return {
+            f'{method} {endpoint}': {name: histogram.as_dict() for name, histogram in histograms.items()}
+            for (method, endpoint), histograms in sorted(_histograms.items())
+        }
+
+
+def reset_stats():
+    with _stats_lock:
+        _histograms.clear()
+
+
+class InstrumentationMiddleware:
+    """
+    Measure each request; keep it first in ``MIDDLEWARE`` so ``total`` covers the whole stack.
+
+    Queries are counted on every database alias, including read replicas.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.config = get_config()
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = self.config['SERVER_TIMING']
+        self.export = prometheus.get_config()['ENABLED']
+        self.bounds = duration_bounds(self.config)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_wrapper, dispatch_uid='trackly.instrumentation')
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(connection=connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        request.instrumentation = metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        request.instrumentation = metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.instrumentation.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called between the view returning and the response being rendered
+        metrics = request.instrumentation
+        metrics.view_ended = metrics.render_started = time.perf_counter()
+        response.add_post_render_callback(metrics.rendered)
+        return response
+
+    def finish(self, request, response, metrics):
+        metrics.finish()
+        endpoint = endpoint_name(request)
+        timings = record(request.method, endpoint, metrics, self.config)
+        if self.export:
+            prometheus.observe_request(
+                request.method, endpoint, response.status_code, timings['total'] / 1000,
+                metrics.queries, metrics.db_seconds, self.bounds,
+            )
+        if self.server_timing:
+            append_server_timing(
+                response,
+                f'db;dur={timings["db"]:.3f};desc="{metrics.queries} queries", '
+                f'view;dur={timings["view"]:.3f}, render;dur={timings["render"]:.3f}, '
+                f'total;dur={timings["total"]:.3f}',
+            )
+        return response
@@ -0,0 +1,360 @@
+"""
+Prometheus metrics for every worker process, served at ``/metrics``.
+
+Counters are fed by ``InstrumentationMiddleware`` (requests, errors, latency
+histograms and database queries per route, i.e. per URL name such as
+``task-list`` or ``task-update-status``) and by the response and
+authentication caches (hits and misses). The cache hit ratios are computed at
+scrape time from the summed counters.
+
+A single process keeps its counters in memory. Servers running several
+worker processes set ``DIRECTORY`` to a directory shared by the workers: each
+process then adds to its own memory-mapped file there (``FileStore``) and a
+scrape handled by any worker sums all the files, so every worker is reported
+without an external collector. Files of exited workers are kept so counters
+never go backwards; empty the directory before the server starts.
+"""
+import bisect
+import functools
+import glob
+import hmac
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+
+DEFAULT_METRICS = {
+    'ENABLED': True,
+    'DIRECTORY': None,
+    # When set, scrapes must send ``Authorization: Bearer <TOKEN>``
+    'TOKEN': None,
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+FAMILIES = {
+    'trackly_http_requests_total': ('counter', 'HTTP requests by route, method and status code.'),
+    'trackly_http_request_errors_total': ('counter', 'HTTP responses with a 4xx or 5xx status, by status class.'),
+    'trackly_http_request_duration_seconds': ('histogram', 'Time spent handling HTTP requests.'),
+    'trackly_db_queries_total': ('counter', 'SQL queries run while handling HTTP requests.'),
+    'trackly_db_query_duration_seconds_total': ('counter', 'Time spent in SQL queries while handling HTTP requests.'),
+    'trackly_cache_requests_total': ('counter', 'Cache lookups by cache and result.'),
+    'trackly_cache_hit_ratio': ('gauge', 'Share of cache lookups that were hits, over all workers.'),
+}
+HISTOGRAM_SUFFIXES = ('_bucket', '_sum', '_count')
+
+
+def get_config():
+    return {**DEFAULT_METRICS, **getattr(settings, 'TRACKLY_METRICS', {})}
+
+
+@functools.lru_cache(maxsize=4096)
+def series_key(name, labels=()):
+    """Storage key of a sample: ``name`` and its ``(label, value)`` pairs as compact JSON."""
+    return json.dumps([name, labels], separators=(',', ':'))
+
+
+@functools.lru_cache(maxsize=16384)
+def parse_key(key):
+    name, labels = json.loads(key)
+    return name, tuple(tuple(label) for label in labels)
+
+
+class MemoryStore:
+    """Counters of this process only."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+
+    def inc(self, key, amount=1.0):
+        with self._lock:
+            self._values[key] += amount
+
+    def inc_many(self, amounts):
+        with self._lock:
+            for key, amount in amounts:
+                self._values[key] += amount
+
+    def items(self):
+        with self._lock:
+            return list(self._values.items())
+
+
+class FileStore:
+    """
+    Counters in a memory-mapped file written by one process and read by any.
+
+    The file starts with the number of bytes in use, followed by entries of a
+    key length, the UTF-8 key padded to 8 bytes, and a float64 value. Values
+    are updated in place; a new entry is written in full before the used size
+    covers it, so readers never see half an entry.
+    """
+    initial_size = 64 * 1024
+    header = struct.Struct('<I4x')
+    length = struct.Struct('<I')
+    value = struct.Struct('<d')
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._offsets = {}
+        self._file = open(path, 'a+b')
+        if os.fstat(self._file.fileno()).st_size < self.initial_size:
+            self._file.truncate(self.initial_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._used = self.header.unpack_from(self._map, 0)[0] or self.header.size
+        for key, _, offset in self._entries(self._map, self._used):
+            self._offsets[key] = offset
+
+    @classmethod
+    def _entries(cls, data, used):
+        """Yield ``(key, value, value_offset)`` for each entry in ``data[:used]``."""
+        position = cls.header.size
+        while position < used:
+            length = cls.length.unpack_from(data, position)[0]
+            key_start = position + cls.length.size
+            offset = key_start + length + (-(cls.length.size + length) % 8)
+            key = bytes(data[key_start:key_start + length]).decode()
+            yield key, cls.value.unpack_from(data, offset)[0], offset
+            position = offset + cls.value.size
+
+    @classmethod
+    def read(cls, path):
+        """``(key, value)`` pairs of the file at ``path``, which another process may be writing."""
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < cls.header.size:
+            return []
+        used = min(cls.header.unpack_from(data, 0)[0], len(data))
+        return [(key, value) for key, value, _ in cls._entries(data, used)]
+
+    def inc(self, key, amount=1.0):
+        self.inc_many(((key, amount),))
+
+    def inc_many(self, amounts):
+        with self._lock:
+            for key, amount in amounts:
+                offset = self._offsets.get(key)
+                if offset is None:
+                    offset = self._append(key)
+                self.value.pack_into(self._map, offset, self.value.unpack_from(self._map, offset)[0] + amount)
+
+    def _append(self, key):
+        encoded = key.encode()
+        padding = -(self.length.size + len(encoded)) % 8
+        size = self.length.size + len(encoded) + padding + self.value.size
+        if self._used + size > len(self._map):
+            self._grow(self._used + size)
+        position = self._used
+        self.length.pack_into(self._map, position, len(encoded))
+        start = position + self.length.size
+        self._map[start:start + len(encoded)] = encoded
+        offset = start + len(encoded) + padding
+        self.value.pack_into(self._map, offset, 0.0)
+        self._used += size
+        self.header.pack_into(self._map, 0, self._used)
+        self._offsets[key] = offset
+        return offset
+
+    def _grow(self, needed):
+        size = len(self._map)
+        while size < needed:
+            size *= 2
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def items(self):
+        with self._lock:
+            return [(key, value) for key, value, _ in self._entries(self._map, self._used)]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+_store_lock = threading.Lock()
+_store = None
+_store_owner = None
+
+
+def get_store():
+    """This process's store; a ``FileStore`` in ``DIRECTORY`` when one is configured."""
+    global _store, _store_owner
+    directory = get_config()['DIRECTORY']
+    owner = (os.getpid(), directory)
+    if _store_owner != owner:
+        with _store_lock:
+            if _store_owner != owner:
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                    _store = FileStore(os.path.join(directory, f'trackly-{os.getpid()}.db'))
+                else:
+                    _store = MemoryStore()
+                _store_owner = owner
+    return _store
+
+
+def reset():
+    """Forget this process's counters (tests); a ``FileStore``'s file is left in place."""
+    global _store, _store_owner
+    with _store_lock:
+        _store = None
+        _store_owner = None
+
+
+def collect():
+    """Summed ``{key: value}`` over all worker processes (or this one without ``DIRECTORY``)."""
+    directory = get_config()['DIRECTORY']
+    if not directory:
+        return dict(get_store().items())
+    totals = defaultdict(float)
+    for path in glob.glob(os.path.join(directory, 'trackly-*.db')):
+        try:
+            items = FileStore.read(path)
+        except OSError:
+            continue
+        for key, value in items:
+            totals[key] += value
+    return totals
+
+
+@functools.lru_cache(maxsize=1024)
+def request_keys(method, route, status, bounds):
+    """Keys of the series one request updates, built once per method, route and status."""
+    labels = (('method', method), ('route', route))
+    errors = None
+    if status >= 400:
+        errors = series_key('trackly_http_request_errors_total', labels + (('class', f'{status // 100}xx'),))
+    return {
+        'requests': series_key('trackly_http_requests_total', labels + (('status', str(status)),)),
+        'errors': errors,
+        'buckets': tuple(
+            series_key('trackly_http_request_duration_seconds_bucket', labels + (('le', le),))
+            for le in (*map(format_value, bounds), '+Inf')
+        ),
+        'sum': series_key('trackly_http_request_duration_seconds_sum', labels),
+        'count': series_key('trackly_http_request_duration_seconds_count', labels),
+        'queries': series_key('trackly_db_queries_total', labels),
+        'db': series_key('trackly_db_query_duration_seconds_total', labels),
+    }
+
+
+def observe_request(method, route, status, seconds, queries, db_seconds, bounds):
+    """Count one request; ``bounds`` are the latency histogram's bucket bounds in seconds."""
+    keys = request_keys(method, route, status, bounds)
+    amounts = [
+        (keys['requests'], 1.0),
+        (keys['buckets'][bisect.bisect_left(bounds, seconds)], 1.0),
+        (keys['sum'], seconds),
+        (keys['count'], 1.0),
+    ]
+    if keys['errors']:
+        amounts.append((keys['errors'], 1.0))
+    if queries:
+        amounts.append((keys['queries'], queries))
+        amounts.append((keys['db'], db_seconds))
+    get_store().inc_many(amounts)
+
+
+def count_cache(cache, hit):
+    get_store().inc(series_key('trackly_cache_requests_total', (('cache', cache), ('result', 'hit' if hit else 'miss'))))
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels) + '}'
+
+
+def family_of(name):
+    if name not in FAMILIES:
+        for suffix in HISTOGRAM_SUFFIXES:
+            if name.endswith(suffix) and name[:-len(suffix)] in FAMILIES:
+                return name[:-len(suffix)]
+    return name
+
+
+def cache_ratios(samples):
+    lookups = defaultdict(lambda: [0.0, 0.0])
+    for (name, labels), value in samples.items():
+        if name == 'trackly_cache_requests_total':
+            labels = dict(labels)
+            lookups[labels['cache']][labels['result'] == 'hit'] += value
+    return {
+        ('trackly_cache_hit_ratio', (('cache', cache),)): hits / (hits + misses)
+        for cache, (misses, hits) in lookups.items() if hits + misses
+    }
+
+
+def render(totals, bounds=()):
+    """Prometheus text exposition of ``collect()`` output; ``bounds`` are the histogram bucket bounds."""
+    samples = {parse_key(key): value for key, value in totals.items()}
+    samples.update(cache_ratios(samples))
+
+    families = defaultdict(list)
+    for (name, labels), value in samples.items():
+        families[family_of(name)].append((name, labels, value))
+
+    lines = []
+    for family in sorted(families):
+        kind, help_text = FAMILIES.get(family, ('untyped', ''))
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {kind}')
+        rows = sorted(families[family])
+        if kind == 'histogram':
+            rows = cumulative_buckets(family, rows, bounds)
+        for name, labels, value in rows:
+            lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def cumulative_buckets(family, rows, bounds=()):
+    """Turn the stored per-bucket counts into Prometheus's cumulative ``le`` buckets, ``+Inf`` included."""
+    buckets = defaultdict(dict)
+    others = []
+    for name, labels, value in rows:
+        if name == f'{family}_bucket':
+            le = dict(labels)['le']
+            buckets[tuple(label for label in labels if label[0] != 'le')][le] = value
+        else:
+            others.append((name, labels, value))
+
+    result = []
+    for labels, counts in sorted(buckets.items()):
+        total = 0.0
+        for le in sorted({*counts, *map(format_value, bounds), '+Inf'}, key=float):
+            total += counts.get(le, 0.0)
+            result.append((f'{family}_bucket', labels + (('le', le),), total))
+    return result + others
+
+
+def metrics_view(request):
+    """``GET /metrics``: every worker's counters in the Prometheus text format."""
+    from .instrumentation import duration_bounds
+
+    config = get_config()
+    if not config['ENABLED']:
+        return HttpResponse(status=404)
+    if config['TOKEN']:
+        expected = f'Bearer {config["TOKEN"]}'
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+            return HttpResponseForbidden()
+    return HttpResponse(render(collect(), duration_bounds()), content_type=CONTENT_TYPE)
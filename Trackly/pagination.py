@@ -0,0 +1,225 @@
+"""
+Keyset (cursor) pagination shared by the project and task list endpoints.
+
+Pages are addressed by an opaque cursor that encodes the ordering values of
+the last (or first) row of the previous page, so fetching page N costs the
+same indexed range scan as fetching page 1 instead of an OFFSET scan.
+Full-text search results are paged in relevance order instead.
+"""
+import base64
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+from . import search
+
+
+DEFAULT_PAGINATION = {
+    'PAGE_SIZE': 50,
+    'MAX_PAGE_SIZE': 500,
+    'COUNT': 'exact',
+    'ESTIMATE_CAP': 1000,
+}
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate a queryset on a unique ordering such as ``('-created_at', '-id')``.
+
+    Query parameters:
+        cursor     opaque position returned as ``next``/``previous``
+        page_size  rows per page, capped at ``MAX_PAGE_SIZE``
+        count      ``exact`` (COUNT query), ``estimate`` or ``none``
+    """
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+    count_modes = ('exact', 'estimate', 'none')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        config = {**DEFAULT_PAGINATION, **getattr(settings, 'TRACKLY_PAGINATION', {})}
+        self.default_page_size = config['PAGE_SIZE']
+        self.max_page_size = config['MAX_PAGE_SIZE']
+        self.default_count_mode = config['COUNT']
+        self.estimate_cap = config['ESTIMATE_CAP']
+        self.page_ordering = self.ordering
+        self.count = None
+        self.next_cursor = None
+        self.previous_cursor = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset, page_size, reverse, position = self.get_page_queryset(queryset, request)
+        rows = self.finish_page(list(page_queryset[:page_size + 1]), page_size, reverse, position)
+        self.count = self.get_count(queryset, request)
+        return rows
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, using the async ORM."""
+        page_queryset, page_size, reverse, position = self.get_page_queryset(queryset, request)
+        rows = self.finish_page([row async for row in page_queryset[:page_size + 1]], page_size, reverse, position)
+        self.count = await self.aget_count(queryset, request)
+        return rows
+
+    def get_page_queryset(self, queryset, request):
+        """Return ``(page_queryset, page_size, reverse, position)``; fetch ``page_size + 1`` rows from it."""
+        page_size = self.get_page_size(request)
+        self.page_ordering = ordering = self.get_ordering(queryset)
+        reverse, position = self.decode_cursor(request, queryset.model)
+
+        if reverse:
+            ordering = tuple(self._flip(field) for field in ordering)
+
+        page_queryset = queryset.order_by(*ordering)
+        if position is not None:
+            page_queryset = page_queryset.filter(self._after(ordering, position))
+        return page_queryset, page_size, reverse, position
+
+    def get_ordering(self, queryset):
+        """``ordering``, or relevance order for full-text search results."""
+        if search.is_search(queryset):
+            return search.RANK_ORDERING
+        return self.ordering
+
+    def finish_page(self, rows, page_size, reverse, position):
+        """Trim the look-ahead row, restore display order and build the cursors."""
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next = has_more if not reverse else True
+        has_previous = position is not None if not reverse else has_more
+
+        self.next_cursor = None
+        self.previous_cursor = None
+        if rows and has_next:
+            self.next_cursor = self.encode_cursor(False, self._position(rows[-1]))
+        if rows and has_previous:
+            self.previous_cursor = self.encode_cursor(True, self._position(rows[0]))
+        return rows
+
+    def get_envelope_fields(self):
+        """Fields merged into the ``success/message/data`` response envelope."""
+        return {
+            'count': self.count,
+            'next': self.next_cursor,
+            'previous': self.previous_cursor,
+        }
+
+    def get_paginated_response(self, data):
+        return Response({'data': data, **self.get_envelope_fields()})
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.default_page_size
+        if page_size <= 0:
+            return self.default_page_size
+        return min(page_size, self.max_page_size)
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param, self.default_count_mode)
+        return mode if mode in self.count_modes else self.default_count_mode
+
+    def get_count(self, queryset, request):
+        mode = self.get_count_mode(request)
+        if mode == 'none':
+            return None
+        if mode == 'estimate':
+            return self.estimate_count(queryset)
+        return queryset.count()
+
+    async def aget_count(self, queryset, request):
+        mode = self.get_count_mode(request)
+        if mode == 'none':
+            return None
+        if mode == 'estimate':
+            return await sync_to_async(self.estimate_count)(queryset)
+        return await queryset.acount()
+
+    def estimate_count(self, queryset):
+        """
+        Return a cheap row count.
+
+        PostgreSQL reports the planner's row estimate; other backends count
+        at most ``ESTIMATE_CAP`` rows so the scan stops early on huge accounts.
+        """
+        queryset = queryset.order_by()
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        return queryset[:self.estimate_cap].count()
+
+    def encode_cursor(self, reverse, position):
+        payload = {
+            'r': int(reverse),
+            'p': [value.isoformat() if hasattr(value, 'isoformat') else value for value in position],
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload['p']
+            if len(values) != len(self.page_ordering):
+                raise ValueError
+            position = [
+                self.to_python(model, field.lstrip('-'), value)
+                for field, value in zip(self.page_ordering, values)
+            ]
+            return bool(payload.get('r')), position
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def to_python(model, name, value):
+        try:
+            return model._meta.get_field(name).to_python(value)
+        except FieldDoesNotExist:
+            # Annotations such as the search rank are JSON numbers already
+            if not isinstance(value, (int, float)):
+                raise ValueError(name)
+            return value
+
+    def _position(self, row):
+        names = [field.lstrip('-') for field in self.page_ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _after(ordering, position):
+        """Build the ``(a, b) < (x, y)`` style row comparison for ``ordering``."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
@@ -0,0 +1,38 @@
+"""
+JSON parser backed by orjson when it is installed.
+
+UTF-8 request bodies are parsed with ``orjson.loads``. Bodies orjson rejects
+(malformed JSON) are re-parsed by DRF's ``JSONParser`` so error messages stay
+the same. orjson reads integers wider than 64 bits as floats, so bodies with
+a run of 20 or more digits go straight to the stdlib parser. Other encodings,
+and everything when orjson is not installed, use the stdlib path too.
+"""
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import FastJSONRenderer, orjson
+
+
+# Digits map to b'0', so a 20-digit run becomes a plain substring search
+DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+WIDE_INTEGER = b'0' * 20
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if WIDE_INTEGER in body.translate(DIGITS_TO_ZERO):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,45 @@
+"""
+JSON renderer backed by orjson when it is installed.
+
+``FastJSONRenderer`` produces the same bytes as DRF's ``JSONRenderer`` for
+the types our serializers emit: datetimes, dates and times are handed back to
+DRF's encoder (``OPT_PASSTHROUGH_DATETIME``), as are Decimals, lazy strings and
+anything else orjson does not know natively. UUIDs are encoded natively in
+the same canonical form. The one known difference is the notation of floats
+in exponent form (``1e16`` rather than ``1e+16``); the values are identical.
+
+Anything orjson refuses (non-string dict keys, integers over 64 bits),
+indented output for the browsable API, and non-default ``UNICODE_JSON``/
+``COMPACT_JSON`` settings fall back to the stdlib path, as does everything
+when orjson is not installed.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    options = 0
+    if orjson is not None:
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping of U+2028/U+2029 as JSONRenderer
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,138 @@
+"""
+Per-user versioned cache for list responses.
+
+Cached entries are keyed by user, endpoint, the user's current version and
+the normalized query parameters. Writes never delete entries; they bump the
+owner's version so every key built afterwards misses, and the stale entries
+age out of the (LRU-bounded) cache backend on their own.
+
+Versions are nanosecond timestamps rather than counters, so a version key that
+is evicted and recreated can never collide with an older one.
+"""
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import db_router, metrics
+
+
+DEFAULT_RESPONSE_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'responses',
+    'TIMEOUT': 300,
+}
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def get_config():
+    return {**DEFAULT_RESPONSE_CACHE, **getattr(settings, 'TRACKLY_RESPONSE_CACHE', {})}
+
+
+def get_cache():
+    return caches[get_config()['ALIAS']]
+
+
+def get_stats():
+    """Hit/miss/invalidation counters for this process."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_stats():
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+    if name != 'invalidations':
+        metrics.count_cache('response', name == 'hits')
+
+
+def _version_key(user_id):
+    return f'trackly:version:{user_id}'
+
+
+def get_user_version(user_id):
+    cache = get_cache()
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # add() keeps a version another worker set in the meantime
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(user_id):
+    cache = get_cache()
+    key = _version_key(user_id)
+    current = cache.get(key) or 0
+    cache.set(key, max(time.time_ns(), current + 1), timeout=None)
+
+
+def invalidate_user(user_id):
+    """
+    Make every cached response of ``user_id`` unreachable.
+
+    Inside a transaction the version is bumped again on commit: a request
+    racing the write may cache the pre-commit rows under the first bump.
+    """
+    if user_id is None:
+        return
+    _bump_version(user_id)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump_version(user_id))
+    _count('invalidations')
+
+
+def build_key(user_id, endpoint, params):
+    """Cache key for ``endpoint`` with query ``params`` at the user's current version."""
+    if hasattr(params, 'lists'):
+        items = sorted((key, sorted(values)) for key, values in params.lists())
+    else:
+        items = sorted(params.items())
+    digest = hashlib.sha256(repr(items).encode()).hexdigest()[:32]
+    return f'trackly:response:{user_id}:{get_user_version(user_id)}:{endpoint}:{digest}'
+
+
+def cache_response(method):
+    """
+    Cache the ``response.data`` of a successful viewset action per user.
+
+    The endpoint part of the key is ``<basename>-<action>``, e.g. ``task-list``.
+    Responses read from a lagging replica are served but not stored.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        config = get_config()
+        if not config['ENABLED'] or not request.user.is_authenticated:
+            return method(self, request, *args, **kwargs)
+
+        cache = get_cache()
+        key = build_key(request.user.pk, f'{self.basename}-{self.action}', request.query_params)
+        data = cache.get(key)
+        if data is not None:
+            _count('hits')
+            return Response(data, status=status.HTTP_200_OK)
+
+        _count('misses')
+        response = method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and not db_router.reading_from_replica():
+            cache.set(key, response.data, config['TIMEOUT'])
+        return response
+    return wrapper
@@ -0,0 +1,207 @@
+"""
+Full-text search over the title and description of tasks and projects.
+
+SQLite keeps an FTS5 index per table (``<table>_fts``) as an external-content
+table over the model's table, so the text itself is stored once. Triggers on
+the model table keep it in step with every insert, delete and title or
+description update, including ``bulk_create`` and queryset ``update()``.
+PostgreSQL instead gets a generated ``search_vector`` tsvector column with a
+GIN index. Both are created by migrations, which carry a frozen copy of the
+DDL; other backends, and SQLite builds without FTS5, fall back to
+``icontains`` matching without ranking.
+
+On SQLite each FTS5 table is also mapped to an unmanaged model
+(``TaskSearchEntry``, ``ProjectSearchEntry``) one-to-one with its row, so
+``search(queryset, query)`` joins it through the ORM: it narrows an
+already-scoped queryset (owner filters stay in force) with a ``match``
+lookup on the index and annotates ``search_rank`` from ``bm25()`` in the same
+query. PostgreSQL filters on the tsvector column instead. Lower ranks are
+more relevant;
+``RANK_ORDERING`` orders by it with the id as tiebreaker, and
+``KeysetPagination`` switches to it for search results.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Func, Lookup, Q, TextField, Value
+from django.db.models.expressions import RawSQL
+
+
+RANK = 'search_rank'
+RANK_ORDERING = (RANK, '-id')
+
+POSTGRES_CONFIG = 'english'
+
+WORD = re.compile(r'\w+')
+
+
+def match_expression(query):
+    """
+    FTS5 query for free text: every word must match, the last one as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation typed by users are
+    searched as plain text instead of raising syntax errors.
+    """
+    words = WORD.findall(query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+class SearchDocumentField(TextField):
+    """
+    The hidden column FTS5 names after its table, standing for the whole row.
+
+    Only usable as the left-hand side of ``match`` and as the argument of
+    ``BM25``; the model exposing it is never loaded.
+    """
+
+
+@SearchDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class BM25(Func):
+    """FTS5 ``bm25()`` of the matched row, one weight per indexed column."""
+    function = 'bm25'
+    output_field = FloatField()
+
+    def __init__(self, document, weights):
+        super().__init__(document, *(Value(weight) for weight in weights))
+
+
+class SearchIndex:
+    """
+    Full-text index over ``columns`` of ``table``; ``weights`` rank earlier columns higher.
+
+    ``relation`` is the reverse one-to-one name of the model mapped to the
+    SQLite FTS5 table, whose ``document`` field is its hidden table column.
+    """
+
+    def __init__(self, table, relation, columns=('title', 'description'), weights=(10.0, 1.0)):
+        self.table = table
+        self.relation = relation
+        self.columns = columns
+        self.weights = weights
+        self.fts_table = f'{table}_fts'
+        self._enabled = {}
+
+    # Schema
+
+    def create_triggers(self, executor):
+        """
+        (Re)create the SQLite sync triggers with ``executor`` (a schema editor or cursor).
+
+        The migrations create the triggers with the same SQL. Django's SQLite
+        schema editor rebuilds a table for many ``ALTER`` operations and the
+        triggers are dropped with the old table, so this runs after every
+        ``migrate`` (see ``ensure_triggers``).
+        """
+        columns = ', '.join(self.columns)
+        new = ', '.join(f'new.{column}' for column in self.columns)
+        old = ', '.join(f'old.{column}' for column in self.columns)
+        insert = f'INSERT INTO {self.fts_table}(rowid, {columns}) VALUES (new.id, {new});'
+        delete = (
+            f"INSERT INTO {self.fts_table}({self.fts_table}, rowid, {columns}) "
+            f"VALUES ('delete', old.id, {old});"
+        )
+        executor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {self.fts_table}_insert AFTER INSERT ON {self.table} BEGIN {insert} END'
+        )
+        executor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {self.fts_table}_delete AFTER DELETE ON {self.table} BEGIN {delete} END'
+        )
+        executor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {self.fts_table}_update AFTER UPDATE OF {columns} ON {self.table} '
+            f'BEGIN {delete} {insert} END'
+        )
+
+    def ensure_triggers(self, using):
+        connection = connections[using]
+        if connection.vendor != 'sqlite':
+            return
+        tables = connection.introspection.table_names(include_views=False)
+        if self.fts_table in tables and self.table in tables:
+            with connection.cursor() as cursor:
+                self.create_triggers(cursor)
+
+    # Queries
+
+    def is_enabled(self, connection):
+        if connection.alias not in self._enabled:
+            if connection.vendor == 'postgresql':
+                self._enabled[connection.alias] = True
+            elif connection.vendor == 'sqlite':
+                self._enabled[connection.alias] = self.fts_table in connection.introspection.table_names()
+            else:
+                self._enabled[connection.alias] = False
+        return self._enabled[connection.alias]
+
+    def search(self, queryset, query):
+        connection = connections[queryset.db]
+        if not self.is_enabled(connection):
+            condition = Q()
+            for column in self.columns:
+                condition |= Q(**{f'{column}__icontains': query})
+            return queryset.filter(condition).annotate(**{RANK: Value(0.0, output_field=FloatField())})
+
+        if connection.vendor == 'postgresql':
+            tsquery = f"websearch_to_tsquery('{POSTGRES_CONFIG}', %s)"
+            matches = RawSQL(f'{self.table}.search_vector @@ {tsquery}', [query], BooleanField())
+            return queryset.filter(matches).annotate(**{
+                RANK: RawSQL(f'-ts_rank({self.table}.search_vector, {tsquery})::float8', [query], FloatField()),
+            })
+
+        match = match_expression(query)
+        if match is None:
+            return queryset.none()
+        # bm25() is only defined in a query on the FTS table, which the filter
+        # joins; the annotation reuses that join
+        document = f'{self.relation}__document'
+        return queryset.filter(**{f'{document}__match': match}).annotate(**{
+            RANK: BM25(F(document), self.weights),
+        })
+
+
+INDEXES = {
+    'task_task': SearchIndex('task_task', 'search_entry'),
+    'project_project': SearchIndex('project_project', 'search_entry'),
+}
+
+
+def search(queryset, query):
+    """Narrow ``queryset`` to rows matching ``query`` and annotate their ``search_rank``."""
+    return INDEXES[queryset.model._meta.db_table].search(queryset, query)
+
+
+def prepare(using):
+    """
+    Look up which indexes are available on the ``using`` database.
+
+    ``SearchIndex.is_enabled`` introspects the schema on first use, which
+    async views cannot do; they call this through ``sync_to_async`` first.
+    """
+    for index in INDEXES.values():
+        index.is_enabled(connections[using])
+
+
+def is_prepared(using):
+    return all(using in index._enabled for index in INDEXES.values())
+
+
+def is_search(queryset):
+    return RANK in queryset.query.annotations
+
+
+def ensure_triggers(sender, using='default', **kwargs):
+    """``post_migrate`` receiver restoring triggers dropped by SQLite table rebuilds."""
+    for index in INDEXES.values():
+        index.ensure_triggers(using)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,9 +45,13 @@ INSTALLED_APPS = [
     'project',
     'task',
     'user',
+    'sync',
+    'webhooks',
 ]
 
 MIDDLEWARE = [
+    # First, so its ``total`` timing covers the rest of the stack
+    'Trackly.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -55,6 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'user.middleware.AuthTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'Trackly.urls'
@@ -79,14 +85,182 @@ WSGI_APPLICATION = 'Trackly.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+#
+# TRACKLY_DB_BACKEND selects ``sqlite`` (default) or ``postgresql``. SQLite runs
+# in WAL mode so readers never block the writer, waits up to busy_timeout ms for
+# the write lock instead of failing with "database is locked", and opens write
+# transactions with BEGIN IMMEDIATE so they queue for the lock up front rather
+# than fail when a read transaction tries to upgrade. PostgreSQL uses psycopg's
+# connection pool (``pip install "psycopg[binary,pool]"``) unless
+# TRACKLY_DB_POOL=0, in which case connections persist for CONN_MAX_AGE seconds.
+# Under ASGI, prefer the pool: persistent connections are per thread.
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': int(os.environ.get('TRACKLY_SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': int(os.environ.get('TRACKLY_SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+    'cache_size': -20000,  # KiB
+    'temp_store': 'MEMORY',
+}
+
+DB_POOL_ENABLED = os.environ.get('TRACKLY_DB_POOL', '1') == '1'
+
+DATABASE_BACKENDS = {
+    'sqlite': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('TRACKLY_DB_NAME', str(BASE_DIR / 'db.sqlite3')),
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    'postgresql': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('TRACKLY_DB_NAME', 'trackly'),
+        'USER': os.environ.get('TRACKLY_DB_USER', 'trackly'),
+        'PASSWORD': os.environ.get('TRACKLY_DB_PASSWORD', ''),
+        'HOST': os.environ.get('TRACKLY_DB_HOST', '127.0.0.1'),
+        'PORT': os.environ.get('TRACKLY_DB_PORT', '5432'),
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.environ.get('TRACKLY_DB_POOL_MIN_SIZE', 2)),
+                'max_size': int(os.environ.get('TRACKLY_DB_POOL_MAX_SIZE', 10)),
+                'timeout': int(os.environ.get('TRACKLY_DB_POOL_TIMEOUT', 10)),
+            },
+        } if DB_POOL_ENABLED else {},
+    },
+}
+
+DB_BACKEND = os.environ.get('TRACKLY_DB_BACKEND', 'sqlite')
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        **DATABASE_BACKENDS[DB_BACKEND],
+        # Django's pool replaces persistent connections; the two cannot be combined
+        'CONN_MAX_AGE': 0 if DB_BACKEND == 'postgresql' and DB_POOL_ENABLED
+        else int(os.environ.get('TRACKLY_DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replicas (see Trackly/db_router.py). TRACKLY_DB_REPLICAS is a
+# comma-separated list of replica SQLite files, or of PostgreSQL hosts sharing
+# the primary's credentials. Tests run replicas as mirrors of ``default``.
+
+DB_REPLICAS = [replica.strip() for replica in os.environ.get('TRACKLY_DB_REPLICAS', '').split(',') if replica.strip()]
+
+for index, replica in enumerate(DB_REPLICAS, 1):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'NAME' if DB_BACKEND == 'sqlite' else 'HOST': replica,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['Trackly.db_router.ReplicaRouter']
+
+TRACKLY_READ_REPLICAS = {
+    'ALIASES': [f'replica_{index}' for index in range(1, len(DB_REPLICAS) + 1)],
+    # Seconds a user's reads stay on the primary after they write
+    'STICKY_SECONDS': float(os.environ.get('TRACKLY_DB_STICKY_SECONDS', 5)),
+    # Holds the pins; must be shared between workers (see TRACKLY_RESPONSE_CACHE_BACKEND)
+    'CACHE_ALIAS': os.environ.get('TRACKLY_DB_PIN_CACHE_ALIAS', 'responses'),
+}
+
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# The ``responses`` cache holds per-user list responses (Trackly/response_cache.py),
+# cached authentication entries and read-replica pins, all of which must be seen by
+# every worker. Local memory is LRU-bounded by MAX_ENTRIES but private to each worker; multi-worker
+# deployments should set TRACKLY_RESPONSE_CACHE_BACKEND to ``file`` or ``redis``
+# (bound Redis with an allkeys-lru maxmemory policy).
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('TRACKLY_RESPONSE_CACHE_MAX_ENTRIES', 5000))
+
+RESPONSE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'trackly-responses',
+        'OPTIONS': {'MAX_ENTRIES': RESPONSE_CACHE_MAX_ENTRIES},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('TRACKLY_RESPONSE_CACHE_LOCATION', str(BASE_DIR / '.cache' / 'responses')),
+        'OPTIONS': {'MAX_ENTRIES': RESPONSE_CACHE_MAX_ENTRIES},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('TRACKLY_RESPONSE_CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'trackly-default',
+    },
+    'responses': {
+        **RESPONSE_CACHE_BACKENDS[os.environ.get('TRACKLY_RESPONSE_CACHE_BACKEND', 'locmem')],
+        'TIMEOUT': 300,
+    },
+}
+
+TRACKLY_RESPONSE_CACHE = {
+    'ENABLED': os.environ.get('TRACKLY_RESPONSE_CACHE_ENABLED', '1') == '1',
+    'ALIAS': 'responses',
+    'TIMEOUT': 300,
+}
+
+# Authenticated users cached by user/authentication.py; the alias must be
+# shared between workers (see TRACKLY_RESPONSE_CACHE_BACKEND) so that
+# deactivations and password changes reach all of them
+TRACKLY_AUTH_CACHE = {
+    'ENABLED': os.environ.get('TRACKLY_AUTH_CACHE_ENABLED', '1') == '1',
+    'ALIAS': os.environ.get('TRACKLY_AUTH_CACHE_ALIAS', 'responses'),
+    'TIMEOUT': int(os.environ.get('TRACKLY_AUTH_CACHE_TIMEOUT', '60')),
+}
+
+
+# Per-request query/DB/render timings (see Trackly/instrumentation.py)
+TRACKLY_INSTRUMENTATION = {
+    'ENABLED': os.environ.get('TRACKLY_INSTRUMENTATION_ENABLED', '1') == '1',
+    # Send the timings to clients in a Server-Timing header
+    'SERVER_TIMING': os.environ.get('TRACKLY_SERVER_TIMING', '0') == '1',
+}
+
+
+# Prometheus metrics at /metrics (see Trackly/metrics.py). Servers with several
+# worker processes set TRACKLY_METRICS_DIR to a directory the workers share,
+# emptied before the server starts, so any worker can report all of them.
+TRACKLY_METRICS = {
+    'ENABLED': os.environ.get('TRACKLY_METRICS_ENABLED', '1') == '1',
+    'DIRECTORY': os.environ.get('TRACKLY_METRICS_DIR') or None,
+    'TOKEN': os.environ.get('TRACKLY_METRICS_TOKEN') or None,
+}
+
+
+# Incremental sync at /api/sync/ (see sync/services.py). Tombstones of deleted
+# projects and tasks older than the retention window are removed by
+# ``python manage.py compact_tombstones``; cursors older than it have expired.
+TRACKLY_SYNC = {
+    'PAGE_SIZE': int(os.environ.get('TRACKLY_SYNC_PAGE_SIZE', 500)),
+    'SETTLE_SECONDS': float(os.environ.get('TRACKLY_SYNC_SETTLE_SECONDS', 1)),
+    'TOMBSTONE_RETENTION_DAYS': int(os.environ.get('TRACKLY_SYNC_RETENTION_DAYS', 30)),
+}
+
+
+# Webhook delivery from the outbox (see webhooks/delivery.py), run by
+# ``python manage.py deliver_webhooks``.
+TRACKLY_WEBHOOKS = {
+    'BATCH_SIZE': int(os.environ.get('TRACKLY_WEBHOOKS_BATCH_SIZE', 500)),
+    'CONCURRENCY': int(os.environ.get('TRACKLY_WEBHOOKS_CONCURRENCY', 8)),
+    'TIMEOUT': float(os.environ.get('TRACKLY_WEBHOOKS_TIMEOUT', 5)),
+    'MAX_FAILURES': int(os.environ.get('TRACKLY_WEBHOOKS_MAX_FAILURES', 10)),
+    'ALLOW_PRIVATE_HOSTS': os.environ.get('TRACKLY_WEBHOOKS_ALLOW_PRIVATE_HOSTS', '0') == '1',
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -133,11 +307,29 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson-backed JSON with a stdlib fallback (see Trackly/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'Trackly.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'Trackly.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Cursor pagination for list endpoints (see Trackly/pagination.py)
+TRACKLY_PAGINATION = {
+    'PAGE_SIZE': 50,
+    'MAX_PAGE_SIZE': 500,
+    'COUNT': 'exact',  # exact | estimate | none
+    'ESTIMATE_CAP': 1000,
 }
 
 # JWT Settings
@@ -149,6 +341,26 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
 }
 
+# In-process Bloom filter in front of the refresh-token blacklist (see user/tokens.py)
+TRACKLY_TOKEN_BLACKLIST_FILTER = {
+    'ENABLED': os.environ.get('TRACKLY_TOKEN_BLACKLIST_FILTER_ENABLED', '1') == '1',
+    # Seconds another worker may still accept a token blacklisted elsewhere
+    'REFRESH_INTERVAL': float(os.environ.get('TRACKLY_TOKEN_BLACKLIST_REFRESH_INTERVAL', '1.0')),
+    'FALSE_POSITIVE_RATE': 0.001,
+}
+
+# Password hashing runs on a bounded process pool (see user/hashing.py)
+AUTHENTICATION_BACKENDS = ['user.backends.PooledModelBackend']
+
+TRACKLY_PASSWORD_POOL = {
+    'ENABLED': os.environ.get('TRACKLY_PASSWORD_POOL_ENABLED', '1') == '1',
+    'WORKERS': int(os.environ.get('TRACKLY_PASSWORD_POOL_WORKERS', max(1, (os.cpu_count() or 2) // 2))),
+    # Hashes queued or running per web process before logins get 503
+    'MAX_PENDING': int(os.environ['TRACKLY_PASSWORD_POOL_MAX_PENDING']) if 'TRACKLY_PASSWORD_POOL_MAX_PENDING' in os.environ else None,
+    'TIMEOUT': float(os.environ.get('TRACKLY_PASSWORD_POOL_TIMEOUT', '10')),
+    'RETRY_AFTER': 1,
+}
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8000",  
@@ -17,9 +17,15 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from Trackly.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('user.urls')),
     path('api/projects/', include('project.urls')),
     path('api/tasks/', include('task.urls')),
+    path('api/sync/', include('sync.urls')),
+    path('api/webhooks/', include('webhooks.urls')),
+    path('api/async/', include('Trackly.async_urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
@@ -0,0 +1,26 @@
+from rest_framework import status
+from Trackly.async_views import AsyncReadView
+from Trackly import fieldsets
+from Trackly.pagination import KeysetPagination
+from .serializers import ProjectSerializer
+from .services import ProjectService
+
+
+class ProjectListView(AsyncReadView):
+    """Async ``GET /api/projects/``: same cursor pagination and envelope."""
+    failure_message = 'Failed to retrieve projects'
+
+    async def respond(self, request):
+        queryset = ProjectService.get_user_projects(request.user, request.query_params)
+        paginator = KeysetPagination()
+        fast = fieldsets.values_serializer(ProjectSerializer, request.query_params)
+        page = await paginator.apaginate_queryset(fast.get_queryset(queryset, paginator.get_ordering(queryset)), request)
+        return self.render(
+            {
+                'success': True,
+                'message': 'Projects retrieved successfully',
+                'data': fast.to_representation(page),
+                **paginator.get_envelope_fields()
+            },
+            status.HTTP_200_OK
+        )
@@ -0,0 +1,138 @@
+"""
+Incremental maintenance of the per-project task counters.
+
+Write paths snapshot a task's counted state before and after the change and
+apply the difference with one ``UPDATE ... SET x = x + n`` per touched project.
+``overdue_count`` is evaluated at write time, so tasks that pass their due
+date without being written are only picked up by the
+``recompute_project_counters`` command, which should run daily.
+"""
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Project
+
+
+OPEN_STATUSES = ('todo', 'in_progress')
+
+STATUS_COUNTERS = {
+    'todo': 'todo_count',
+    'in_progress': 'in_progress_count',
+    'completed': 'completed_count',
+}
+
+COUNTER_FIELDS = ('todo_count', 'in_progress_count', 'completed_count', 'overdue_count')
+
+
+def is_overdue(status, due_date, today=None):
+    if isinstance(due_date, str):
+        due_date = parse_date(due_date)
+    today = today or timezone.now().date()
+    return status in OPEN_STATUSES and due_date is not None and due_date < today
+
+
+def task_state(task):
+    """The part of a task the counters depend on, or ``None`` for a missing task."""
+    if task is None:
+        return None
+    return task.project_id, task.status, is_overdue(task.status, task.due_date)
+
+
+def state_deltas(old, new, deltas=None):
+    """Accumulate the counter changes for one task moving from ``old`` to ``new`` state."""
+    deltas = Counter() if deltas is None else deltas
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None:
+            continue
+        project_id, status, overdue = state
+        if status in STATUS_COUNTERS:
+            deltas[project_id, STATUS_COUNTERS[status]] += sign
+        if overdue:
+            deltas[project_id, 'overdue_count'] += sign
+    return deltas
+
+
+def transition_deltas(queryset, status=None):
+    """
+    Counter changes for moving every task in ``queryset`` to ``status``.
+
+    Reads the current distribution with one GROUP BY before the UPDATE runs.
+    """
+    deltas = Counter()
+    if not status:
+        return deltas
+    today = timezone.now().date()
+    groups = queryset.order_by().values('project_id', 'status').annotate(
+        tasks=Count('id'),
+        past_due=Count('id', filter=Q(due_date__lt=today)),
+    )
+    for group in groups:
+        project_id = group['project_id']
+        if group['status'] in STATUS_COUNTERS:
+            deltas[project_id, STATUS_COUNTERS[group['status']]] -= group['tasks']
+        deltas[project_id, STATUS_COUNTERS[status]] += group['tasks']
+        if group['status'] in OPEN_STATUSES:
+            deltas[project_id, 'overdue_count'] -= group['past_due']
+        if status in OPEN_STATUSES:
+            deltas[project_id, 'overdue_count'] += group['past_due']
+    return deltas
+
+
+def apply_deltas(deltas):
+    """
+    Apply accumulated deltas with one UPDATE per project; counters never drop below zero.
+
+    ``updated_at`` moves too, since the counters are part of the project's representation.
+    """
+    per_project = defaultdict(dict)
+    for (project_id, field), delta in deltas.items():
+        if delta:
+            per_project[project_id][field] = Greatest(F(field) + delta, Value(0))
+    updated_at = timezone.now()
+    for project_id, changes in per_project.items():
+        Project.objects.filter(pk=project_id).update(**changes, updated_at=updated_at)
+
+
+def recompute(project_ids=None, today=None):
+    """
+    Rebuild counters from the task table with one GROUP BY.
+
+    Returns the owner ids whose counters changed.
+    """
+    from task.models import Task
+
+    now = timezone.now()
+    today = today or now.date()
+    tasks = Task.objects.order_by()
+    projects = Project.objects.order_by('id').only('id', 'owner_id', *COUNTER_FIELDS)
+    if project_ids is not None:
+        tasks = tasks.filter(project_id__in=project_ids)
+        projects = projects.filter(id__in=project_ids)
+
+    counts = {
+        row.pop('project_id'): row
+        for row in tasks.values('project_id').annotate(
+            todo_count=Count('id', filter=Q(status='todo')),
+            in_progress_count=Count('id', filter=Q(status='in_progress')),
+            completed_count=Count('id', filter=Q(status='completed')),
+            overdue_count=Count('id', filter=Q(status__in=OPEN_STATUSES, due_date__lt=today)),
+        )
+    }
+    empty = dict.fromkeys(COUNTER_FIELDS, 0)
+
+    changed = []
+    owners = set()
+    for project in projects.iterator(chunk_size=1000):
+        expected = counts.get(project.id, empty)
+        if any(getattr(project, field) != expected[field] for field in COUNTER_FIELDS):
+            for field in COUNTER_FIELDS:
+                setattr(project, field, expected[field])
+            project.updated_at = now
+            changed.append(project)
+            owners.add(project.owner_id)
+    Project.objects.bulk_update(changed, [*COUNTER_FIELDS, 'updated_at'], batch_size=1000)
+    return owners
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from project import counters
+from Trackly.response_cache import invalidate_user
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the denormalized per-project task counters from the task table. '
+        'Run daily so overdue_count picks up tasks that passed their due date.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help='Only recompute this project id (repeatable).')
+
+    def handle(self, *args, **options):
+        owners = counters.recompute(project_ids=options['projects'])
+        for owner_id in owners:
+            invalidate_user(owner_id)
+        self.stdout.write(self.style.SUCCESS(f'Recomputed project counters; {len(owners)} owner(s) had drift.'))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:40
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.utils import timezone
+
+
+def populate_counters(apps, schema_editor):
+    """Initial counters from one GROUP BY over the task table."""
+    Project = apps.get_model('project', 'Project')
+    Task = apps.get_model('task', 'Task')
+    today = timezone.now().date()
+    rows = Task.objects.order_by().values('project_id').annotate(
+        todo_count=Count('id', filter=Q(status='todo')),
+        in_progress_count=Count('id', filter=Q(status='in_progress')),
+        completed_count=Count('id', filter=Q(status='completed')),
+        overdue_count=Count('id', filter=Q(status__in=['todo', 'in_progress'], due_date__lt=today)),
+    )
+    for row in rows.iterator(chunk_size=1000):
+        Project.objects.filter(pk=row.pop('project_id')).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0002_access_pattern_indexes'),
+        ('task', '0004_priority_rank_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='overdue_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todo_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+from django.db import migrations
+
+
+# Frozen copy of the full-text index DDL (see Trackly/search.py for how it is queried)
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS project_project_fts USING fts5(title, description, content='project_project', "
+    "content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS project_project_fts_insert AFTER INSERT ON project_project BEGIN "
+    "INSERT INTO project_project_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS project_project_fts_delete AFTER DELETE ON project_project BEGIN "
+    "INSERT INTO project_project_fts(project_project_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS project_project_fts_update AFTER UPDATE OF title, description ON project_project BEGIN "
+    "INSERT INTO project_project_fts(project_project_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO project_project_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO project_project_fts(project_project_fts) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS project_project_fts_insert',
+    'DROP TRIGGER IF EXISTS project_project_fts_delete',
+    'DROP TRIGGER IF EXISTS project_project_fts_update',
+    'DROP TABLE IF EXISTS project_project_fts',
+]
+POSTGRESQL_CREATE = [
+    "ALTER TABLE project_project ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+    'CREATE INDEX project_project_search_idx ON project_project USING GIN (search_vector)',
+]
+POSTGRESQL_DROP = [
+    'ALTER TABLE project_project DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return any(row[0] == 'ENABLE_FTS5' for row in cursor.fetchall())
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    statements = []
+    if connection.vendor == 'sqlite' and sqlite_has_fts5(connection):
+        statements = SQLITE_CREATE
+    elif connection.vendor == 'postgresql':
+        statements = POSTGRESQL_CREATE
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_DROP, 'postgresql': POSTGRESQL_DROP}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0003_task_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 04:49
+
+import Trackly.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0005_sync_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSearchEntry',
+            fields=[
+                ('project', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='project.project')),
+                ('document', Trackly.search.SearchDocumentField(db_column='project_project_fts')),
+            ],
+            options={
+                'db_table': 'project_project_fts',
+                'managed': False,
+            },
+        ),
+    ]
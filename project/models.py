@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from Trackly.search import SearchDocumentField
+
 class ProjectManager(models.Manager):
     def by_owner(self, user):
         return self.filter(owner=user)
@@ -20,11 +22,35 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Denormalized task counters, maintained by project.counters
+    todo_count = models.PositiveIntegerField(default=0)
+    in_progress_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    overdue_count = models.PositiveIntegerField(default=0)
+    
     objects = ProjectManager()
     
     class Meta:
         unique_together = ['title', 'owner']
         ordering = ['-created_at']
+        indexes = [
+            # ProjectManager.by_owner and the keyset-paginated project list
+            models.Index(fields=['owner', '-created_at', '-id'], name='project_owner_created_idx'),
+            # /api/sync/ reads changed projects in (updated_at, id) order
+            models.Index(fields=['owner', 'updated_at', 'id'], name='project_owner_updated_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.title} - {self.owner.username}"
\ No newline at end of file
+        return f"{self.title} - {self.owner.username}"
+
+
+class ProjectSearchEntry(models.Model):
+    """Row of the SQLite FTS5 index over projects, joined by ``Trackly.search``; never created or loaded."""
+    project = models.OneToOneField(
+        Project, models.DO_NOTHING, primary_key=True, db_column='rowid', related_name='search_entry',
+    )
+    document = SearchDocumentField(db_column='project_project_fts')
+    
+    class Meta:
+        managed = False
+        db_table = 'project_project_fts'
@@ -1,14 +1,15 @@
 from rest_framework import serializers
+from .counters import COUNTER_FIELDS
 from .models import Project
 
 class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
+        read_only_fields = ('created_at', 'updated_at', *COUNTER_FIELDS)
 
 class ProjectCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         exclude = ['owner']
-        read_only_fields = ('created_at', 'updated_at')
\ No newline at end of file
+        read_only_fields = ('created_at', 'updated_at', *COUNTER_FIELDS)
\ No newline at end of file
@@ -1,18 +1,54 @@
+from django.db import transaction
+from django.utils import timezone
+from Trackly import search
+from Trackly.response_cache import invalidate_user
+from webhooks import outbox
 from .models import Project
 
 class ProjectService:
     @staticmethod
+    @transaction.atomic(savepoint=False)
     def create_project(user, **data):
         data['owner'] = user
-        return Project.objects.create(**data)
+        project = Project.objects.create(**data)
+        outbox.record('created', 'project', user.pk, [project.pk])
+        return project
     
     @staticmethod
-    def get_user_projects(user):
-        return Project.objects.by_owner(user)
+    @transaction.atomic(savepoint=False)
+    def update_project(project, **data):
+        """Save only the changed fields; the loaded counters may be behind concurrent task writes."""
+        for field, value in data.items():
+            setattr(project, field, value)
+        project.save(update_fields=[*data, 'updated_at'])
+        outbox.record('updated', 'project', project.owner_id, [project.pk])
+        return project
     
     @staticmethod
-    def update_project_status(project_id, status):
-        project = Project.objects.get(id=project_id)
+    @transaction.atomic(savepoint=False)
+    def delete_project(project):
+        """Delete the project and, by cascade, its tasks; one event stands for all of them."""
+        owner_id, project_id = project.owner_id, project.pk
+        project.delete()
+        outbox.record('deleted', 'project', owner_id, [project_id])
+    
+    @staticmethod
+    def get_user_projects(user, filters=None):
+        """Projects owned by ``user``, narrowed to ``q`` full-text matches if given."""
+        queryset = Project.objects.by_owner(user)
+        query = (filters or {}).get('q')
+        if query:
+            queryset = search.search(queryset, query)
+        return queryset
+    
+    @staticmethod
+    @transaction.atomic(savepoint=False)
+    def update_project_status(project, status):
+        """Set the status with one UPDATE instead of rewriting every column."""
+        updated_at = timezone.now()
+        Project.objects.filter(pk=project.pk).update(status=status, updated_at=updated_at)
         project.status = status
-        project.save()
+        project.updated_at = updated_at
+        outbox.record('updated', 'project', project.owner_id, [project.pk])
+        invalidate_user(project.owner_id)
         return project
\ No newline at end of file
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from Trackly.response_cache import invalidate_user
+from .models import Project
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_owner_responses(sender, instance, **kwargs):
+    """Project writes change the owner's project and task listings."""
+    invalidate_user(instance.owner_id)
@@ -2,24 +2,32 @@ from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from .models import Project
 from .serializers import ProjectSerializer, ProjectCreateSerializer
 from .services import ProjectService
+from Trackly.pagination import KeysetPagination
+from Trackly.conditional import conditional_response
+from Trackly.db_router import ReplicaReadMixin
+from Trackly.fast_serializers import ValuesListMixin
+from Trackly.fieldsets import SparseFieldsetMixin
+from Trackly.response_cache import cache_response
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ReplicaReadMixin, SparseFieldsetMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing user projects.
     Provides CRUD operations for projects with proper authorization.
     """
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         """Return projects owned by the authenticated user."""
-        return ProjectService.get_user_projects(self.request.user)
+        return ProjectService.get_user_projects(self.request.user, self.request.query_params)
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -66,21 +74,32 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
-        """List all projects for the authenticated user."""
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        """List projects for the authenticated user, one cursor page at a time."""
+        try:
+            data = self.paginate_rows(self.get_queryset())
+        except NotFound as e:
+            return Response(
+                {
+                    'success': False,
+                    'message': str(e.detail)
+                },
+                status=status.HTTP_404_NOT_FOUND
+            )
         
         return Response(
             {
                 'success': True,
                 'message': 'Projects retrieved successfully',
-                'data': serializer.data,
-                'count': queryset.count()
+                'data': data,
+                **self.paginator.get_envelope_fields()
             },
             status=status.HTTP_200_OK
         )
     
+    @conditional_response
     def retrieve(self, request, *args, **kwargs):
         """Retrieve a specific project."""
         try:
@@ -111,7 +130,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             instance = self.get_object()
             serializer = self.get_serializer(instance, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
-            serializer.save()
+            ProjectService.update_project(instance, **serializer.validated_data)
             
             return Response(
                 {
@@ -135,7 +154,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """Delete a project."""
         try:
             instance = self.get_object()
-            instance.delete()
+            ProjectService.delete_project(instance)
             
             return Response(
                 {
@@ -169,7 +188,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            updated_project = ProjectService.update_project_status(pk, new_status)
+            updated_project = ProjectService.update_project_status(project, new_status)
             serializer = self.get_serializer(updated_project)
             
             return Response(
@@ -189,3 +208,25 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 },
                 status=status.HTTP_400_BAD_REQUEST
             )
+    
+    @action(detail=True, methods=['get'])
+    def progress(self, request, pk=None):
+        """Task progress read from the denormalized counters, without touching the task table."""
+        project = self.get_object()
+        total = project.todo_count + project.in_progress_count + project.completed_count
+        return Response(
+            {
+                'success': True,
+                'message': 'Project progress retrieved successfully',
+                'data': {
+                    'project': project.id,
+                    'todo': project.todo_count,
+                    'in_progress': project.in_progress_count,
+                    'completed': project.completed_count,
+                    'overdue': project.overdue_count,
+                    'total': total,
+                    'percent_complete': round(100 * project.completed_count / total, 1) if total else 0.0,
+                }
+            },
+            status=status.HTTP_200_OK
+        )
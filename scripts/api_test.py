@@ -8,18 +8,8 @@ def test_api_endpoints(base_url="http://127.0.0.1:8000/"):
     timestamp = int(time.time())
     
     for endpoint in ENDPOINTS:
-        method = endpoint["method"]
-        url = f"{base_url}{endpoint['url']}"
+        method, url, data = prepare_request(endpoint, base_url, captured_ids, timestamp)
         expected_status = endpoint["expected_status"]
-        data = endpoint.get("data", None)
-
-        # Replace placeholders in URL with captured IDs
-        for key, value in captured_ids.items():
-            url = url.replace(f"{{{key}}}", str(value))
-        
-        # Replace placeholders in data with captured IDs and timestamp
-        if data:
-            data = replace_placeholders_in_data(data, captured_ids, timestamp)
 
         headers = {'Content-Type': 'application/json'}
         if token:
@@ -46,14 +36,34 @@ def test_api_endpoints(base_url="http://127.0.0.1:8000/"):
             print(f"Token captured: {token[:20]}...")
         
         # Capture ID if specified
-        if "capture_id" in endpoint and response.status_code in [200, 201]:
-            response_data = response.json().get("data", {})
-            if "id" in response_data:
-                captured_ids[endpoint["capture_id"]] = response_data["id"]
-                print(f"Captured {endpoint['capture_id']}: {response_data['id']}")
+        if capture_id(endpoint, response, captured_ids):
+            print(f"Captured {endpoint['capture_id']}: {captured_ids[endpoint['capture_id']]}")
 
         print(f"✓ {method} {url} - Status: {response.status_code}")
 
+def prepare_request(endpoint, base_url, captured_ids, timestamp):
+    """Return ``(method, url, data)`` for ``endpoint`` with its placeholders filled in."""
+    url = f"{base_url}{endpoint['url']}"
+    data = endpoint.get("data", None)
+
+    # Replace placeholders in URL with captured IDs
+    for key, value in captured_ids.items():
+        url = url.replace(f"{{{key}}}", str(value))
+
+    # Replace placeholders in data with captured IDs and timestamp
+    if data:
+        data = replace_placeholders_in_data(data, captured_ids, timestamp)
+    return endpoint["method"], url, data
+
+def capture_id(endpoint, response, captured_ids):
+    """Store the created object's ID under ``endpoint['capture_id']``; return whether one was captured."""
+    if "capture_id" in endpoint and response.status_code in [200, 201]:
+        response_data = response.json().get("data", {})
+        if "id" in response_data:
+            captured_ids[endpoint["capture_id"]] = response_data["id"]
+            return True
+    return False
+
 def replace_placeholders_in_data(data, captured_ids, timestamp):
     if isinstance(data, dict):
         return {k: replace_placeholders_in_data(v, captured_ids, timestamp) for k, v in data.items()}
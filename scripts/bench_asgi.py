@@ -0,0 +1,175 @@
+"""
+Compare the read endpoints under the WSGI and ASGI entry points at high concurrency.
+
+The applications in ``Trackly/wsgi.py`` and ``Trackly/asgi.py`` are driven
+in-process, without a network server, so only the request handling differs:
+
+    wsgi  sync views,  one worker thread per concurrent client
+    asgi  async views (``/api/async/...``) on a single event loop
+    asgi  sync views on the same event loop, for reference
+
+    python scripts/bench_asgi.py --tasks 100000 --concurrency 64 --requests 2000
+
+``--db-latency-ms`` adds a sleep to every query to imitate a database on
+another host, which is where async request handling is expected to help.
+The response cache is disabled so every request reaches the database.
+"""
+import argparse
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_utils import migrate, seed, setup_django
+
+
+ENDPOINTS = {
+    'task list': '/api/tasks/?page_size=50',
+    'project list': '/api/projects/',
+    'overdue': '/api/tasks/overdue/',
+    'profile': '/api/auth/profile/',
+}
+
+
+def add_query_latency(seconds):
+    from django.db.backends.signals import connection_created
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(delay)
+
+    connection_created.connect(install, weak=False)
+
+
+def split(url):
+    path, _, query = url.partition('?')
+    return path, query
+
+
+def summarize(samples, elapsed, errors):
+    samples.sort()
+    return {
+        'rps': len(samples) / elapsed,
+        'p50_ms': samples[len(samples) // 2] * 1000,
+        'p99_ms': samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+        'errors': errors,
+    }
+
+
+def run_wsgi(url, token, concurrency, total):
+    from Trackly.wsgi import application
+
+    path, query = split(url)
+
+    def call():
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query,
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost', 'HTTP_AUTHORIZATION': f'Bearer {token}',
+            'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(), 'wsgi.url_scheme': 'http',
+            'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        statuses = []
+        started = time.perf_counter()
+        body = application(environ, lambda status, headers: statuses.append(status))
+        for _ in body:
+            pass
+        body.close()
+        return time.perf_counter() - started, statuses[0].startswith('200')
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: call(), range(total)))
+    elapsed = time.perf_counter() - started
+    return summarize([latency for latency, _ in results], elapsed, sum(not ok for _, ok in results))
+
+
+def run_asgi(url, token, concurrency, total):
+    from Trackly.asgi import application
+
+    path, query = split(url)
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+        'root_path': '', 'server': ('localhost', 80), 'client': ('127.0.0.1', 50000),
+        'headers': [(b'host', b'localhost'), (b'authorization', f'Bearer {token}'.encode())],
+    }
+
+    async def call():
+        status = {}
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # Django listens for a disconnect until the response is sent
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+
+        started = time.perf_counter()
+        await application(dict(scope), receive, send)
+        return time.perf_counter() - started, status.get('code') == 200
+
+    async def main():
+        queue = asyncio.Queue()
+        for _ in range(total):
+            queue.put_nowait(None)
+        results = []
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                results.append(await call())
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(main())
+    return summarize([latency for latency, _ in results], elapsed, sum(not ok for _, ok in results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_bench.sqlite3')
+    parser.add_argument('--tasks', type=int, default=100_000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per scenario')
+    parser.add_argument('--db-latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.conf import settings
+    settings.TRACKLY_RESPONSE_CACHE = {**getattr(settings, 'TRACKLY_RESPONSE_CACHE', {}), 'ENABLED': False}
+    migrate()
+    user = seed(tasks=args.tasks)
+
+    from rest_framework_simplejwt.tokens import AccessToken
+    token = str(AccessToken.for_user(user))
+    if args.db_latency_ms:
+        add_query_latency(args.db_latency_ms / 1000)
+
+    print(f'{args.requests} requests per scenario, concurrency {args.concurrency}, '
+          f'added query latency {args.db_latency_ms} ms\n')
+    print(f'{"endpoint":<14} {"entry point":<18} {"req/s":>9} {"p50 ms":>9} {"p99 ms":>9} {"errors":>7}')
+    for name, url in ENDPOINTS.items():
+        async_url = url.replace('/api/', '/api/async/', 1)
+        for label, runner, target in (
+            ('wsgi sync', run_wsgi, url),
+            ('asgi async', run_asgi, async_url),
+            ('asgi sync', run_asgi, url),
+        ):
+            result = runner(target, token, args.concurrency, args.requests)
+            print(f'{name:<14} {label:<18} {result["rps"]:>9.1f} {result["p50_ms"]:>9.2f} '
+                  f'{result["p99_ms"]:>9.2f} {result["errors"]:>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark the streaming task export against building the full serialized list.
+
+Each scenario runs in a forked child so its peak RSS is measured in isolation:
+
+    python scripts/bench_export.py --tasks 1000000 --db /tmp/trackly_export.sqlite3
+
+Seed a dedicated database: the benchmark user should own every task.
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import time
+
+from bench_utils import migrate, seed, setup_django
+
+
+def rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_export(user_id, export_format, conn):
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(user=User.objects.get(pk=user_id))
+    baseline = rss_mb()
+    started = time.perf_counter()
+    response = client.get('/api/tasks/export/', {'format': export_format})
+    content = iter(response.streaming_content)
+    size = len(next(content))
+    first_byte = time.perf_counter() - started
+    for chunk in content:
+        size += len(chunk)
+    conn.send({
+        'time_to_first_byte_ms': first_byte * 1000,
+        'total_s': time.perf_counter() - started,
+        'bytes': size,
+        'peak_rss_delta_mb': rss_mb() - baseline,
+    })
+
+
+def run_in_memory(user_id, export_format, conn):
+    """What exporting through the old unpaginated list endpoint cost."""
+    from django.contrib.auth.models import User
+    from task.models import Task
+    from task.serializers import TaskSerializer
+
+    user = User.objects.get(pk=user_id)
+    baseline = rss_mb()
+    started = time.perf_counter()
+    queryset = Task.objects.select_related('project__owner').filter(project__owner=user)
+    body = json.dumps(TaskSerializer(queryset, many=True).data).encode()
+    elapsed = time.perf_counter() - started
+    conn.send({
+        'time_to_first_byte_ms': elapsed * 1000,
+        'total_s': elapsed,
+        'bytes': len(body),
+        'peak_rss_delta_mb': rss_mb() - baseline,
+    })
+
+
+def measure(target, user_id, export_format):
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.get_context('fork').Process(target=target, args=(user_id, export_format, child))
+    process.start()
+    result = parent.recv()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_export.sqlite3')
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--skip-in-memory', action='store_true', help='skip the full-list baseline')
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    migrate()
+    user = seed(tasks=args.tasks, users=1, projects_per_user=50)
+
+    from django.db import connections
+    connections.close_all()
+
+    scenarios = [('ndjson stream', run_export, 'ndjson'), ('csv stream', run_export, 'csv')]
+    if not args.skip_in_memory:
+        scenarios.append(('in-memory TaskSerializer list', run_in_memory, 'json'))
+
+    print(f"\n{'scenario':<32}{'TTFB ms':>10}{'total s':>10}{'MB out':>10}{'peak RSS +MB':>14}")
+    for name, target, export_format in scenarios:
+        result = measure(target, user.pk, export_format)
+        print(
+            f"{name:<32}{result['time_to_first_byte_ms']:>10.1f}{result['total_s']:>10.2f}"
+            f"{result['bytes'] / 1e6:>10.1f}{result['peak_rss_delta_mb']:>14.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
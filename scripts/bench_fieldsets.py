@@ -0,0 +1,71 @@
+"""
+Measure what ``?fields=`` saves on a large account: payload bytes and latency.
+
+Each request is made for the seeded benchmark user through the full stack,
+with the response cache disabled so every request reaches the database:
+
+    list     ``GET /api/tasks/?page_size=N`` (one cursor page)
+    detail   ``GET /api/tasks/<id>/``
+    export   ``GET /api/tasks/export/?format=ndjson`` (every task of the user)
+
+once with every field and once with ``fields=id,title,status,due_date``.
+
+    python scripts/bench_fieldsets.py --tasks 1000000 --page-size 200
+"""
+import argparse
+
+from bench_utils import measure, migrate, seed, setup_django
+
+
+SPARSE = 'id,title,status,due_date'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_bench.sqlite3')
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--page-size', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--export-repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.conf import settings
+    settings.TRACKLY_RESPONSE_CACHE = {**getattr(settings, 'TRACKLY_RESPONSE_CACHE', {}), 'ENABLED': False}
+    migrate()
+    user = seed(tasks=args.tasks)
+
+    from rest_framework.test import APIClient
+    from task.models import Task
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    task_id = Task.objects.filter(project__owner=user).values_list('id', flat=True).first()
+
+    def size(response):
+        if response.streaming:
+            return sum(len(chunk) for chunk in response.streaming_content)
+        return len(response.content)
+
+    scenarios = [
+        ('list', '/api/tasks/', {'page_size': args.page_size, 'count': 'none'}, args.repeat),
+        ('detail', f'/api/tasks/{task_id}/', {}, args.repeat),
+        ('export', '/api/tasks/export/', {'format': 'ndjson'}, args.export_repeat),
+    ]
+
+    print(f'{"scenario":<8} {"fields":<8} {"bytes":>12} {"p50 ms":>9} {"p95 ms":>9} {"bytes -%":>9} {"p50 -%":>7}')
+    for name, path, params, repeat in scenarios:
+        results = {}
+        for label, extra in (('all', {}), ('sparse', {'fields': SPARSE})):
+            query = {**params, **extra}
+            bytes_ = size(client.get(path, query))
+            p50, p95 = measure(lambda: size(client.get(path, query)), repeat)
+            results[label] = (bytes_, p50, p95)
+        for label, (bytes_, p50, p95) in results.items():
+            full_bytes, full_p50, _ = results['all']
+            print(f'{name:<8} {label:<8} {bytes_:>12,} {p50:>9.2f} {p95:>9.2f} '
+                  f'{(1 - bytes_ / full_bytes) * 100:>8.1f}% {(1 - p50 / full_p50) * 100:>6.1f}%')
+
+
+if __name__ == '__main__':
+    main()
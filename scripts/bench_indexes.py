@@ -0,0 +1,84 @@
+"""
+Benchmark the Task/Project access-pattern indexes.
+
+Seeds a large database (1M tasks by default), drops the composite and partial
+indexes, prints the query plans and latency of the hot queries, then restores
+the indexes and repeats:
+
+    python scripts/bench_indexes.py --tasks 1000000 --db /tmp/trackly_bench.sqlite3
+"""
+import argparse
+
+from bench_utils import measure, migrate, seed, setup_django
+
+
+def hot_queries(user):
+    from django.db.models import Q
+    from project.models import Project
+    from task.models import Task
+
+    tasks = Task.objects.select_related('project__owner').filter(project__owner=user)
+    project = Project.objects.filter(owner=user).order_by('id').first()
+    keyset = ('-created_at', '-id')
+    task_keyset = ('-priority_rank', '-created_at', '-id')
+    return {
+        'task list': tasks.order_by(*task_keyset)[:51],
+        'task list ?project': tasks.filter(project_id=project.id).order_by(*task_keyset)[:51],
+        'task list ?status': tasks.filter(status='todo').order_by(*task_keyset)[:51],
+        'task list ?priority': tasks.filter(priority='high').order_by(*task_keyset)[:51],
+        'task list ?project&status': tasks.filter(project_id=project.id, status='todo').order_by(*task_keyset)[:51],
+        'overdue': Task.objects.overdue().filter(project__owner=user),
+        'project list': Project.objects.by_owner(user).order_by(*keyset)[:51],
+        'project list (page 2)': Project.objects.by_owner(user).filter(
+            Q(created_at__lt=project.created_at) | Q(created_at=project.created_at, id__lt=project.id)
+        ).order_by(*keyset)[:51],
+    }
+
+
+def run(user, label, repeat):
+    print(f'\n=== {label} ===')
+    for name, queryset in hot_queries(user).items():
+        plan = queryset.explain()
+        median, p95 = measure(lambda: list(queryset.all()), repeat=repeat)
+        print(f'\n{name}: median {median:.2f} ms, p95 {p95:.2f} ms')
+        for line in plan.splitlines():
+            print(f'    {line}')
+
+
+def managed_indexes():
+    from project.models import Project
+    from task.models import Task
+    return [(model, index) for model in (Project, Task) for index in model._meta.indexes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_bench.sqlite3')
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    migrate()
+    user = seed(tasks=args.tasks, users=args.users)
+
+    from django.db import connection
+
+    with connection.schema_editor() as editor:
+        for model, index in managed_indexes():
+            editor.remove_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    run(user, 'before: foreign-key indexes only', args.repeat)
+
+    with connection.schema_editor() as editor:
+        for model, index in managed_indexes():
+            editor.add_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    run(user, 'after: access-pattern indexes', args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Measure the per-request cost of ``InstrumentationMiddleware``.
+
+Three configurations are compared:
+
+    off      ``ENABLED`` false; the middleware removes itself from the stack
+    on       histograms only (the default)
+    timing   histograms and the ``Server-Timing`` header
+
+Two measurements each:
+
+    micro    the middleware around a stub view running ``--queries`` ``SELECT 1``
+             statements, called directly; isolates the middleware's own cost
+    stack    ``GET /api/tasks/?page_size=1`` through the whole WSGI handler,
+             the configurations taking turns request by request; medians
+
+    python scripts/bench_instrumentation.py --rounds 20 --requests 200
+
+The response cache is disabled so every request reaches the view.
+"""
+import argparse
+import io
+import statistics
+import time
+
+from bench_utils import migrate, seed, setup_django
+
+
+CONFIGS = (
+    ('off', {'ENABLED': False}),
+    ('on', {'ENABLED': True, 'SERVER_TIMING': False}),
+    ('timing', {'ENABLED': True, 'SERVER_TIMING': True}),
+)
+
+
+def wsgi_environ(path, query, token):
+    return {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query,
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'localhost', 'HTTP_AUTHORIZATION': f'Bearer {token}',
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(), 'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def build_middleware(get_response):
+    from django.core.exceptions import MiddlewareNotUsed
+    from Trackly.instrumentation import InstrumentationMiddleware
+
+    try:
+        return InstrumentationMiddleware(get_response)
+    except MiddlewareNotUsed:
+        return get_response
+
+
+def micro(queries, calls):
+    """Microseconds per call of the middleware around a stub view, per configuration."""
+    from django.conf import settings
+    from django.db import connection
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+
+    request = RequestFactory().get('/api/tasks/')
+
+    def view(request):
+        with connection.cursor() as cursor:
+            for _ in range(queries):
+                cursor.execute('SELECT 1')
+        return HttpResponse(b'{}')
+
+    results = {}
+    for label, config in CONFIGS:
+        settings.TRACKLY_INSTRUMENTATION = config
+        handler = build_middleware(view)
+        handler(request)
+        best = float('inf')
+        for _ in range(5):
+            started = time.perf_counter()
+            for _ in range(calls):
+                handler(request)
+            best = min(best, (time.perf_counter() - started) / calls)
+        results[label] = best * 1e6
+    return results
+
+
+def stack(token, rounds, requests):
+    """Median latency in microseconds of a request through the WSGI handler, per configuration."""
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handlers = {}
+    for label, config in CONFIGS:
+        settings.TRACKLY_INSTRUMENTATION = config
+        handlers[label] = WSGIHandler()
+
+    def call(application):
+        response = application(wsgi_environ('/api/tasks/', 'page_size=1&count=none', token), lambda *args: None)
+        for _ in response:
+            pass
+        response.close()
+
+    samples = {label: [] for label in handlers}
+    for application in handlers.values():
+        for _ in range(20):
+            call(application)
+    for _ in range(rounds * requests):
+        for label, application in handlers.items():
+            started = time.perf_counter()
+            call(application)
+            samples[label].append((time.perf_counter() - started) * 1e6)
+    return {label: statistics.median(values) for label, values in samples.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_bench.sqlite3')
+    parser.add_argument('--tasks', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=3, help='queries run by the micro benchmark view')
+    parser.add_argument('--calls', type=int, default=20_000, help='micro benchmark calls per repetition')
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=200, help='stack requests per configuration and round')
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.conf import settings
+    settings.TRACKLY_RESPONSE_CACHE = {**getattr(settings, 'TRACKLY_RESPONSE_CACHE', {}), 'ENABLED': False}
+    migrate()
+    user = seed(tasks=args.tasks)
+
+    from rest_framework_simplejwt.tokens import AccessToken
+    token = str(AccessToken.for_user(user))
+
+    micro_results = micro(args.queries, args.calls)
+    stack_results = stack(token, args.rounds, args.requests)
+
+    print(f'{"config":<8} {"micro us":>10} {"+us":>8} {"stack us":>10} {"+us":>8} {"+%":>7}')
+    for label, _ in CONFIGS:
+        micro_delta = micro_results[label] - micro_results['off']
+        stack_delta = stack_results[label] - stack_results['off']
+        print(f'{label:<8} {micro_results[label]:>10.2f} {micro_delta:>8.2f} {stack_results[label]:>10.1f} '
+              f'{stack_delta:>8.1f} {stack_delta / stack_results["off"] * 100:>6.1f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark the orjson-backed renderer and parser against DRF's stdlib JSON.
+
+Payloads are real ``TaskSerializer`` output wrapped in the list envelope, at
+100, 10k and 100k rows; each size is checked for byte-identical output first:
+
+    python scripts/bench_json.py --tasks 100000 --rows 100 10000 100000
+"""
+import argparse
+import io
+
+from bench_utils import measure, migrate, seed, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_bench.sqlite3')
+    parser.add_argument('--tasks', type=int, default=100_000)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    migrate()
+    seed(tasks=max(args.tasks, max(args.rows)))
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from task.models import Task
+    from task.serializers import TaskSerializer
+    from Trackly.parsers import FastJSONParser
+    from Trackly.renderers import FastJSONRenderer, orjson
+
+    if orjson is None:
+        print('orjson is not installed; FastJSONRenderer is using the stdlib fallback')
+
+    queryset = Task.objects.select_related('project__owner').order_by('-priority_rank', '-created_at', '-id')
+    print(f'{"rows":>7} {"MB":>7} {"step":<7} {"stdlib ms":>10} {"orjson ms":>10} {"speedup":>8}')
+    for rows in args.rows:
+        payload = {
+            'success': True,
+            'message': 'Tasks retrieved successfully',
+            'data': TaskSerializer(list(queryset[:rows]), many=True).data,
+            'count': rows,
+            'next': None,
+            'previous': None,
+        }
+        body = JSONRenderer().render(payload)
+        if FastJSONRenderer().render(payload) != body:
+            raise SystemExit(f'{rows} rows: FastJSONRenderer output differs from JSONRenderer')
+        repeat = args.repeat if rows < 100_000 else max(3, args.repeat // 3)
+
+        stdlib, _ = measure(lambda: JSONRenderer().render(payload), repeat)
+        fast, _ = measure(lambda: FastJSONRenderer().render(payload), repeat)
+        print(f'{rows:>7} {len(body) / 1e6:>7.2f} {"render":<7} {stdlib:>10.2f} {fast:>10.2f} {stdlib / fast:>7.1f}x')
+
+        stdlib, _ = measure(lambda: JSONParser().parse(io.BytesIO(body)), repeat)
+        fast, _ = measure(lambda: FastJSONParser().parse(io.BytesIO(body)), repeat)
+        print(f'{rows:>7} {len(body) / 1e6:>7.2f} {"parse":<7} {stdlib:>10.2f} {fast:>10.2f} {stdlib / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Measure API read latency while a burst of logins is hashing passwords.
+
+The WSGI application is driven in-process by reader threads (``GET
+/api/tasks/``) and login threads (``POST /api/auth/login/``) for a fixed time,
+in three scenarios:
+
+    idle     readers only, for reference
+    inline   logins hash on the request thread (pool disabled)
+    pool     logins hash on the bounded process pool
+
+    python scripts/bench_login_storm.py --readers 8 --logins 32 --seconds 10
+
+Logins rejected with ``503`` by a saturated pool are counted separately; they
+are the point of the bound, not errors. The response cache is disabled so
+every read reaches the database.
+"""
+import argparse
+import io
+import json
+import threading
+import time
+
+from bench_utils import migrate, seed, setup_django
+
+
+LOGIN_USERNAME = 'bench_login'
+LOGIN_PASSWORD = 'bench-login-password'
+
+
+def call(application, method, path, token=None, body=b''):
+    environ = {
+        'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'localhost', 'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body), 'wsgi.errors': io.StringIO(), 'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    if token:
+        environ['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    statuses = []
+    response = application(environ, lambda status, headers: statuses.append(status))
+    for _ in response:
+        pass
+    response.close()
+    return int(statuses[0].split()[0])
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] * 1000 if samples else 0.0
+
+
+def run(token, readers, logins, seconds):
+    from Trackly.wsgi import application
+
+    deadline = time.perf_counter() + seconds
+    read_samples, login_statuses = [], []
+    lock = threading.Lock()
+    login_body = json.dumps({'username': LOGIN_USERNAME, 'password': LOGIN_PASSWORD}).encode()
+
+    def reader():
+        samples = []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            call(application, 'GET', '/api/tasks/', token)
+            samples.append(time.perf_counter() - started)
+        with lock:
+            read_samples.extend(samples)
+
+    def login():
+        statuses = []
+        while time.perf_counter() < deadline:
+            statuses.append(call(application, 'POST', '/api/auth/login/', body=login_body))
+        with lock:
+            login_statuses.extend(statuses)
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=login) for _ in range(logins)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    read_samples.sort()
+    return {
+        'reads_per_s': len(read_samples) / seconds,
+        'p50_ms': percentile(read_samples, 0.5),
+        'p99_ms': percentile(read_samples, 0.99),
+        'logins_per_s': login_statuses.count(200) / seconds,
+        'rejected': login_statuses.count(503),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_bench.sqlite3')
+    parser.add_argument('--tasks', type=int, default=100_000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--logins', type=int, default=32, help='concurrent login clients')
+    parser.add_argument('--seconds', type=float, default=10.0, help='duration of each scenario')
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.conf import settings
+    settings.TRACKLY_RESPONSE_CACHE = {**getattr(settings, 'TRACKLY_RESPONSE_CACHE', {}), 'ENABLED': False}
+    migrate()
+    user = seed(tasks=args.tasks)
+
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import AccessToken
+    from user import hashing
+
+    login_user, _ = User.objects.get_or_create(username=LOGIN_USERNAME)
+    login_user.set_password(LOGIN_PASSWORD)
+    login_user.save()
+    token = str(AccessToken.for_user(user))
+    pool_config = {**getattr(settings, 'TRACKLY_PASSWORD_POOL', {}), 'ENABLED': True}
+    hashing.pool.run(hashing._make_password, 'warm-up', None, 'default')
+
+    print(f'{args.readers} readers, {args.logins} login clients, {args.seconds:.0f}s per scenario, '
+          f'pool of {hashing.get_config()["WORKERS"]} workers\n')
+    print(f'{"scenario":<10} {"reads/s":>9} {"p50 ms":>9} {"p99 ms":>9} {"logins/s":>9} {"503s":>7}')
+    for label, logins, enabled in (('idle', 0, True), ('inline', args.logins, False), ('pool', args.logins, True)):
+        settings.TRACKLY_PASSWORD_POOL = {**pool_config, 'ENABLED': enabled}
+        result = run(token, args.readers, logins, args.seconds)
+        print(f'{label:<10} {result["reads_per_s"]:>9.1f} {result["p50_ms"]:>9.2f} {result["p99_ms"]:>9.2f} '
+              f'{result["logins_per_s"]:>9.1f} {result["rejected"]:>7}')
+    hashing.pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
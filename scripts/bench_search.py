@@ -0,0 +1,70 @@
+"""
+Benchmark ``?q=`` full-text search against the ``LIKE '%...%'`` scan it replaces.
+
+Each query runs for one user's tasks (as ``GET /api/tasks/?q=...`` does) and
+across all tasks, fetching a first page of 51 rows and the match count:
+
+    like    title/description ``icontains``, in the default list ordering
+    fts     the FTS5 index, in relevance order
+
+    python scripts/bench_search.py --tasks 1000000
+
+Building the index for an existing database happens in the migration and is
+timed separately when the database predates it.
+"""
+import argparse
+
+from bench_utils import measure, migrate, seed, setup_django, timer
+
+
+QUERIES = ['module 42', 'refactor', 'Task 123456', 'nothing matches this']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_bench.sqlite3')
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    with timer() as migration:
+        migrate()
+    print(f'migrate (including any index build): {migration["seconds"]:.1f}s')
+    user = seed(tasks=args.tasks)
+
+    from django.db.models import Q
+    from task.models import Task
+    from Trackly import search
+
+    scopes = {
+        'one user': Task.objects.filter(project__owner=user),
+        'all tasks': Task.objects.all(),
+    }
+
+    def like(queryset, query):
+        return queryset.filter(Q(title__icontains=query) | Q(description__icontains=query))
+
+    print(f'\n{"scope":<10} {"query":<22} {"matches":>8} {"like p50":>9} {"fts p50":>8} {"like p95":>9} '
+          f'{"fts p95":>8} {"speedup":>8}')
+    for scope, queryset in scopes.items():
+        for query in QUERIES:
+            like_qs = like(queryset, query).order_by('-priority_rank', '-created_at', '-id')
+            fts_qs = search.search(queryset, query).order_by(*search.RANK_ORDERING)
+
+            def run_like():
+                list(like_qs.values('id', 'title')[:51])
+                like_qs.count()
+
+            def run_fts():
+                list(fts_qs.values('id', 'title', search.RANK)[:51])
+                fts_qs.count()
+
+            like_p50, like_p95 = measure(run_like, args.repeat)
+            fts_p50, fts_p95 = measure(run_fts, args.repeat)
+            print(f'{scope:<10} {query:<22} {fts_qs.count():>8,} {like_p50:>9.1f} {fts_p50:>8.1f} '
+                  f'{like_p95:>9.1f} {fts_p95:>8.1f} {like_p50 / fts_p50:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
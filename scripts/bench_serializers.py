@@ -0,0 +1,65 @@
+"""
+Micro-benchmark the values()-based fast serializer against the DRF serializers.
+
+For each row count it times fetching and serializing that many tasks (and
+projects) both ways, and reports rows/sec with and without the query:
+
+    python scripts/bench_serializers.py --tasks 100000 --rows 50 500 5000
+"""
+import argparse
+
+from bench_utils import measure, migrate, seed, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_bench.sqlite3')
+    parser.add_argument('--tasks', type=int, default=100_000)
+    parser.add_argument('--rows', type=int, nargs='+', default=[50, 500, 5000])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    migrate()
+    user = seed(tasks=args.tasks)
+
+    from rest_framework.renderers import JSONRenderer
+    from project.models import Project
+    from project.serializers import ProjectSerializer
+    from task.models import Task
+    from task.serializers import TaskSerializer
+    from Trackly.fast_serializers import ValuesSerializer
+
+    renderer = JSONRenderer()
+    cases = [
+        ('task', TaskSerializer, lambda: Task.objects.select_related('project__owner').order_by('-created_at', '-id')),
+        ('project', ProjectSerializer, lambda: Project.objects.order_by('-created_at', '-id')),
+    ]
+
+    print(f'{"model":<8} {"rows":>6} {"path":<18} {"median ms":>10} {"rows/sec":>12} {"serialize-only rows/sec":>24}')
+    for name, serializer_class, base in cases:
+        fast = ValuesSerializer.for_serializer(serializer_class)
+        for rows in args.rows:
+            instances = list(base()[:rows])
+            values = list(fast.get_queryset(base())[:rows])
+            count = len(instances)
+            if renderer.render(serializer_class(instances, many=True).data) != renderer.render(fast.to_representation(values)):
+                raise SystemExit(f'{name}: fast serializer output differs from {serializer_class.__name__}')
+
+            scenarios = (
+                (serializer_class.__name__,
+                 lambda: serializer_class(list(base()[:rows]), many=True).data,
+                 lambda: serializer_class(instances, many=True).data),
+                ('ValuesSerializer',
+                 lambda: fast.to_representation(fast.get_queryset(base())[:rows]),
+                 lambda: fast.to_representation(values)),
+            )
+            for label, full, serialize_only in scenarios:
+                median, _ = measure(full, args.repeat)
+                serialize_median, _ = measure(serialize_only, args.repeat)
+                print(f'{name:<8} {count:>6} {label:<18} {median:>10.2f} {count / median * 1000:>12,.0f} '
+                      f'{count / serialize_median * 1000:>24,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Compare SQLite lock contention with Django's defaults and the tuned profile.
+
+Reader threads list a project's tasks while writer threads read a project and
+create a task in it with ``TaskService.create_task`` (insert plus counter
+update) in one transaction, for a fixed time:
+
+    stock   rollback journal, deferred transactions, Django's 5s busy wait
+    tuned   the ``sqlite`` profile from settings (WAL, synchronous=NORMAL,
+            busy_timeout, mmap, BEGIN IMMEDIATE)
+
+    python scripts/bench_sqlite_concurrency.py --readers 8 --writers 4 --seconds 10
+
+Each profile runs on its own database file (the journal mode is stored in the
+file). "locked" counts operations that failed with "database is locked".
+"""
+import argparse
+import threading
+import time
+
+from bench_utils import migrate, seed, setup_django
+
+
+def use_profile(db, options):
+    from django.db import connections
+
+    connections.close_all()
+    connections.settings['default'].update(NAME=db, OPTIONS=options)
+
+
+def run(readers, writers, seconds):
+    from django.db import OperationalError, connection, transaction
+    from project.models import Project
+    from task.models import Task
+    from task.services import TaskService
+
+    project_ids = list(Project.objects.values_list('id', flat=True)[:50])
+    deadline = time.perf_counter() + seconds
+    results = {'read': [], 'write': [], 'locked': 0}
+    lock = threading.Lock()
+
+    def read(i):
+        project_id = project_ids[i % len(project_ids)]
+        list(Task.objects.filter(project_id=project_id).order_by('-priority_rank', '-created_at', '-id')[:50])
+
+    def write(i):
+        with transaction.atomic():
+            project = Project.objects.get(pk=project_ids[i % len(project_ids)])
+            TaskService.create_task(title=f'Concurrent task {i}', project=project)
+
+    def worker(kind, operation):
+        samples, locked, i = [], 0, 0
+        while time.perf_counter() < deadline:
+            i += 1
+            started = time.perf_counter()
+            try:
+                operation(i)
+            except OperationalError as exc:
+                if 'locked' not in str(exc):
+                    raise
+                locked += 1
+                continue
+            samples.append(time.perf_counter() - started)
+        connection.close()
+        with lock:
+            results[kind].extend(samples)
+            results['locked'] += locked
+
+    threads = [threading.Thread(target=worker, args=('read', read)) for _ in range(readers)]
+    threads += [threading.Thread(target=worker, args=('write', write)) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def summary(samples, seconds):
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000 if samples else 0.0
+    return len(samples) / seconds, p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_concurrency', help='prefix for the per-profile files')
+    parser.add_argument('--tasks', type=int, default=50_000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10.0, help='duration of each profile')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    profiles = {
+        'stock': {'init_command': 'PRAGMA journal_mode=DELETE'},
+        'tuned': settings.DATABASE_BACKENDS['sqlite']['OPTIONS'],
+    }
+
+    print(f'{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per profile\n')
+    print(f'{"profile":<8} {"reads/s":>9} {"read p99":>9} {"writes/s":>9} {"write p99":>10} {"locked":>7}')
+    for name, options in profiles.items():
+        use_profile(f'{args.db}_{name}.sqlite3', options)
+        migrate()
+        seed(tasks=args.tasks, log=lambda message: None)
+        results = run(args.readers, args.writers, args.seconds)
+        reads, read_p99 = summary(results['read'], args.seconds)
+        writes, write_p99 = summary(results['write'], args.seconds)
+        print(f'{name:<8} {reads:>9.1f} {read_p99:>9.1f} {writes:>9.1f} {write_p99:>10.1f} {results["locked"]:>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare polling ``/api/sync/`` with re-downloading the full task and project lists.
+
+For the seeded benchmark user, ``--changes`` tasks are modified (one in ten
+of them deleted) after a full sync, then the client catches up:
+
+    full    every page of ``/api/tasks/`` and ``/api/projects/`` (page_size 500)
+    sync    ``/api/sync/?since=<cursor>`` pages until ``has_more`` is false
+
+Requests go through the full stack with the response cache disabled, and
+``SETTLE_SECONDS`` is 0 so changes are visible at once.
+
+    python scripts/bench_sync.py --tasks 1000000 --changes 0 10 100 1000
+"""
+import argparse
+import random
+
+from bench_utils import measure, migrate, seed, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_bench.sqlite3')
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--changes', type=int, nargs='+', default=[0, 10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.conf import settings
+    settings.TRACKLY_RESPONSE_CACHE = {**getattr(settings, 'TRACKLY_RESPONSE_CACHE', {}), 'ENABLED': False}
+    settings.TRACKLY_SYNC = {**getattr(settings, 'TRACKLY_SYNC', {}), 'SETTLE_SECONDS': 0}
+    migrate()
+    user = seed(tasks=args.tasks)
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.utils import timezone
+    from rest_framework.test import APIClient
+    from task.models import Task
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    def full():
+        size = 0
+        for path in ('/api/tasks/', '/api/projects/'):
+            params = {'page_size': 500, 'count': 'none'}
+            while True:
+                response = client.get(path, params)
+                size += len(response.content)
+                params['cursor'] = response.json()['next']
+                if not params['cursor']:
+                    break
+        return size
+
+    def sync(since=None):
+        size = 0
+        while True:
+            response = client.get('/api/sync/', {'since': since} if since else {})
+            size += len(response.content)
+            body = response.json()
+            since = body['cursor']
+            if not body['has_more']:
+                return size, since
+
+    owned = list(Task.objects.filter(project__owner=user).values_list('id', flat=True))
+    print(f'{len(owned):,} tasks in the benchmark account')
+    full_bytes = full()
+    full_p50, _ = measure(full, args.repeat)
+    with CaptureQueriesContext(connection) as queries:
+        full()
+    full_queries = len(queries)
+
+    print(f'{"changes":>8} {"full ms":>9} {"sync ms":>9} {"full bytes":>12} {"sync bytes":>11} '
+          f'{"full q":>7} {"sync q":>7} {"speedup":>8}')
+    for changes in args.changes:
+        _, cursor = sync()
+        changed = random.sample(owned, min(changes, len(owned)))
+        deleted = changed[:len(changed) // 10]
+        Task.objects.filter(id__in=changed[len(deleted):]).update(updated_at=timezone.now())
+        Task.objects.filter(id__in=deleted).delete()
+        owned = [pk for pk in owned if pk not in set(deleted)]
+
+        sync_bytes, _ = sync(cursor)
+        sync_p50, _ = measure(lambda: sync(cursor), args.repeat)
+        with CaptureQueriesContext(connection) as queries:
+            sync(cursor)
+        print(f'{changes:>8,} {full_p50:>9.1f} {sync_p50:>9.1f} {full_bytes:>12,} {sync_bytes:>11,} '
+              f'{full_queries:>7} {len(queries):>7} {full_p50 / sync_p50:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark refresh-token verification against the size of the blacklist tables.
+
+The tables are grown in steps; at each size the same valid refresh token is
+verified (and an access token minted from it) with simplejwt's
+``RefreshToken`` and with ``FilteredRefreshToken``:
+
+    python scripts/bench_token_blacklist.py --sizes 0 10000 100000 1000000
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from bench_utils import migrate, setup_django
+
+
+def grow(target, user, batch_size=10_000):
+    from django.utils import timezone
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+    current = BlacklistedToken.objects.count()
+    expires_at = timezone.now() + timedelta(days=1)
+    while current < target:
+        size = min(batch_size, target - current)
+        outstanding = OutstandingToken.objects.bulk_create([
+            OutstandingToken(user=user, jti=f'bench-{current + i}', token='-', expires_at=expires_at)
+            for i in range(size)
+        ])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in outstanding])
+        current += size
+    return current
+
+
+def throughput(token_class, raw, seconds):
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        str(token_class(raw).access_token)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_tokens.sqlite3')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--seconds', type=float, default=3.0, help='measurement time per scenario')
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    migrate()
+
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from user.tokens import FilteredRefreshToken, blacklist_filter
+
+    user, _ = User.objects.get_or_create(username='bench_tokens')
+    raw = str(FilteredRefreshToken.for_user(user))
+
+    print(f'{"blacklisted":>12} {"RefreshToken/s":>15} {"Filtered/s":>12} {"speedup":>8} {"filter build ms":>16}')
+    for size in sorted(args.sizes):
+        rows = grow(size, user)
+        blacklist_filter.reset()
+        started = time.perf_counter()
+        blacklist_filter.refresh()
+        build_ms = (time.perf_counter() - started) * 1000
+        stock = throughput(RefreshToken, raw, args.seconds)
+        filtered = throughput(FilteredRefreshToken, raw, args.seconds)
+        print(f'{rows:>12,} {stock:>15,.0f} {filtered:>12,.0f} {filtered / stock:>7.1f}x {build_ms:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
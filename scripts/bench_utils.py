@@ -0,0 +1,116 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Benchmarks run against their own SQLite file so they never touch db.sqlite3:
+
+    python scripts/bench_indexes.py --tasks 1000000 --db /tmp/trackly_bench.sqlite3
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django(db_path=None):
+    """Configure Django for a benchmark, optionally on a separate SQLite file."""
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Trackly.settings')
+
+    from django.conf import settings
+    if db_path:
+        settings.DATABASES['default']['NAME'] = str(db_path)
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['testserver', 'localhost', '127.0.0.1']
+
+    import django
+    django.setup()
+
+
+def migrate():
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def seed(tasks=1_000_000, users=50, projects_per_user=20, batch_size=10_000, log=print):
+    """
+    Fill the database with ``tasks`` tasks spread evenly over ``users`` users.
+
+    Returns the first user, whose account is the one benchmarks query. Seeding
+    is skipped when the database already holds at least ``tasks`` tasks.
+    """
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.utils import timezone
+    from project.models import Project
+    from task.models import Task
+
+    if Task.objects.count() >= tasks:
+        log(f'Reusing existing database with {Task.objects.count():,} tasks')
+        return User.objects.order_by('id').first()
+
+    Task.objects.all().delete()
+    Project.objects.all().delete()
+    User.objects.filter(username__startswith='bench_').delete()
+
+    log(f'Seeding {tasks:,} tasks for {users} users...')
+    owners = User.objects.bulk_create([
+        User(username=f'bench_{i}', password='!') for i in range(users)
+    ])
+    projects = Project.objects.bulk_create([
+        Project(title=f'Project {p}', owner=owner)
+        for owner in owners
+        for p in range(projects_per_user)
+    ])
+
+    statuses = ['todo', 'in_progress', 'completed']
+    priorities = ['low', 'medium', 'high']
+    today = timezone.now().date()
+    batch = []
+    started = time.perf_counter()
+    for i in range(tasks):
+        batch.append(Task(
+            title=f'Task {i} {statuses[i % 3]} work item',
+            description=f'Description for task {i}: refactor module {i % 97} and update docs',
+            project=projects[i % len(projects)],
+            status=statuses[i % 3],
+            priority=priorities[(i // 3) % 3],
+            priority_rank=Task.PRIORITY_RANKS[priorities[(i // 3) % 3]],
+            due_date=today + timedelta(days=(i % 60) - 30) if i % 4 else None,
+        ))
+        if len(batch) >= batch_size:
+            Task.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Task.objects.bulk_create(batch)
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    log(f'Seeded in {time.perf_counter() - started:.1f}s')
+    return owners[0]
+
+
+@contextmanager
+def timer():
+    """Yield a dict whose ``seconds`` key is filled in when the block exits."""
+    result = {}
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result['seconds'] = time.perf_counter() - started
+
+
+def measure(func, repeat=20):
+    """Run ``func`` ``repeat`` times and return (median, p95) latency in ms."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.95))]
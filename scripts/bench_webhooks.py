@@ -0,0 +1,113 @@
+"""
+Measure webhook delivery throughput against a local receiver.
+
+``--events`` task updates are written to the outbox for the seeded benchmark
+user, spread over ``--distinct`` tasks, and drained by ``Deliverer`` rounds
+into ``--endpoints`` endpoints on a threaded HTTP server on localhost:
+
+    batch     events per POST (``BATCH_SIZE``); 1 is one request per event
+    close     the receiver answers ``Connection: close``, so every POST
+              opens a new connection instead of reusing the pool
+
+The outbox is refilled before each run, ``SETTLE_SECONDS`` is 0 and
+``ALLOW_PRIVATE_HOSTS`` is on for the loopback receiver. With
+fewer distinct tasks than events, coalescing sends each task once per batch.
+``ports`` counts the distinct client ports the receiver saw.
+
+    python scripts/bench_webhooks.py --tasks 1000000 --events 5000 --batch-sizes 1 50 500
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench_utils import migrate, seed, setup_django
+
+
+class Receiver(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        if self.server.close_connections:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.server.connections.add(self.client_address)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='/tmp/trackly_bench.sqlite3')
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--distinct', type=int, default=None,
+                        help='Tasks the events are spread over (default: one task per event).')
+    parser.add_argument('--endpoints', type=int, default=4)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 50, 500])
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    migrate()
+    user = seed(tasks=args.tasks)
+
+    from task.models import Task
+    from webhooks import outbox
+    from webhooks.delivery import Deliverer, get_config
+    from webhooks.models import OutboxEvent, WebhookEndpoint
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Receiver)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    owned = list(Task.objects.filter(project__owner=user).values_list('id', flat=True))
+    distinct = random.sample(owned, min(args.distinct or args.events, len(owned)))
+    object_ids = [distinct[i % len(distinct)] for i in range(args.events)]
+
+    WebhookEndpoint.objects.filter(owner=user).delete()
+    WebhookEndpoint.objects.bulk_create([
+        WebhookEndpoint(owner=user, url=f'http://127.0.0.1:{server.server_port}/hook/{i}')
+        for i in range(args.endpoints)
+    ])
+
+    print(f'{args.events:,} events over {len(distinct):,} tasks to {args.endpoints} endpoint(s)')
+    print(f'{"batch":>6} {"connection":<11} {"requests":>9} {"sent":>8} {"ports":>6} {"seconds":>8} {"events/s":>10}')
+    for batch_size in args.batch_sizes:
+        for close in (False, True):
+            OutboxEvent.objects.all().delete()
+            outbox.record('updated', 'task', user.pk, object_ids)
+            WebhookEndpoint.objects.filter(owner=user).update(
+                last_event_id=0, failures=0, next_attempt_at=None, leased_until=None, is_active=True,
+            )
+            server.close_connections = close
+            server.connections = set()
+            config = {**get_config(), 'SETTLE_SECONDS': 0, 'ALLOW_PRIVATE_HOSTS': True,
+                      'BATCH_SIZE': batch_size, 'CONCURRENCY': args.concurrency}
+
+            requests = sent = 0
+            start = time.perf_counter()
+            with Deliverer(config) as deliverer:
+                while True:
+                    claimed, round_requests, round_events = deliverer.run_round()
+                    if not claimed:
+                        break
+                    requests += round_requests
+                    sent += round_events
+            elapsed = time.perf_counter() - start
+            delivered = args.events * args.endpoints
+            print(f'{batch_size:>6} {"close" if close else "keep-alive":<11} {requests:>9,} {sent:>8,} '
+                  f'{len(server.connections):>6,} {elapsed:>8.2f} {delivered / elapsed:>10,.0f}')
+
+    WebhookEndpoint.objects.filter(owner=user).delete()
+    OutboxEvent.objects.all().delete()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
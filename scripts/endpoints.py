@@ -144,6 +144,11 @@ ENDPOINTS = [
         "url": "/api/tasks/overdue/",
         "expected_status": 200,
     },
+    {
+        "method": "GET",
+        "url": "/api/sync/",
+        "expected_status": 200,
+    },
     {
         "method": "DELETE",
         "url": "/api/tasks/{task_id}/",
@@ -0,0 +1,336 @@
+"""
+Concurrent load generator for a running Trackly server.
+
+Each virtual user walks the ``ENDPOINTS`` scenario from ``endpoints.py`` the
+way ``api_test.py`` does (login token, ``{placeholder}`` and ``capture_id``
+handling), over its own keep-alive connection. The login endpoint only runs
+until the user holds a token, so iterations measure the API rather than
+password hashing (``--login-every-iteration`` changes that).
+
+    closed  ``--users`` virtual users start their next iteration as soon as the
+            last one ends (plus ``--think-ms``)
+    open    iterations arrive at ``--rate`` per second whether or not earlier
+            ones have finished, served by up to ``--users`` virtual users;
+            scenario latency is measured from the scheduled arrival, so
+            queueing behind a slow server is included
+
+    python scripts/load_test.py --mode closed --users 20 --duration 30
+    python scripts/load_test.py --mode open --rate 50 --users 100 --duration 30 --output run.json
+
+The JSON report holds p50/p95/p99 latency, throughput and error rates per
+endpoint and for whole iterations, plus the git commit, so runs can be
+compared across commits. A request is an error when its status differs from
+``expected_status`` or it raises.
+"""
+import argparse
+import json
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api_test import capture_id, prepare_request
+from endpoints import ENDPOINTS
+
+
+PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else None
+
+
+def summarize(samples, errors, statuses, elapsed):
+    samples = sorted(samples)
+    count = len(samples)
+    return {
+        'requests': count,
+        'errors': errors,
+        'error_rate': errors / count if count else 0.0,
+        'throughput_rps': count / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(samples, 0.50),
+        'p95_ms': percentile(samples, 0.95),
+        'p99_ms': percentile(samples, 0.99),
+        'mean_ms': sum(samples) / count if count else None,
+        'max_ms': samples[-1] if samples else None,
+        'statuses': dict(sorted(statuses.items())),
+    }
+
+
+class Stats:
+    """Latency samples (ms) and outcomes per endpoint, shared by all virtual users."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+        self.statuses = defaultdict(Counter)
+        self.skipped = Counter()
+
+    def record(self, name, milliseconds, status, error):
+        with self.lock:
+            self.samples[name].append(milliseconds)
+            self.statuses[name][status] += 1
+            if error:
+                self.errors[name] += 1
+
+    def skip(self, name):
+        with self.lock:
+            self.skipped[name] += 1
+
+
+class VirtualUser:
+    def __init__(self, number, base_url, endpoints, stats, login_every_iteration=False, timeout=30):
+        self.number = number
+        self.base_url = base_url
+        self.endpoints = endpoints
+        self.stats = stats
+        self.login_every_iteration = login_every_iteration
+        self.timeout = timeout
+        self.token = None
+        self.iteration = 0
+        self.session = requests.Session()
+        # One pooled keep-alive connection per virtual user
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def run_iteration(self):
+        """Walk the scenario once; return whether every request succeeded."""
+        self.iteration += 1
+        if self.login_every_iteration:
+            self.token = None
+        captured_ids = {}
+        timestamp = f'{int(time.time())}-{self.number}-{self.iteration}'
+        ok = True
+        for endpoint in self.endpoints:
+            name = f'{endpoint["method"]} {endpoint["url"]}'
+            if self.token and is_login(endpoint):
+                continue
+            method, url, data = prepare_request(endpoint, self.base_url, captured_ids, timestamp)
+            if '{' in url:
+                # The request that captures this ID failed earlier in the iteration
+                self.stats.skip(name)
+                ok = False
+                continue
+
+            headers = {'Content-Type': 'application/json'}
+            if self.token:
+                headers['Authorization'] = f'Bearer {self.token}'
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, json=data, headers=headers, timeout=self.timeout)
+                status = response.status_code
+            except requests.RequestException as exc:
+                response, status = None, type(exc).__name__
+            milliseconds = (time.perf_counter() - started) * 1000
+
+            error = status != endpoint['expected_status']
+            self.stats.record(name, milliseconds, status, error)
+            ok = ok and not error
+            if response is None or error:
+                continue
+            if is_login(endpoint):
+                self.token = response.json()['data']['access']
+            capture_id(endpoint, response, captured_ids)
+        return ok
+
+    def close(self):
+        self.session.close()
+
+
+def is_login(endpoint):
+    return endpoint['url'].rstrip('/').endswith('/login')
+
+
+def select_endpoints(endpoints, methods=None):
+    """
+    The scenario limited to ``methods`` (login always runs).
+
+    Endpoints whose URL needs an ID that only a filtered-out request captures
+    are dropped as well, so a ``GET``-only run doesn't count them as skipped.
+    """
+    if not methods:
+        return list(endpoints)
+    selected = []
+    captured = set()
+    for endpoint in endpoints:
+        if endpoint['method'] not in methods and not is_login(endpoint):
+            continue
+        if not set(PLACEHOLDER.findall(endpoint['url'])) <= captured:
+            continue
+        selected.append(endpoint)
+        if 'capture_id' in endpoint:
+            captured.add(endpoint['capture_id'])
+    return selected
+
+
+def run_closed(users, duration, think_ms):
+    deadline = time.perf_counter() + duration
+    scenarios = []
+    lock = threading.Lock()
+
+    def loop(user):
+        results = []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            ok = user.run_iteration()
+            results.append(((time.perf_counter() - started) * 1000, ok))
+            if think_ms:
+                time.sleep(think_ms / 1000)
+        with lock:
+            scenarios.extend(results)
+
+    threads = [threading.Thread(target=loop, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return scenarios, 0
+
+
+def run_open(users, duration, rate):
+    idle = queue.Queue()
+    for user in users:
+        idle.put(user)
+    scenarios = []
+    lock = threading.Lock()
+    arrivals = queue.Queue()
+
+    def worker():
+        while True:
+            scheduled = arrivals.get()
+            if scheduled is None:
+                return
+            user = idle.get()
+            ok = user.run_iteration()
+            idle.put(user)
+            with lock:
+                scenarios.append(((time.perf_counter() - scheduled) * 1000, ok))
+
+    threads = [threading.Thread(target=worker) for _ in users]
+    for thread in threads:
+        thread.start()
+
+    # Schedule arrivals at fixed intervals; a late scheduler never skips any
+    start = time.perf_counter()
+    total = int(duration * rate)
+    for i in range(total):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        arrivals.put(scheduled)
+    backlog = arrivals.qsize()
+    for _ in threads:
+        arrivals.put(None)
+    for thread in threads:
+        thread.join()
+    return scenarios, backlog
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(args, stats, scenarios, backlog, elapsed):
+    endpoints = {}
+    for endpoint in ENDPOINTS:
+        name = f'{endpoint["method"]} {endpoint["url"]}'
+        if name in stats.samples or name in stats.skipped:
+            endpoints[name] = {
+                **summarize(stats.samples[name], stats.errors[name], stats.statuses[name], elapsed),
+                'skipped': stats.skipped[name],
+            }
+    all_samples = [sample for samples in stats.samples.values() for sample in samples]
+    all_statuses = Counter()
+    for statuses in stats.statuses.values():
+        all_statuses.update(statuses)
+    failed = sum(not ok for _, ok in scenarios)
+    return {
+        'commit': git_commit(),
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'config': {
+            'base_url': args.base_url,
+            'mode': args.mode,
+            'users': args.users,
+            'rate': args.rate if args.mode == 'open' else None,
+            'duration_s': args.duration,
+            'think_ms': args.think_ms if args.mode == 'closed' else None,
+            'login_every_iteration': args.login_every_iteration,
+        },
+        'elapsed_s': elapsed,
+        'totals': summarize(all_samples, sum(stats.errors.values()), all_statuses, elapsed),
+        'scenario': {
+            **summarize([ms for ms, _ in scenarios], failed, Counter(), elapsed),
+            # Open loop: arrivals still queued when the schedule ended
+            'backlog': backlog,
+        },
+        'endpoints': endpoints,
+    }
+
+
+def print_summary(report, stream=sys.stderr):
+    def ms(value):
+        return f'{value:.1f}' if value is not None else '-'
+
+    print(f'{"endpoint":<48} {"reqs":>6} {"err %":>6} {"rps":>7} {"p50":>7} {"p95":>7} {"p99":>7}', file=stream)
+    rows = list(report['endpoints'].items()) + [('TOTAL', report['totals']), ('SCENARIO', report['scenario'])]
+    for name, row in rows:
+        print(f'{name:<48} {row["requests"]:>6} {row["error_rate"] * 100:>6.1f} {row["throughput_rps"]:>7.1f} '
+              f'{ms(row["p50_ms"]):>7} {ms(row["p95_ms"]):>7} {ms(row["p99_ms"]):>7}', file=stream)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--mode', choices=('closed', 'open'), default='closed')
+    parser.add_argument('--users', type=int, default=10, help='virtual users (the concurrency cap in open mode)')
+    parser.add_argument('--rate', type=float, default=10.0, help='open mode: scenario iterations started per second')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds to generate load')
+    parser.add_argument('--think-ms', type=float, default=0.0, help='closed mode: pause between iterations')
+    parser.add_argument('--methods', nargs='+', help='only run endpoints with these methods (login always runs)')
+    parser.add_argument('--login-every-iteration', action='store_true')
+    parser.add_argument('--timeout', type=float, default=30.0, help='per-request timeout in seconds')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    endpoints = select_endpoints(ENDPOINTS, args.methods)
+    stats = Stats()
+    users = [
+        VirtualUser(number, args.base_url.rstrip('/'), endpoints, stats, args.login_every_iteration, args.timeout)
+        for number in range(args.users)
+    ]
+
+    started = time.perf_counter()
+    if args.mode == 'closed':
+        scenarios, backlog = run_closed(users, args.duration, args.think_ms)
+    else:
+        scenarios, backlog = run_open(users, args.duration, args.rate)
+    elapsed = time.perf_counter() - started
+    for user in users:
+        user.close()
+
+    report = build_report(args, stats, scenarios, backlog, elapsed)
+    print_summary(report)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from sync.models import Tombstone
+from sync.services import retention_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete sync tombstones older than TRACKLY_SYNC["TOMBSTONE_RETENTION_DAYS"] in small '
+        'batches. Clients whose cursor is older than the window start over with a full sync, '
+        'so the tombstones are no longer needed. Schedule it (e.g. daily from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Seconds to sleep between batches to spare the database.')
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff()
+        batch_size = options['batch_size']
+        deleted = 0
+        while True:
+            ids = list(
+                Tombstone.objects.filter(deleted_at__lt=cutoff)
+                .order_by('deleted_at').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            Tombstone.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+            if options['pause']:
+                time.sleep(options['pause'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstone(s).'))
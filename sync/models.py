@@ -0,0 +1,27 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """A deleted project or task, kept for ``/api/sync/`` until compacted."""
+    MODEL_CHOICES = [
+        ('project', 'Project'),
+        ('task', 'Task'),
+    ]
+    
+    model = models.CharField(max_length=10, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    # No foreign key: tombstones are written while the owner's rows are being deleted
+    owner_id = models.IntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        indexes = [
+            # SyncService pages one owner's deletions on (deleted_at, id)
+            models.Index(fields=['owner_id', 'deleted_at', 'id'], name='tombstone_owner_deleted_idx'),
+            # compact_tombstones removes everything past the retention window
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
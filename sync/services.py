@@ -0,0 +1,176 @@
+"""
+Delta sync: the projects and tasks a user's client has not seen yet.
+
+Three streams are read for the user, each in ``(timestamp, id)`` order:
+
+    projects  ``Project.updated_at``
+    tasks     ``Task.updated_at``, without the fields copied from the project
+    deleted   ``Tombstone.deleted_at``, written on ``post_delete``
+
+The cursor holds the last position returned from each stream, so a page
+costs index range scans over what changed since then rather than a read of
+the whole account. A stream that is caught up moves to the current horizon,
+which also keeps the cursor of an idle account from aging into expiry.
+
+Rows stamped within ``SETTLE_SECONDS`` of now are held back to the next
+request: ``updated_at`` is set before the writing transaction commits, so a
+row stamped just before the cursor could otherwise become visible after the
+cursor passed it.
+
+Tombstones are removed after ``TOMBSTONE_RETENTION_DAYS`` by the
+``compact_tombstones`` command. Cursors older than that are rejected with
+``CursorExpired`` and the client starts over with a full sync.
+"""
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from Trackly.fast_serializers import ValuesSerializer
+from project.models import Project
+from project.serializers import ProjectSerializer
+from task.models import Task
+from task.serializers import TaskSerializer
+from .models import Tombstone
+
+
+DEFAULT_SYNC = {
+    'PAGE_SIZE': 500,
+    'MAX_PAGE_SIZE': 5000,
+    'SETTLE_SECONDS': 1.0,
+    'TOMBSTONE_RETENTION_DAYS': 30,
+}
+
+STREAMS = ('projects', 'tasks', 'deleted')
+SYNC_ORDERING = ('updated_at', 'id')
+# Copied from the project, so a rename would not reach tasks synced earlier;
+# clients join tasks to their project by its id instead
+PROJECT_DERIVED_TASK_FIELDS = ('project_name', 'project_owner')
+
+
+def get_config():
+    return {**DEFAULT_SYNC, **getattr(settings, 'TRACKLY_SYNC', {})}
+
+
+def retention_cutoff(now=None):
+    """Tombstones before this are compacted, and cursors before it have expired."""
+    return (now or timezone.now()) - timedelta(days=get_config()['TOMBSTONE_RETENTION_DAYS'])
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorExpired(Exception):
+    pass
+
+
+def encode_cursor(positions):
+    payload = {
+        stream: [timestamp.isoformat(), pk] if (timestamp, pk) != (None, None) else None
+        for stream, (timestamp, pk) in positions.items()
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(encoded):
+    """``{stream: (timestamp, id)}``; ``(None, None)`` for a stream read from the start."""
+    try:
+        padded = encoded + '=' * (-len(encoded) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        positions = {}
+        for stream in STREAMS:
+            value = payload[stream]
+            if value is None:
+                positions[stream] = (None, None)
+                continue
+            timestamp = parse_datetime(value[0])
+            if timestamp is None or timezone.is_naive(timestamp) or not isinstance(value[1], int):
+                raise ValueError(value)
+            positions[stream] = (timestamp, value[1])
+    except Exception:
+        raise InvalidCursor('Invalid cursor')
+    if positions['deleted'][0] is None:
+        raise InvalidCursor('Invalid cursor')
+    return positions
+
+
+def task_fields():
+    return tuple(name for name in TaskSerializer().fields if name not in PROJECT_DERIVED_TASK_FIELDS)
+
+
+def read_stream(queryset, column, position, horizon, page_size):
+    """
+    Return ``(rows, position, has_more)`` for the next ``page_size`` rows after ``position``.
+
+    Only rows stamped before ``horizon`` are read; a caught-up stream
+    continues from ``horizon`` next time.
+    """
+    timestamp, pk = position
+    queryset = queryset.filter(**{f'{column}__lt': horizon}).order_by(column, 'id')
+    if timestamp is not None:
+        queryset = queryset.filter(Q(**{f'{column}__gt': timestamp}) | Q(**{column: timestamp, 'id__gt': pk}))
+    rows = list(queryset[:page_size + 1])
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, (rows[-1][column], rows[-1]['id']), True
+    if timestamp is not None and (timestamp, pk) > (horizon, 0):
+        return rows, position, False
+    return rows, (horizon, 0), False
+
+
+class SyncService:
+    @staticmethod
+    def get_changes(user, since=None, page_size=None):
+        """
+        One page of ``user``'s changes after the ``since`` cursor, or of everything without one.
+
+        Returns ``{'projects', 'tasks', 'deleted', 'cursor', 'has_more'}``;
+        raises ``InvalidCursor`` or ``CursorExpired``.
+        """
+        config = get_config()
+        now = timezone.now()
+        horizon = now - timedelta(seconds=config['SETTLE_SECONDS'])
+        page_size = min(page_size or config['PAGE_SIZE'], config['MAX_PAGE_SIZE'])
+
+        if since:
+            positions = decode_cursor(since)
+            if positions['deleted'][0] < retention_cutoff(now):
+                raise CursorExpired('Sync cursor expired; start a full sync without since')
+        else:
+            # A full sync returns every live row, so only later deletions matter
+            positions = {'projects': (None, None), 'tasks': (None, None), 'deleted': (horizon, 0)}
+
+        projects = ValuesSerializer.for_serializer(ProjectSerializer)
+        tasks = ValuesSerializer.for_serializer(TaskSerializer, task_fields())
+        streams = {
+            'projects': (projects.get_queryset(Project.objects.filter(owner=user), SYNC_ORDERING), 'updated_at'),
+            'tasks': (tasks.get_queryset(Task.objects.filter(project__owner=user), SYNC_ORDERING), 'updated_at'),
+            'deleted': (
+                Tombstone.objects.filter(owner_id=user.pk).values('id', 'model', 'object_id', 'deleted_at'),
+                'deleted_at',
+            ),
+        }
+
+        rows = {}
+        has_more = False
+        for stream, (queryset, column) in streams.items():
+            rows[stream], positions[stream], more = read_stream(
+                queryset, column, positions[stream], horizon, page_size,
+            )
+            has_more = has_more or more
+
+        deleted = {'projects': [], 'tasks': []}
+        for row in rows['deleted']:
+            deleted[f'{row["model"]}s'].append(row['object_id'])
+        return {
+            'projects': projects.to_representation(rows['projects']),
+            'tasks': tasks.to_representation(rows['tasks']),
+            'deleted': deleted,
+            'cursor': encode_cursor(positions),
+            'has_more': has_more,
+        }
@@ -0,0 +1,29 @@
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from project.models import Project
+from task.models import Task
+from task.signals import task_owner_id
+from .models import Tombstone
+
+
+def origin_model(origin):
+    """Model whose delete started the cascade; ``origin`` is an instance or a queryset."""
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+@receiver(post_delete, sender=Project)
+def record_project_deletion(sender, instance, origin=None, **kwargs):
+    if origin_model(origin) is User:
+        # The owner is gone, and nobody else syncs their projects
+        return
+    Tombstone.objects.create(model='project', object_id=instance.pk, owner_id=instance.owner_id)
+
+
+@receiver(post_delete, sender=Task)
+def record_task_deletion(sender, instance, origin=None, **kwargs):
+    if origin_model(origin) in (Project, User):
+        # Cascade; a deleted project's tombstone stands for its tasks
+        return
+    Tombstone.objects.create(model='task', object_id=instance.pk, owner_id=task_owner_id(instance))
@@ -0,0 +1,56 @@
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .services import CursorExpired, InvalidCursor, SyncService
+
+
+class SyncViewSet(viewsets.ViewSet):
+    """
+    Incremental sync of the user's projects and tasks.
+
+    Served from the primary database: a lagging replica could hide rows the
+    cursor then moves past.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def list(self, request):
+        """Changes since the ``since`` cursor, or everything when it is omitted."""
+        try:
+            page_size = int(request.query_params.get('page_size', 0))
+        except ValueError:
+            page_size = 0
+        try:
+            changes = SyncService.get_changes(
+                request.user, request.query_params.get('since'), page_size if page_size > 0 else None,
+            )
+            
+            return Response(
+                {
+                    'success': True,
+                    'message': 'Changes retrieved successfully',
+                    'data': {
+                        'projects': changes['projects'],
+                        'tasks': changes['tasks'],
+                        'deleted': changes['deleted']
+                    },
+                    'cursor': changes['cursor'],
+                    'has_more': changes['has_more']
+                },
+                status=status.HTTP_200_OK
+            )
+        except InvalidCursor as e:
+            return Response(
+                {
+                    'success': False,
+                    'message': str(e)
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except CursorExpired as e:
+            return Response(
+                {
+                    'success': False,
+                    'message': str(e)
+                },
+                status=status.HTTP_410_GONE
+            )
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class TaskConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from Trackly.search import ensure_triggers
+        # SQLite table rebuilds during migrate drop the full-text index triggers
+        post_migrate.connect(ensure_triggers, sender=self)
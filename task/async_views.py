@@ -0,0 +1,45 @@
+from rest_framework import status
+from Trackly.async_views import AsyncReadView
+from Trackly import fieldsets
+from .pagination import TaskPagination
+from .serializers import TaskSerializer
+from .services import TaskService
+
+
+class TaskListView(AsyncReadView):
+    """Async ``GET /api/tasks/``: same filters, cursor pagination and envelope."""
+    failure_message = 'Failed to retrieve tasks'
+
+    async def respond(self, request):
+        queryset = TaskService.get_user_tasks(request.user, request.query_params)
+        paginator = TaskPagination()
+        fast = fieldsets.values_serializer(TaskSerializer, request.query_params)
+        page = await paginator.apaginate_queryset(fast.get_queryset(queryset, paginator.get_ordering(queryset)), request)
+        return self.render(
+            {
+                'success': True,
+                'message': 'Tasks retrieved successfully',
+                'data': fast.to_representation(page),
+                **paginator.get_envelope_fields()
+            },
+            status.HTTP_200_OK
+        )
+
+
+class OverdueTaskListView(AsyncReadView):
+    """Async ``GET /api/tasks/overdue/``."""
+    failure_message = 'Failed to retrieve overdue tasks'
+
+    async def respond(self, request):
+        fast = fieldsets.values_serializer(TaskSerializer, request.query_params)
+        queryset = fast.get_queryset(TaskService.get_overdue_user_tasks(request.user))
+        data = fast.to_representation([row async for row in queryset])
+        return self.render(
+            {
+                'success': True,
+                'message': 'Overdue tasks retrieved successfully',
+                'data': data,
+                'count': len(data)
+            },
+            status.HTTP_200_OK
+        )
@@ -0,0 +1,106 @@
+"""
+Streaming task export.
+
+Rows are read with ``values()`` over ``iterator(chunk_size=...)`` and encoded
+one at a time, so memory stays flat no matter how many tasks are exported.
+Column names and value formats match ``TaskSerializer``, and ``?fields=``/
+``?exclude=`` narrow the columns the same way they narrow the list.
+"""
+import csv
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+from Trackly.fast_serializers import format_date, format_datetime
+
+
+# (output column, values() lookup) in TaskSerializer field order
+EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('project_name', 'project__title'),
+    ('project_owner', 'project__owner__username'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('status', 'status'),
+    ('priority', 'priority'),
+    ('due_date', 'due_date'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+    ('project', 'project_id'),
+]
+
+CHUNK_SIZE = 2000
+
+
+FORMATTERS = {
+    'due_date': format_date,
+    'created_at': format_datetime,
+    'updated_at': format_datetime,
+}
+
+
+def export_columns(fieldset=None):
+    """``EXPORT_COLUMNS`` limited to the ``fieldset`` names, if given."""
+    if fieldset is None:
+        return EXPORT_COLUMNS
+    return [(name, lookup) for name, lookup in EXPORT_COLUMNS if name in fieldset]
+
+
+def export_rows(queryset, chunk_size=CHUNK_SIZE, columns=EXPORT_COLUMNS):
+    """Yield one dict per task, keyed and formatted like ``TaskSerializer``."""
+    lookups = [lookup for _, lookup in columns]
+    formatters = [(name, lookup, FORMATTERS.get(name)) for name, lookup in columns]
+    for row in queryset.values(*lookups).iterator(chunk_size=chunk_size):
+        yield {
+            name: formatter(row[lookup]) if formatter else row[lookup]
+            for name, lookup, formatter in formatters
+        }
+
+
+def stream_ndjson(queryset, chunk_size=CHUNK_SIZE, columns=EXPORT_COLUMNS):
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for row in export_rows(queryset, chunk_size, columns):
+        yield encoder.encode(row) + '\n'
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value, so csv.writer output can be yielded."""
+    def write(self, value):
+        return value
+
+
+def stream_csv(queryset, chunk_size=CHUNK_SIZE, columns=EXPORT_COLUMNS):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in columns])
+    for row in export_rows(queryset, chunk_size, columns):
+        yield writer.writerow(['' if value is None else value for value in row.values()])
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Selects ``?format=ndjson``; also renders error responses as a single line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return (json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n').encode()
+
+
+class CSVRenderer(BaseRenderer):
+    """Selects ``?format=csv``; also renders error responses as a one-row table."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        buffer = _Echo()
+        writer = csv.writer(buffer)
+        if not isinstance(data, dict):
+            data = {'data': data}
+        return (writer.writerow(list(data)) + writer.writerow([str(value) for value in data.values()])).encode()
+
+
+STREAMS = {
+    'ndjson': stream_ndjson,
+    'csv': stream_csv,
+}
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+from django.db.models import Case, Max, Min, Value, When
+
+
+BATCH_SIZE = 10000
+
+
+def backfill_priority_rank(apps, schema_editor):
+    """Copy priority into priority_rank in id-range batches so no single UPDATE locks the table for long."""
+    Task = apps.get_model('task', 'Task')
+    bounds = Task.objects.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        return
+
+    rank = Case(
+        When(priority='high', then=Value(3)),
+        When(priority='low', then=Value(1)),
+        default=Value(2),
+    )
+    for start in range(bounds['low'], bounds['high'] + 1, BATCH_SIZE):
+        Task.objects.filter(id__gte=start, id__lt=start + BATCH_SIZE).exclude(
+            priority='medium'
+        ).update(priority_rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    # Each backfill batch commits on its own
+    atomic = False
+
+    dependencies = [
+        ('task', '0002_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(default=2, editable=False),
+        ),
+        migrations.RunPython(backfill_priority_rank, migrations.RunPython.noop),
+    ]
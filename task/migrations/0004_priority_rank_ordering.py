@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0003_task_priority_rank'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['-priority_rank', '-created_at']},
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_project_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_project_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_project_ordering_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', '-priority_rank', '-created_at', '-id'], name='task_project_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', '-priority_rank', '-created_at', '-id'], name='task_project_status_rank_idx'),
+        ),
+    ]
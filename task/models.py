@@ -1,5 +1,7 @@
 from django.db import models
 
+from Trackly.search import SearchDocumentField
+
 class TaskManager(models.Manager):
     def by_status(self, status):
         return self.filter(status=status)
@@ -27,11 +29,19 @@ class Task(models.Model):
         ('high', 'High'),
     ]
     
+    # Integer rank mirrored from priority so ordering is numeric and index-backed
+    PRIORITY_RANKS = {
+        'low': 1,
+        'medium': 2,
+        'high': 3,
+    }
+    
     title = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     project = models.ForeignKey('project.Project', related_name='tasks', on_delete=models.CASCADE)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='todo')
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='medium')
+    priority_rank = models.PositiveSmallIntegerField(default=2, editable=False)
     due_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -39,7 +49,44 @@ class Task(models.Model):
     objects = TaskManager()
     
     class Meta:
-        ordering = ['-priority', '-created_at']
+        ordering = ['-priority_rank', '-created_at']
+        indexes = [
+            # TaskViewSet.get_queryset resolves project__owner to project ids, then
+            # filters on optional status/priority and pages on -priority_rank, -created_at, -id.
+            models.Index(fields=['project', '-priority_rank', '-created_at', '-id'], name='task_project_rank_idx'),
+            models.Index(
+                fields=['project', 'status', '-priority_rank', '-created_at', '-id'],
+                name='task_project_status_rank_idx',
+            ),
+            models.Index(fields=['project', 'priority', '-created_at', '-id'], name='task_project_priority_idx'),
+            # TaskManager.overdue(): only open tasks with a due date are indexed
+            models.Index(
+                fields=['project', 'due_date'],
+                condition=models.Q(status__in=['todo', 'in_progress'], due_date__isnull=False),
+                name='task_open_due_idx',
+            ),
+            # /api/sync/ reads a user's changed tasks per project in (updated_at, id) order
+            models.Index(fields=['project', 'updated_at', 'id'], name='task_project_updated_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        self.priority_rank = self.PRIORITY_RANKS.get(self.priority, self.priority_rank)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'priority' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'priority_rank'}
+        super().save(*args, **kwargs)
     
     def __str__(self):
-        return f"{self.title} - {self.project.name}"
\ No newline at end of file
+        return f"{self.title} - {self.project.name}"
+
+
+class TaskSearchEntry(models.Model):
+    """Row of the SQLite FTS5 index over tasks, joined by ``Trackly.search``; never created or loaded."""
+    task = models.OneToOneField(
+        Task, models.DO_NOTHING, primary_key=True, db_column='rowid', related_name='search_entry',
+    )
+    document = SearchDocumentField(db_column='task_task_fts')
+    
+    class Meta:
+        managed = False
+        db_table = 'task_task_fts'
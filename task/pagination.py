@@ -0,0 +1,6 @@
+from Trackly.pagination import KeysetPagination
+
+
+class TaskPagination(KeysetPagination):
+    """Keyset pagination on the task default ordering, with id as the tiebreaker."""
+    ordering = ('-priority_rank', '-created_at', '-id')
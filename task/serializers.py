@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Task
+from project.models import Project
 
 class TaskSerializer(serializers.ModelSerializer):
     """Serializer for Task model with project name included."""
@@ -8,12 +9,73 @@ class TaskSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Task
-        fields = '__all__'
+        # priority_rank is derived from priority and stays internal
+        exclude = ('priority_rank',)
         read_only_fields = ('created_at', 'updated_at')
+        # project_name/project_owner read through the owner, so load it with the project
+        extra_kwargs = {'project': {'queryset': Project.objects.select_related('owner')}}
 
 class TaskCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating tasks."""
     class Meta:
         model = Task
         fields = ('title', 'description', 'project', 'status', 'priority', 'due_date')
-        read_only_fields = ('created_at', 'updated_at')
\ No newline at end of file
+        read_only_fields = ('created_at', 'updated_at')
+        extra_kwargs = {'project': {'queryset': Project.objects.select_related('owner')}}
+
+class PrefetchedProjectField(serializers.PrimaryKeyRelatedField):
+    """Resolve project ids from ``context['projects']`` instead of querying per item."""
+    # Largest BigAutoField id; larger ids cannot exist and overflow the database driver
+    MAX_PK = 2 ** 63 - 1
+    
+    @classmethod
+    def to_pk(cls, data):
+        """The project id in ``data`` (an int or a string of digits), or None if it is not one."""
+        if isinstance(data, int) and not isinstance(data, bool):
+            pk = data
+        elif isinstance(data, str) and data.isascii() and data.isdigit():
+            pk = int(data)
+        else:
+            return None
+        return pk if 0 < pk <= cls.MAX_PK else None
+    
+    def to_internal_value(self, data):
+        if not isinstance(data, (int, str)) or isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        pk = self.to_pk(data)
+        project = self.context['projects'].get(pk) if pk is not None else None
+        if project is None:
+            self.fail('does_not_exist', pk_value=data)
+        return project
+
+
+class TaskBulkItemSerializer(TaskCreateSerializer):
+    """One item of a bulk create; projects are loaded up front by the caller."""
+    project = PrefetchedProjectField(queryset=Project.objects.all())
+
+
+class TaskBulkCreateSerializer(serializers.Serializer):
+    """Envelope for bulk task creation."""
+    MODE_CHOICES = [
+        ('atomic', 'All or nothing'),
+        ('best_effort', 'Create the valid items'),
+    ]
+    
+    tasks = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=1000)
+    mode = serializers.ChoiceField(choices=MODE_CHOICES, default='atomic')
+
+
+class TaskBulkTransitionSerializer(serializers.Serializer):
+    """Selection and target for a bulk status/priority transition."""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=10000)
+    project = serializers.IntegerField(required=False)
+    from_status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    
+    def validate(self, attrs):
+        if not any(key in attrs for key in ('ids', 'project', 'from_status')):
+            raise serializers.ValidationError('Provide ids, project or from_status to select tasks')
+        if not any(key in attrs for key in ('status', 'priority')):
+            raise serializers.ValidationError('Provide a target status or priority')
+        return attrs
\ No newline at end of file
@@ -1,9 +1,95 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+from Trackly import search
+from Trackly.response_cache import invalidate_user
+from project import counters
+from webhooks import outbox
 from .models import Task
 
 class TaskService:
     @staticmethod
+    @transaction.atomic(savepoint=False)
     def create_task(**data):
-        return Task.objects.create(**data)
+        task = Task.objects.create(**data)
+        counters.apply_deltas(counters.state_deltas(None, counters.task_state(task)))
+        outbox.record('created', 'task', task.project.owner_id, [task.pk])
+        return task
+    
+    @staticmethod
+    @transaction.atomic(savepoint=False)
+    def update_task(task, **data):
+        """Apply validated field changes and move the task between project counters."""
+        deltas = counters.state_deltas(counters.task_state(task), None)
+        for field, value in data.items():
+            setattr(task, field, value)
+        task.save()
+        counters.apply_deltas(counters.state_deltas(None, counters.task_state(task), deltas))
+        outbox.record('updated', 'task', task.project.owner_id, [task.pk])
+        return task
+    
+    @staticmethod
+    @transaction.atomic(savepoint=False)
+    def delete_task(task):
+        state = counters.task_state(task)
+        owner_id, task_id = task.project.owner_id, task.pk
+        task.delete()
+        counters.apply_deltas(counters.state_deltas(state, None))
+        outbox.record('deleted', 'task', owner_id, [task_id])
+    
+    @staticmethod
+    @transaction.atomic
+    def bulk_create_tasks(items, batch_size=500):
+        """Insert validated task payloads with batched multi-row INSERTs."""
+        tasks = [Task(**data) for data in items]
+        for task in tasks:
+            task.priority_rank = Task.PRIORITY_RANKS.get(task.priority, task.priority_rank)
+        created = Task.objects.bulk_create(tasks, batch_size=batch_size)
+        deltas = counters.Counter()
+        for task in created:
+            counters.state_deltas(None, counters.task_state(task), deltas)
+        counters.apply_deltas(deltas)
+        by_owner = defaultdict(list)
+        for task in created:
+            by_owner[task.project.owner_id].append(task.pk)
+        for owner_id, task_ids in by_owner.items():
+            outbox.record('created', 'task', owner_id, task_ids)
+            # bulk_create sends no post_save signals
+            invalidate_user(owner_id)
+        return created
+    
+    @staticmethod
+    def get_user_tasks(user, filters=None):
+        """Tasks in ``user``'s projects, narrowed by the ``project``/``status``/``priority``/``q`` filters."""
+        queryset = Task.objects.select_related('project__owner').filter(project__owner=user)
+        filters = filters or {}
+        
+        # Filter by project if specified
+        project_id = filters.get('project')
+        if project_id:
+            queryset = queryset.filter(project_id=project_id)
+        
+        # Filter by status if specified
+        task_status = filters.get('status')
+        if task_status:
+            queryset = queryset.filter(status=task_status)
+        
+        # Filter by priority if specified
+        priority = filters.get('priority')
+        if priority:
+            queryset = queryset.filter(priority=priority)
+        
+        # Full-text search, ranked by relevance
+        query = filters.get('q')
+        if query:
+            queryset = search.search(queryset, query)
+        
+        return queryset
+    
+    @staticmethod
+    def get_overdue_user_tasks(user):
+        return Task.objects.overdue().select_related('project__owner').filter(project__owner=user)
     
     @staticmethod
     def get_project_tasks(project):
@@ -14,12 +100,51 @@ class TaskService:
         return Task.objects.overdue()
     
     @staticmethod
-    def update_task_status(task_id, status):
-        task = Task.objects.get(id=task_id)
-        task.status = status
-        task.save()
+    def transition_changes(status=None, priority=None):
+        """Column values for a status/priority transition, including the derived rank."""
+        changes = {'updated_at': timezone.now()}
+        if status:
+            changes['status'] = status
+        if priority:
+            changes['priority'] = priority
+            changes['priority_rank'] = Task.PRIORITY_RANKS[priority]
+        return changes
+    
+    @staticmethod
+    @transaction.atomic(savepoint=False)
+    def update_task_status(task, status):
+        """Set the status with one UPDATE instead of rewriting every column."""
+        old_state = counters.task_state(task)
+        changes = TaskService.transition_changes(status=status)
+        Task.objects.filter(pk=task.pk).update(**changes)
+        for field, value in changes.items():
+            setattr(task, field, value)
+        counters.apply_deltas(counters.state_deltas(old_state, counters.task_state(task)))
+        outbox.record('updated', 'task', task.project.owner_id, [task.pk])
+        invalidate_user(task.project.owner_id)
         return task
     
+    @staticmethod
+    @transaction.atomic(savepoint=False)
+    def transition_tasks(user, queryset, status=None, priority=None):
+        """
+        Move every task in ``queryset`` owned by ``user`` to ``status``/``priority`` with one UPDATE.
+
+        The matching ids are locked and returned so clients know what changed.
+        """
+        queryset = queryset.filter(project__owner=user)
+        ids = list(queryset.select_for_update().order_by().values_list('id', flat=True))
+        if not ids:
+            return []
+        # Only the locked rows: one starting to match the filter meanwhile is left alone
+        locked = Task.objects.filter(id__in=ids)
+        deltas = counters.transition_deltas(locked, status=status)
+        locked.update(**TaskService.transition_changes(status=status, priority=priority))
+        counters.apply_deltas(deltas)
+        outbox.record('updated', 'task', user.pk, ids)
+        invalidate_user(user.pk)
+        return ids
+    
     @staticmethod
     def get_tasks_by_priority(priority):
         return Task.objects.by_priority(priority)
\ No newline at end of file
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from Trackly.response_cache import invalidate_user
+from project.models import Project
+from .models import Task
+
+
+def task_owner_id(task):
+    """Owner of the task's project, without a query when the project is already loaded."""
+    if Task.project.is_cached(task):
+        return task.project.owner_id
+    return Project.objects.filter(pk=task.project_id).values_list('owner_id', flat=True).first()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_owner_responses(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Project):
+        # Cascade from a project delete; the project's own signal covers the owner
+        return
+    invalidate_user(task_owner_id(instance))
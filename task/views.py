@@ -2,43 +2,43 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
 from django.db import transaction
+from django.db.models import Max
+from django.http import StreamingHttpResponse
 from rest_framework.validators import ValidationError
 from django.shortcuts import get_object_or_404
 from .models import Task
-from .serializers import TaskSerializer, TaskCreateSerializer
+from .serializers import (
+    TaskSerializer, TaskCreateSerializer, TaskBulkCreateSerializer, TaskBulkItemSerializer,
+    TaskBulkTransitionSerializer, PrefetchedProjectField
+)
 from .services import TaskService
+from .pagination import TaskPagination
+from .export import STREAMS, NDJSONRenderer, CSVRenderer, export_columns
+from Trackly.conditional import conditional_response
+from Trackly.db_router import ReplicaReadMixin
+from Trackly.fast_serializers import ValuesListMixin
+from Trackly.fieldsets import SparseFieldsetMixin
+from Trackly.response_cache import cache_response
 from project.models import Project
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ReplicaReadMixin, SparseFieldsetMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing tasks within projects.
     Provides CRUD operations with proper authorization and filtering.
     """
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskPagination
+    # project_name is part of the representation, so project edits change the validator
+    validator_aggregates = {'project_last_modified': Max('project__updated_at')}
+    fieldset_actions = ('list', 'retrieve', 'overdue', 'export')
     
     def get_queryset(self):
         """Return tasks for projects owned by the authenticated user."""
-        queryset = Task.objects.filter(project__owner=self.request.user)
-        
-        # Filter by project if specified
-        project_id = self.request.query_params.get('project')
-        if project_id:
-            queryset = queryset.filter(project_id=project_id)
-        
-        # Filter by status if specified
-        task_status = self.request.query_params.get('status')
-        if task_status:
-            queryset = queryset.filter(status=task_status)
-        
-        # Filter by priority if specified
-        priority = self.request.query_params.get('priority')
-        if priority:
-            queryset = queryset.filter(priority=priority)
-        
-        return queryset
+        return TaskService.get_user_tasks(self.request.user, self.request.query_params)
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -46,21 +46,30 @@ class TaskViewSet(viewsets.ModelViewSet):
             return TaskCreateSerializer
         return TaskSerializer
     
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
-        """List tasks with optional filtering."""
+        """List tasks with optional filtering, one cursor page at a time."""
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
+            data = self.paginate_rows(self.get_queryset())
             
             return Response(
                 {
                     'success': True,
                     'message': 'Tasks retrieved successfully',
-                    'data': serializer.data,
-                    'count': queryset.count()
+                    'data': data,
+                    **self.paginator.get_envelope_fields()
                 },
                 status=status.HTTP_200_OK
             )
+        except NotFound as e:
+            return Response(
+                {
+                    'success': False,
+                    'message': str(e.detail)
+                },
+                status=status.HTTP_404_NOT_FOUND
+            )
         except Exception as e:
             return Response(
                 {
@@ -80,7 +89,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             
             # Verify project ownership
             project = serializer.validated_data['project']
-            if project.owner != request.user:
+            if project.owner_id != request.user.id:
                 return Response(
                     {
                         'success': False,
@@ -119,6 +128,96 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @action(detail=False, methods=['post'], url_path='bulk')
+    @transaction.atomic
+    def bulk_create(self, request):
+        """
+        Create many tasks in one request.
+
+        Accepts ``{"mode": "atomic"|"best_effort", "tasks": [...]}`` or a bare
+        list (atomic). All referenced projects are loaded with one query, and
+        the valid items are inserted with ``bulk_create`` in one transaction.
+        """
+        try:
+            payload = request.data
+            if isinstance(payload, list):
+                payload = {'tasks': payload, 'mode': request.query_params.get('mode', 'atomic')}
+            envelope = TaskBulkCreateSerializer(data=payload)
+            envelope.is_valid(raise_exception=True)
+            items = envelope.validated_data['tasks']
+            mode = envelope.validated_data['mode']
+            
+            # One query resolves existence and ownership for every referenced project
+            project_ids = {PrefetchedProjectField.to_pk(item.get('project')) for item in items} - {None}
+            projects = Project.objects.select_related('owner').in_bulk(project_ids)
+            
+            results = []
+            valid = []
+            for index, item in enumerate(items):
+                serializer = TaskBulkItemSerializer(data=item, context={'projects': projects})
+                if not serializer.is_valid():
+                    results.append({
+                        'index': index,
+                        'success': False,
+                        'status': status.HTTP_400_BAD_REQUEST,
+                        'errors': serializer.errors
+                    })
+                elif serializer.validated_data['project'].owner_id != request.user.id:
+                    results.append({
+                        'index': index,
+                        'success': False,
+                        'status': status.HTTP_403_FORBIDDEN,
+                        'errors': 'You are not authorized to create tasks in this project'
+                    })
+                else:
+                    valid.append((index, serializer.validated_data))
+            
+            failed = len(results)
+            if failed and (mode == 'atomic' or not valid):
+                return Response(
+                    {
+                        'success': False,
+                        'message': 'Validation error',
+                        'errors': results
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            created = TaskService.bulk_create_tasks([data for _, data in valid])
+            created_data = TaskSerializer(created, many=True).data
+            for (index, _), task_data in zip(valid, created_data):
+                results.append({'index': index, 'success': True, 'data': task_data})
+            results.sort(key=lambda result: result['index'])
+            
+            return Response(
+                {
+                    'success': True,
+                    'message': f'{len(created)} tasks created' + (f', {failed} failed' if failed else ''),
+                    'data': results,
+                    'count': len(created)
+                },
+                status=status.HTTP_207_MULTI_STATUS if failed else status.HTTP_201_CREATED
+            )
+        except ValidationError as e:
+            return Response(
+                {
+                    'success': False,
+                    'message': 'Validation error',
+                    'errors': e.detail
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {
+                    'success': False,
+                    'message': 'Failed to create tasks',
+                    'errors': str(e)
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @conditional_response
     def retrieve(self, request, *args, **kwargs):
         """Retrieve a specific task."""
         try:
@@ -149,7 +248,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             instance = self.get_object()
             serializer = self.get_serializer(instance, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
-            serializer.save()
+            TaskService.update_task(instance, **serializer.validated_data)
             
             return Response(
                 {
@@ -182,7 +281,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         """Delete a task."""
         try:
             instance = self.get_object()
-            instance.delete()
+            TaskService.delete_task(instance)
             
             return Response(
                 {
@@ -227,8 +326,7 @@ class TaskViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            task.status = new_status
-            task.save()
+            TaskService.update_task_status(task, new_status)
             
             serializer = self.get_serializer(task)
             return Response(
@@ -249,19 +347,91 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
+    @action(detail=False, methods=['post'], url_path='bulk/transition')
+    def bulk_transition(self, request):
+        """
+        Move many tasks to a new status and/or priority with one UPDATE.
+
+        Tasks are selected by ``ids``, ``project`` and/or ``from_status`` and are
+        always scoped to projects owned by the authenticated user.
+        """
+        try:
+            serializer = TaskBulkTransitionSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            data = serializer.validated_data
+            
+            queryset = Task.objects.all()
+            if 'ids' in data:
+                queryset = queryset.filter(id__in=data['ids'])
+            if 'project' in data:
+                queryset = queryset.filter(project_id=data['project'])
+            if 'from_status' in data:
+                queryset = queryset.filter(status=data['from_status'])
+            
+            ids = TaskService.transition_tasks(
+                request.user, queryset, status=data.get('status'), priority=data.get('priority')
+            )
+            
+            return Response(
+                {
+                    'success': True,
+                    'message': f'{len(ids)} tasks updated',
+                    'data': {
+                        'ids': ids,
+                        'count': len(ids)
+                    }
+                },
+                status=status.HTTP_200_OK
+            )
+        except ValidationError as e:
+            return Response(
+                {
+                    'success': False,
+                    'message': 'Validation error',
+                    'errors': e.detail
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {
+                    'success': False,
+                    'message': 'Failed to update tasks',
+                    'errors': str(e)
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Stream every matching task as NDJSON (default) or CSV.
+
+        Honors the same ``project``/``status``/``priority`` filters and
+        ``fields``/``exclude`` fieldsets as ``list``; pick the format with
+        ``?format=ndjson|csv`` or the Accept header.
+        """
+        export_format = request.accepted_renderer.format
+        queryset = self.get_queryset().order_by('-priority_rank', '-created_at', '-id')
+        response = StreamingHttpResponse(
+            STREAMS[export_format](queryset, columns=export_columns(self.get_fieldset())),
+            content_type=f'{request.accepted_renderer.media_type}; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'attachment; filename="tasks.{export_format}"'
+        return response
+    
     @action(detail=False, methods=['get'])
     def overdue(self, request):
         """Get overdue tasks for the authenticated user."""
         try:
-            overdue_tasks = Task.objects.overdue().filter(project__owner=request.user)
-            serializer = self.get_serializer(overdue_tasks, many=True)
+            data = self.serialize_rows(TaskService.get_overdue_user_tasks(request.user))
             
             return Response(
                 {
                     'success': True,
                     'message': 'Overdue tasks retrieved successfully',
-                    'data': serializer.data,
-                    'count': overdue_tasks.count()
+                    'data': data,
+                    'count': len(data)
                 },
                 status=status.HTTP_200_OK
             )
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import AsyncClient, Client, TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+from project.models import Project
+from task.models import Task
+
+
+class AsyncReadViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='password')
+        other = User.objects.create_user(username='other', password='password')
+        yesterday = timezone.now().date() - timedelta(days=1)
+        for p in range(3):
+            project = Project.objects.create(title=f'Project {p}', owner=self.user)
+            for t in range(4):
+                Task.objects.create(
+                    title=f'Task {p}.{t}', project=project, priority=['low', 'medium', 'high'][t % 3],
+                    due_date=yesterday if t % 2 else None,
+                )
+        Task.objects.create(title='Foreign', project=Project.objects.create(title='Foreign', owner=other))
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def test_async_endpoints_match_sync_responses(self):
+        client = Client()
+        for path in ('/tasks/', '/tasks/?page_size=5&priority=high', '/tasks/overdue/',
+                     '/projects/?page_size=2', '/auth/profile/'):
+            sync_response = client.get(f'/api{path}', **self.headers)
+            async_response = client.get(f'/api/async{path}', **self.headers)
+            self.assertEqual(async_response.status_code, 200, path)
+            self.assertEqual(async_response['Content-Type'], sync_response['Content-Type'], path)
+            self.assertEqual(async_response.content, sync_response.content, path)
+
+    def test_cursor_pages_follow_through(self):
+        client = Client()
+        response = client.get('/api/async/tasks/?page_size=5', **self.headers).json()
+        seen = [task['id'] for task in response['data']]
+        while response['next']:
+            response = client.get(f'/api/async/tasks/?page_size=5&cursor={response["next"]}', **self.headers).json()
+            seen.extend(task['id'] for task in response['data'])
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(len(set(seen)), 12)
+
+        bad = client.get('/api/async/tasks/?cursor=garbage', **self.headers)
+        self.assertEqual(bad.status_code, 404)
+
+    def test_requires_valid_token(self):
+        client = Client()
+        response = client.get('/api/async/tasks/')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+
+        response = client.get('/api/async/tasks/', HTTP_AUTHORIZATION='Bearer not-a-token')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_runs_natively_under_async_client(self):
+        response = await AsyncClient().get(
+            '/api/async/tasks/?count=none', headers={'Authorization': self.headers['HTTP_AUTHORIZATION']}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']), 12)
+        self.assertIsNone(response.json()['count'])
@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from user import authentication
+
+
+@override_settings(TRACKLY_INSTRUMENTATION={'SERVER_TIMING': True})
+class CachedJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='password')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        authentication.reset_stats()
+
+    def user_queries(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        return response, [q['sql'] for q in queries.captured_queries if 'FROM "auth_user"' in q['sql']]
+
+    def test_second_request_skips_the_user_query(self):
+        response, queries = self.user_queries('/api/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('desc="miss"', response['Server-Timing'])
+
+        response, queries = self.user_queries('/api/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+        self.assertIn('desc="hit"', response['Server-Timing'])
+
+        stats = authentication.get_stats()
+        self.assertEqual((stats['requests'], stats['hits'], stats['misses']), (2, 1, 1))
+
+    @override_settings(TRACKLY_INSTRUMENTATION={'SERVER_TIMING': False})
+    def test_timing_header_is_opt_in(self):
+        response, _ = self.user_queries('/api/projects/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(authentication.get_stats()['misses'], 1)
+
+    def test_caches_auth_fields_only(self):
+        self.client.get('/api/projects/')
+        entry = authentication.get_cache().get(authentication.user_cache_key(self.user.pk))
+        self.assertEqual(set(entry), {'id', 'is_active', 'password_digest'})
+        self.assertNotIn(self.user.password, entry.values())
+
+        # Profile fields deferred on a hit are loaded in one query
+        response, queries = self.user_queries('/api/auth/profile/')
+        self.assertIn('desc="hit"', response['Server-Timing'])
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.data['data']['username'], 'owner')
+
+    def test_profile_update_invalidates(self):
+        self.client.get('/api/auth/profile/')
+        self.client.patch('/api/auth/update_profile/', {'first_name': 'Ada'}, format='json')
+
+        response, queries = self.user_queries('/api/auth/profile/')
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.data['data']['first_name'], 'Ada')
+
+    def test_deactivation_and_password_change_invalidate(self):
+        self.client.get('/api/auth/profile/')
+        self.user.set_password('changed-password')
+        self.user.save()
+        _, queries = self.user_queries('/api/auth/profile/')
+        self.assertEqual(len(queries), 1)
+
+        self.user.is_active = False
+        self.user.save()
+        response, _ = self.user_queries('/api/auth/profile/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_async_endpoints_share_the_cache(self):
+        self.client.get('/api/projects/')
+        response, queries = self.user_queries('/api/async/tasks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+        self.assertIn('auth;dur=', response['Server-Timing'])
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from project.models import Project
+from task.models import Task
+
+
+class TaskBulkCreateTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password')
+        other = User.objects.create_user(username='other', password='password')
+        self.project = Project.objects.create(title='Owned', owner=self.owner)
+        self.unowned = Project.objects.create(title='Unowned', owner=other)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_creates_all_items_with_constant_queries(self):
+        tasks = [{'title': f'Task {i}', 'project': self.project.id, 'priority': 'high'} for i in range(50)]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/tasks/bulk/', {'tasks': tasks}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['count'], 50)
+        self.assertEqual(response.data['data'][0]['data']['project_owner'], 'owner')
+        self.assertEqual(Task.objects.filter(project=self.project, priority_rank=3).count(), 50)
+        statements = [q['sql'].split()[0] for q in queries.captured_queries]
+        # one project lookup and multi-row INSERTs of the tasks and their outbox events, besides savepoints
+        self.assertEqual(statements.count('SELECT'), 1)
+        self.assertEqual(statements.count('INSERT'), 2)
+
+    def test_atomic_mode_rejects_whole_batch(self):
+        response = self.client.post('/api/tasks/bulk/', [
+            {'title': 'Valid', 'project': self.project.id},
+            {'title': 'Forbidden', 'project': self.unowned.id},
+            {'title': 'Missing', 'project': 999999},
+        ], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertEqual(response.data['errors'][0]['status'], status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Task.objects.exists())
+
+    def test_best_effort_mode_creates_valid_items(self):
+        response = self.client.post('/api/tasks/bulk/', {
+            'mode': 'best_effort',
+            'tasks': [
+                {'title': 'Valid', 'project': self.project.id},
+                {'title': 'Forbidden', 'project': self.unowned.id},
+            ],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([item['success'] for item in response.data['data']], [True, False])
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ['Valid'])
+
+    def test_rejects_project_ids_that_are_not_integers(self):
+        invalid = [1.5, float(self.project.id), True, '1.0', str(2 ** 63), 2 ** 63, 2 ** 70, -self.project.id, None]
+        response = self.client.post('/api/tasks/bulk/', {
+            'mode': 'best_effort',
+            'tasks': [{'title': 'Valid', 'project': str(self.project.id)}]
+            + [{'title': f'Invalid {i}', 'project': project} for i, project in enumerate(invalid)],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        results = response.data['data']
+        self.assertTrue(results[0]['success'])
+        self.assertEqual([result['index'] for result in results if not result['success']], list(range(1, 10)))
+        self.assertTrue(all(result['status'] == status.HTTP_400_BAD_REQUEST for result in results[1:]))
+        self.assertIn('project', results[1]['errors'])
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ['Valid'])
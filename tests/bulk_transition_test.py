@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from project import counters
+from project.models import Project
+from task.models import Task
+from task.services import TaskService
+
+
+class TaskBulkTransitionTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password')
+        other = User.objects.create_user(username='other', password='password')
+        self.project = Project.objects.create(title='Sprint', owner=self.owner)
+        self.foreign = Project.objects.create(title='Foreign', owner=other)
+        self.tasks = [Task.objects.create(title=f'Task {i}', project=self.project) for i in range(3)]
+        self.foreign_task = Task.objects.create(title='Foreign task', project=self.foreign)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_transition_is_one_owner_scoped_update(self):
+        ids = [task.id for task in self.tasks] + [self.foreign_task.id]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/tasks/bulk/transition/', {
+                'ids': ids,
+                'status': 'completed',
+                'priority': 'high',
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(response.data['data']['ids']), sorted(task.id for task in self.tasks))
+        self.assertEqual(response.data['data']['count'], 3)
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len([sql for sql in updates if sql.startswith('UPDATE "task_task"')]), 1)
+        # plus one counters UPDATE for the single touched project
+        self.assertEqual(len(updates), 2)
+
+        self.assertEqual(Task.objects.filter(status='completed', priority_rank=3).count(), 3)
+        self.foreign_task.refresh_from_db()
+        self.assertEqual(self.foreign_task.status, 'todo')
+
+    def test_transition_bumps_updated_at(self):
+        before = self.tasks[0].updated_at
+
+        self.client.post('/api/tasks/bulk/transition/', {
+            'project': self.project.id,
+            'from_status': 'todo',
+            'status': 'in_progress',
+        }, format='json')
+
+        self.tasks[0].refresh_from_db()
+        self.assertEqual(self.tasks[0].status, 'in_progress')
+        self.assertGreater(self.tasks[0].updated_at, before)
+
+    def test_selection_is_required(self):
+        response = self.client.post('/api/tasks/bulk/transition/', {'status': 'completed'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.filter(status='completed').exists())
+
+    def test_rows_matching_after_the_lock_are_left_alone(self):
+        counters.recompute()
+        late = []
+
+        def concurrent_insert(queryset, status=None):
+            # Another transaction adds a matching task after the ids were locked
+            late.append(TaskService.create_task(title='Late', project=self.project))
+            return real_deltas(queryset, status=status)
+
+        real_deltas = counters.transition_deltas
+        with mock.patch.object(counters, 'transition_deltas', side_effect=concurrent_insert):
+            ids = TaskService.transition_tasks(self.owner, Task.objects.filter(project=self.project), status='completed')
+
+        self.assertEqual(sorted(ids), sorted(task.id for task in self.tasks))
+        late[0].refresh_from_db()
+        self.assertEqual(late[0].status, 'todo')
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.todo_count, self.project.completed_count), (1, 3))
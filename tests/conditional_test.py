@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from project.models import Project
+from task.models import Task
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password')
+        self.project = Project.objects.create(title='Project', owner=self.owner)
+        self.tasks = [Task.objects.create(title=f'Task {i}', project=self.project) for i in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_matching_etag_returns_304_without_queries(self):
+        first = self.client.get('/api/tasks/')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', first)
+
+        # validators are memoized until the owner's next write
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(second.content, b'')
+
+    @override_settings(TRACKLY_RESPONSE_CACHE={'ENABLED': False})
+    def test_unmemoized_validator_costs_one_aggregate(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_delete_changes_the_validator(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+
+        self.client.delete(f'/api/tasks/{self.tasks[1].id}/')
+
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']), 2)
+
+    def test_retrieve_honours_if_modified_since(self):
+        url = f'/api/projects/{self.project.id}/'
+        first = self.client.get(url)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_filters_are_part_of_the_etag(self):
+        unfiltered = self.client.get('/api/tasks/')['ETag']
+        filtered = self.client.get('/api/tasks/', {'status': 'todo'})['ETag']
+        self.assertNotEqual(unfiltered, filtered)
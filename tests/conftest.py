@@ -0,0 +1,13 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Keep cached responses and versions from leaking between tests that reuse user ids."""
+    for cache in caches.all():
+        cache.clear()
+    # The token blacklist filter tracks row ids, which rolled-back tests reuse
+    from user.tokens import blacklist_filter
+    blacklist_filter.reset()
+    yield
@@ -0,0 +1,114 @@
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from project.models import Project
+from task.models import Task
+from Trackly import db_router
+
+REPLICA = 'replica_test'
+
+
+class ReplicaRoutingTest(TestCase):
+    """Reads against a second SQLite file standing in for a replica."""
+    databases = {DEFAULT_DB_ALIAS, REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        handle, cls.replica_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        connections.settings[REPLICA] = {**connections[DEFAULT_DB_ALIAS].settings_dict, 'NAME': cls.replica_path}
+        call_command('migrate', database=REPLICA, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        os.remove(cls.replica_path)
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='password')
+        Task.objects.create(title='from primary', project=Project.objects.create(title='Primary', owner=self.user))
+
+        User.objects.using(REPLICA).create(id=self.user.id, username='owner')
+        project = Project.objects.using(REPLICA).create(title='Replica', owner_id=self.user.id)
+        Task.objects.using(REPLICA).create(title='from replica', project_id=project.id)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def task_titles(self):
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, 200)
+        return [task['title'] for task in response.json()['data']]
+
+    def test_reads_use_the_primary_without_replicas(self):
+        self.assertEqual(self.task_titles(), ['from primary'])
+
+    @override_settings(TRACKLY_READ_REPLICAS={'ALIASES': [REPLICA]})
+    def test_safe_requests_read_from_the_replica(self):
+        self.assertEqual(self.task_titles(), ['from replica'])
+        response = self.client.get('/api/projects/')
+        self.assertEqual([project['title'] for project in response.json()['data']], ['Replica'])
+
+    @override_settings(TRACKLY_READ_REPLICAS={'ALIASES': [REPLICA]})
+    def test_writes_go_to_the_primary_and_pin_the_writer(self):
+        response = self.client.post('/api/projects/', {'title': 'Created'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Project.objects.filter(title='Created').exists())
+        self.assertFalse(Project.objects.using(REPLICA).filter(title='Created').exists())
+
+        # The writer reads their own write from the primary until the pin expires
+        self.assertEqual(self.task_titles(), ['from primary'])
+        # Drop the pin, and the list response cached while it was active
+        for cache in caches.all():
+            cache.clear()
+        self.assertEqual(self.task_titles(), ['from replica'])
+
+    @override_settings(TRACKLY_READ_REPLICAS={'ALIASES': [REPLICA]})
+    def test_replica_reads_are_not_cached(self):
+        self.assertEqual(self.task_titles(), ['from replica'])
+        etag = self.client.get('/api/tasks/')['ETag']
+
+        # Once the user is pinned to the primary, nothing read from the replica is reused
+        db_router.pin_to_primary(self.user)
+        self.assertEqual(self.task_titles(), ['from primary'])
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(TRACKLY_READ_REPLICAS={'ALIASES': [REPLICA]})
+    def test_async_reads_use_the_replica(self):
+        response = Client().get('/api/async/tasks/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.assertEqual([task['title'] for task in response.json()['data']], ['from replica'])
+
+
+class ReplicaRouterTest(TestCase):
+    @override_settings(TRACKLY_READ_REPLICAS={'ALIASES': ['replica_1', 'replica_2']})
+    def test_round_robin_and_model_scope(self):
+        user = User(id=1)
+        chosen = {db_router.choose_replica(user) for _ in range(4)}
+        self.assertEqual(chosen, {'replica_1', 'replica_2'})
+
+        router = db_router.ReplicaRouter()
+        token = db_router.activate('replica_2')
+        try:
+            self.assertEqual(router.db_for_read(Task), 'replica_2')
+            self.assertIsNone(router.db_for_read(ContentType))
+            self.assertEqual(router.db_for_write(Task), DEFAULT_DB_ALIAS)
+        finally:
+            db_router.deactivate(token)
+        self.assertIsNone(router.db_for_read(Task))
+        self.assertFalse(router.allow_migrate('replica_1', 'task'))
+
+        db_router.pin_to_primary(user)
+        self.assertIsNone(db_router.choose_replica(user))
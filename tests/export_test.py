@@ -0,0 +1,40 @@
+import csv
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from project.models import Project
+from task.models import Task
+
+
+class TaskExportTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password')
+        other = User.objects.create_user(username='other', password='password')
+        self.project = Project.objects.create(title='Project', owner=self.owner)
+        Task.objects.create(title='Done', project=self.project, status='completed', due_date='2024-01-02')
+        Task.objects.create(title='Open', project=self.project, description='Ünïcode, "quoted"')
+        Task.objects.create(title='Foreign', project=Project.objects.create(title='Other', owner=other))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_ndjson_rows_match_task_serializer(self):
+        response = self.client.get('/api/tasks/export/', {'format': 'ndjson'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        listed = self.client.get('/api/tasks/').data['data']
+        self.assertEqual(rows, json.loads(json.dumps(listed)))
+
+    def test_csv_honours_filters(self):
+        response = self.client.get('/api/tasks/export/', {'format': 'csv', 'status': 'todo'})
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['title'] for row in rows], ['Open'])
+        self.assertEqual(rows[0]['description'], 'Ünïcode, "quoted"')
+        self.assertEqual(rows[0]['due_date'], '')
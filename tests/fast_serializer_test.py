@@ -0,0 +1,52 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from project.models import Project
+from project.serializers import ProjectSerializer
+from task.models import Task
+from task.serializers import TaskSerializer
+from Trackly.fast_serializers import ValuesSerializer
+
+
+class ValuesSerializerTest(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(username='öwner', password='password')
+        self.project = Project.objects.create(title='Sprint “one”', owner=owner, due_date=date(2026, 1, 31))
+        Task.objects.create(title='No due date', project=self.project, description='línea\n"quoted"')
+        Task.objects.create(title='Due', project=self.project, due_date=date(2026, 2, 1), priority='high')
+        Task.objects.create(title='Done', project=self.project, status='completed', priority='low')
+
+    def assertSameJSON(self, serializer_class, queryset):
+        fast = ValuesSerializer.for_serializer(serializer_class)
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        actual = JSONRenderer().render(fast.to_representation(fast.get_queryset(queryset)))
+        self.assertEqual(actual, expected)
+
+    def test_task_output_is_byte_identical(self):
+        self.assertSameJSON(TaskSerializer, Task.objects.select_related('project__owner').order_by('id'))
+
+    def test_project_output_is_byte_identical(self):
+        self.assertSameJSON(ProjectSerializer, Project.objects.order_by('id'))
+
+    def test_datetimes_follow_the_current_timezone(self):
+        with timezone.override('Asia/Dhaka'):
+            self.assertSameJSON(TaskSerializer, Task.objects.select_related('project__owner').order_by('id'))
+
+    def test_unsupported_fields_are_rejected(self):
+        class WithMethodField(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Task
+                fields = ('id', 'label')
+
+            def get_label(self, task):
+                return task.title.upper()
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer.for_serializer(WithMethodField)
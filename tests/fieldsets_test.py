@@ -0,0 +1,107 @@
+import json
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from project.models import Project
+from task.models import Task
+
+
+class SparseFieldsetTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='password')
+        self.project = Project.objects.create(title='Website', owner=self.user)
+        for i in range(3):
+            Task.objects.create(
+                title=f'Task {i}', description='Long description ' * 20, project=self.project,
+                priority=['low', 'medium', 'high'][i], due_date='2024-01-0%d' % (i + 1),
+            )
+        self.task = Task.objects.filter(project=self.project).first()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, path, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, params)
+        return response, ' '.join(query['sql'] for query in queries.captured_queries)
+
+    def test_fields_narrow_output_and_columns(self):
+        response, sql = self.get('/api/tasks/', fields='status,id,title,due_date')
+
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()['data']
+        self.assertEqual(len(rows), 3)
+        # Serializer order, not request order
+        self.assertEqual([list(row) for row in rows], [['id', 'title', 'status', 'due_date']] * 3)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"auth_user"."username"', sql)
+
+    def test_exclude(self):
+        response, sql = self.get('/api/tasks/', exclude='description,project_owner')
+
+        row = response.json()['data'][0]
+        self.assertNotIn('description', row)
+        self.assertNotIn('project_owner', row)
+        self.assertEqual(row['project_name'], 'Website')
+        self.assertNotIn('"task_task"."description"', sql)
+
+    def test_retrieve_and_project_list(self):
+        response, sql = self.get(f'/api/tasks/{self.task.id}/', fields='id,project_owner')
+        self.assertEqual(response.json()['data'], {'id': self.task.id, 'project_owner': 'owner'})
+        self.assertNotIn('"task_task"."description"', sql)
+
+        response, _ = self.get('/api/projects/', fields='id,title')
+        self.assertEqual(response.json()['data'], [{'id': self.project.id, 'title': 'Website'}])
+
+    def test_cursor_pages_follow_through(self):
+        params = {'fields': 'title', 'page_size': 2}
+        response = self.client.get('/api/tasks/', params).json()
+        titles = [row['title'] for row in response['data']]
+        while response['next']:
+            response = self.client.get('/api/tasks/', {**params, 'cursor': response['next']}).json()
+            titles += [row['title'] for row in response['data']]
+        self.assertEqual(sorted(titles), ['Task 0', 'Task 1', 'Task 2'])
+
+    def test_unknown_or_empty_fieldset_is_rejected(self):
+        response = self.client.get('/api/tasks/', {'fields': 'id,titel'})
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertFalse(body['success'])
+        self.assertIn('titel', body['errors']['fields'][0])
+
+        response = self.client.get(f'/api/tasks/{self.task.id}/', {'fields': 'id', 'exclude': 'id'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('exclude', response.json()['errors'])
+
+    def test_writes_and_other_actions_ignore_fieldsets(self):
+        response = self.client.patch(
+            f'/api/tasks/{self.task.id}/?fields=id', {'title': 'Renamed'}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['title'], 'Renamed')
+        self.assertIn('description', response.json()['data'])
+
+        response = self.client.get(f'/api/projects/{self.project.id}/progress/', {'fields': 'id'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('percent_complete', response.json()['data'])
+
+    def test_export_columns(self):
+        response = self.client.get('/api/tasks/export/', {'format': 'ndjson', 'fields': 'id,title'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([list(row) for row in rows], [['id', 'title']] * 3)
+
+    def test_async_list(self):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        client = Client()
+        path = '/tasks/?fields=id,title,status,due_date&page_size=2'
+        sync_response = client.get(f'/api{path}', **headers)
+        async_response = client.get(f'/api/async{path}', **headers)
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(async_response.content, sync_response.content)
+
+        response = client.get('/api/async/tasks/?fields=nope', **headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('nope', response.json()['errors']['fields'][0])
@@ -0,0 +1,95 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from project.models import Project
+from task.models import Task
+from Trackly import instrumentation
+
+
+class InstrumentationMiddlewareTest(TestCase):
+    def setUp(self):
+        instrumentation.reset_stats()
+        # The test connection opened before any handler loaded the middleware
+        instrumentation.install_query_wrapper(connection=connection)
+        self.user = User.objects.create_user(username='owner', password='password')
+        project = Project.objects.create(title='Project', owner=self.user)
+        for i in range(3):
+            Task.objects.create(title=f'Task {i}', project=project)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_counted(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_records_histograms_per_endpoint(self):
+        _, first = self.get_counted('/api/tasks/')
+        _, second = self.get_counted('/api/tasks/')
+
+        stats = instrumentation.get_stats()['GET task-list']
+        self.assertEqual(stats['queries']['count'], 2)
+        self.assertEqual(stats['queries']['sum'], first + second)
+        for name in instrumentation.TIMINGS:
+            self.assertEqual(stats[name]['count'], 2)
+        self.assertGreater(stats['render']['sum'], 0)
+        self.assertGreaterEqual(stats['total']['sum'], stats['view']['sum'] + stats['render']['sum'])
+        self.assertGreaterEqual(stats['view']['sum'], stats['db']['sum'])
+
+    def test_server_timing_is_opt_in(self):
+        response, _ = self.get_counted('/api/tasks/')
+        self.assertNotIn('Server-Timing', response)
+
+        with override_settings(TRACKLY_INSTRUMENTATION={'SERVER_TIMING': True}):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get('/api/tasks/')
+        timing = response['Server-Timing']
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        for name in instrumentation.TIMINGS:
+            self.assertIn(f'{name};dur=', timing)
+
+    def test_keeps_auth_timing_entry(self):
+        with override_settings(TRACKLY_INSTRUMENTATION={'SERVER_TIMING': True}):
+            response = APIClient().get(
+                '/api/auth/profile/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}',
+            )
+        self.assertIn('auth;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+    def test_disabled_removes_middleware(self):
+        with override_settings(TRACKLY_INSTRUMENTATION={'ENABLED': False, 'SERVER_TIMING': True}):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            response = client.get('/api/tasks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(instrumentation.get_stats(), {})
+
+    async def test_counts_async_view_queries(self):
+        response = await AsyncClient().get(
+            '/api/async/tasks/', headers={'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        stats = instrumentation.get_stats()['GET async-task-list']
+        self.assertEqual(stats['queries']['count'], 1)
+        self.assertGreater(stats['queries']['sum'], 0)
+        self.assertGreater(stats['db']['sum'], 0)
+
+
+class HistogramTest(TestCase):
+    def test_percentiles_are_bucket_bounds(self):
+        histogram = instrumentation.Histogram((1, 5, 10))
+        for value in (0.5, 0.7, 3, 4, 4.5, 6, 7, 8, 9, 50):
+            histogram.observe(value)
+        stats = histogram.as_dict()
+        self.assertEqual(stats['buckets'], [(1, 2), (5, 5), (10, 9)])
+        self.assertEqual((stats['p50'], stats['p95'], stats['p99']), (5, None, None))
+        self.assertEqual(histogram.percentile(0.9), 10)
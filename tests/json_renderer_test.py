@@ -0,0 +1,90 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from project.models import Project
+from task.models import Task
+from task.serializers import TaskSerializer
+from Trackly.parsers import FastJSONParser
+from Trackly.renderers import FastJSONRenderer
+
+
+PAYLOAD = {
+    'utc': datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=dt_timezone.utc),
+    'offset': datetime(2026, 3, 1, 18, 30, tzinfo=dt_timezone(timedelta(hours=6))),
+    'naive': datetime(2026, 3, 1, 12, 30),
+    'date': date(2026, 3, 1),
+    'time': time(9, 15, 0, 500),
+    'duration': timedelta(hours=1, seconds=3),
+    'decimal': Decimal('12.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'lazy': gettext_lazy('Tasks'),
+    'text': 'ünïcode "quotes" \\ / \n\t\x01 line separator ',
+    'nested': [{'none': None, 'bool': True, 'int': -7, 'float': 0.25}, (1, 2)],
+}
+
+
+class FastJSONRendererTest(TestCase):
+    def assertSameRendering(self, data, media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type),
+        )
+
+    def test_matches_drf_for_model_types(self):
+        self.assertSameRendering(PAYLOAD)
+
+    def test_matches_drf_for_serializer_payloads(self):
+        owner = User.objects.create_user(username='owner', password='password')
+        project = Project.objects.create(title='Sprint', owner=owner)
+        Task.objects.create(title='Task', project=project, due_date=date(2026, 4, 1))
+        Task.objects.create(title='Other', project=project)
+        self.assertSameRendering(TaskSerializer(Task.objects.all(), many=True).data)
+
+    def test_falls_back_for_what_orjson_rejects(self):
+        self.assertSameRendering({1: 'int key', 'big': 2 ** 70})
+        self.assertSameRendering(PAYLOAD, 'application/json; indent=4')
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_works_without_orjson(self):
+        with mock.patch('Trackly.renderers.orjson', None), mock.patch('Trackly.parsers.orjson', None):
+            self.assertSameRendering(PAYLOAD)
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(b'{"a": [1, 2]}')), {'a': [1, 2]})
+
+    def test_api_responses_use_it(self):
+        user = User.objects.create_user(username='owner', password='password')
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get('/api/projects/')
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+
+
+class FastJSONParserTest(TestCase):
+    def test_parses_like_drf(self):
+        body = '{"title": "Tâche", "ids": [1, 2, 3], "n": 1.5, "big": 123456789012345678901234567890}'.encode()
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+    def test_errors_match_drf(self):
+        for body in (b'{"title": ', b'{"n": NaN}', b''):
+            with self.assertRaises(ParseError) as fast:
+                FastJSONParser().parse(io.BytesIO(body))
+            with self.assertRaises(ParseError) as drf:
+                JSONParser().parse(io.BytesIO(body))
+            self.assertEqual(str(fast.exception), str(drf.exception))
+
+    def test_requests_are_parsed(self):
+        user = User.objects.create_user(username='owner', password='password')
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post('/api/projects/', {'title': 'Parsed'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Project.objects.filter(title='Parsed', owner=user).exists())
@@ -0,0 +1,149 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from project.models import Project
+from task.models import Task
+from Trackly import instrumentation, metrics
+
+
+def samples(text):
+    """``{'name{labels}': value}`` for the sample lines of an exposition."""
+    result = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            series, value = line.rsplit(' ', 1)
+            result[series] = float(value)
+    return result
+
+
+def count_in_child(directory):
+    with override_settings(TRACKLY_METRICS={'DIRECTORY': directory}):
+        metrics.count_cache('response', True)
+        metrics.count_cache('response', False)
+
+
+class MetricsEndpointTest(TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.user = User.objects.create_user(username='owner', password='password')
+        project = Project.objects.create(title='Project', owner=self.user)
+        self.task = Task.objects.create(title='Task', project=project)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def tearDown(self):
+        metrics.reset()
+
+    def scrape(self, **headers):
+        response = Client().get('/metrics', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        return response.content.decode()
+
+    def test_reports_requests_latency_queries_and_caches(self):
+        self.client.get('/api/tasks/')
+        self.client.get('/api/tasks/')
+        self.client.patch(f'/api/tasks/{self.task.id}/update_status/', {'status': 'completed'}, format='json')
+        self.client.get('/api/tasks/999999/')
+
+        text = self.scrape()
+        values = samples(text)
+        list_labels = 'method="GET",route="task-list"'
+        self.assertEqual(values[f'trackly_http_requests_total{{{list_labels},status="200"}}'], 2)
+        self.assertEqual(
+            values['trackly_http_requests_total{method="PATCH",route="task-update-status",status="200"}'], 1,
+        )
+        self.assertEqual(values['trackly_http_request_errors_total{method="GET",route="task-detail",class="4xx"}'], 1)
+        self.assertEqual(values[f'trackly_http_request_duration_seconds_count{{{list_labels}}}'], 2)
+        self.assertEqual(values[f'trackly_http_request_duration_seconds_bucket{{{list_labels},le="+Inf"}}'], 2)
+        self.assertIn(f'trackly_http_request_duration_seconds_bucket{{{list_labels},le="0.001"}}', values)
+        self.assertGreater(values[f'trackly_db_queries_total{{{list_labels}}}'], 0)
+
+        # The second list request is a response cache hit; all four authenticate
+        self.assertEqual(values['trackly_cache_requests_total{cache="response",result="hit"}'], 1)
+        self.assertEqual(values['trackly_cache_hit_ratio{cache="response"}'], 0.5)
+        self.assertEqual(values['trackly_cache_requests_total{cache="auth",result="miss"}'], 1)
+        self.assertEqual(values['trackly_cache_hit_ratio{cache="auth"}'], 0.75)
+
+        self.assertIn('# TYPE trackly_http_request_duration_seconds histogram', text)
+        self.assertIn('# TYPE trackly_cache_hit_ratio gauge', text)
+
+    def test_buckets_are_cumulative(self):
+        for _ in range(3):
+            self.client.get('/api/auth/profile/')
+        values = samples(self.scrape())
+        buckets = [
+            value for series, value in values.items()
+            if series.startswith('trackly_http_request_duration_seconds_bucket{method="GET",route="user-profile"')
+        ]
+        self.assertEqual(len(buckets), len(instrumentation.duration_bounds()) + 1)
+        self.assertEqual(buckets, sorted(buckets))
+        self.assertEqual(buckets[-1], 3)
+
+    @override_settings(TRACKLY_METRICS={'TOKEN': 'scrape-secret'})
+    def test_token_protects_endpoint(self):
+        self.assertEqual(Client().get('/metrics').status_code, 403)
+        self.assertEqual(Client().get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code, 403)
+        self.scrape(Authorization='Bearer scrape-secret')
+
+    @override_settings(TRACKLY_METRICS={'ENABLED': False})
+    def test_disabled(self):
+        self.assertEqual(Client().get('/metrics').status_code, 404)
+
+
+class FileStoreTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(metrics.reset)
+
+    def test_sums_worker_files(self):
+        first = metrics.FileStore(os.path.join(self.directory, 'trackly-1.db'))
+        second = metrics.FileStore(os.path.join(self.directory, 'trackly-2.db'))
+        first.inc('a', 2)
+        first.inc('b')
+        second.inc('a', 0.5)
+        first.close()
+        second.close()
+        with override_settings(TRACKLY_METRICS={'DIRECTORY': self.directory}):
+            self.assertEqual(dict(metrics.collect()), {'a': 2.5, 'b': 1.0})
+
+    def test_reopens_and_grows(self):
+        path = os.path.join(self.directory, 'trackly-1.db')
+        store = metrics.FileStore(path)
+        keys = [f'series-{i}-{"x" * (i % 13)}' for i in range(5000)]
+        for key in keys:
+            store.inc(key, 1.5)
+        store.inc(keys[0])
+        store.close()
+
+        self.assertGreater(os.path.getsize(path), metrics.FileStore.initial_size)
+        reopened = metrics.FileStore(path)
+        reopened.inc(keys[0])
+        values = dict(metrics.FileStore.read(path))
+        self.assertEqual(len(values), len(keys))
+        self.assertEqual(values[keys[0]], 3.5)
+        self.assertEqual(values[keys[-1]], 1.5)
+        reopened.close()
+
+    def test_aggregates_forked_workers(self):
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=count_in_child, args=(self.directory,)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+
+        with override_settings(TRACKLY_METRICS={'DIRECTORY': self.directory}):
+            values = samples(metrics.render(metrics.collect()))
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+        self.assertEqual(values['trackly_cache_requests_total{cache="response",result="hit"}'], 3)
+        self.assertEqual(values['trackly_cache_hit_ratio{cache="response"}'], 0.5)
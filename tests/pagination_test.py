@@ -0,0 +1,53 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+from project.models import Project
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password')
+        self.projects = [
+            Project.objects.create(title=f'Project {i}', owner=self.owner) for i in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_cursor_walks_every_row_once(self):
+        seen = []
+        cursor = None
+        while True:
+            params = {'page_size': 2}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get('/api/projects/', params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['count'], 5)
+            seen.extend(item['id'] for item in response.data['data'])
+            cursor = response.data['next']
+            if not cursor:
+                break
+
+        expected = [p.id for p in sorted(self.projects, key=lambda p: (p.created_at, p.id), reverse=True)]
+        self.assertEqual(seen, expected)
+
+    def test_previous_cursor_returns_preceding_page(self):
+        first = self.client.get('/api/projects/', {'page_size': 2})
+        second = self.client.get('/api/projects/', {'page_size': 2, 'cursor': first.data['next']})
+        back = self.client.get('/api/projects/', {'page_size': 2, 'cursor': second.data['previous']})
+
+        self.assertIsNone(first.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in back.data['data']],
+            [item['id'] for item in first.data['data']]
+        )
+
+    def test_count_can_be_disabled(self):
+        response = self.client.get('/api/projects/', {'count': 'none'})
+        self.assertIsNone(response.data['count'])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/tasks/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.data['success'])
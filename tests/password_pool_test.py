@@ -0,0 +1,77 @@
+from unittest import mock
+
+from django.contrib.auth import hashers
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from user import hashing
+
+
+class PasswordPoolTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='correct-horse')
+        self.client = APIClient()
+
+    def login(self, password):
+        return self.client.post('/api/auth/login/', {'username': 'owner', 'password': password}, format='json')
+
+    def test_hashes_match_the_inline_hasher(self):
+        encoded = hashing.make_password('secret-value')
+        self.assertTrue(hashers.check_password('secret-value', encoded))
+        self.assertTrue(hashing.check_password('secret-value', encoded))
+        self.assertFalse(hashing.check_password('wrong', encoded))
+
+    def test_login_verifies_on_the_pool(self):
+        self.assertEqual(self.login('correct-horse').status_code, 200)
+        self.assertEqual(self.login('wrong-password').status_code, 401)
+
+    def test_register_stores_a_usable_hash(self):
+        response = self.client.post('/api/auth/register/', {
+            'username': 'new-user',
+            'email': 'New@EXAMPLE.com',
+            'password': 'long-enough-1',
+            'password_confirm': 'long-enough-1',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(username='new-user')
+        self.assertEqual(user.email, 'New@example.com')
+        self.assertTrue(user.check_password('long-enough-1'))
+
+    def test_register_hashes_outside_the_transaction(self):
+        # Under IMMEDIATE transactions a slow hash would hold the SQLite write lock
+        depth = len(connection.atomic_blocks)
+        hashed_at = []
+        make_password = hashing.make_password
+
+        def record_depth(*args, **kwargs):
+            hashed_at.append(len(connection.atomic_blocks))
+            return make_password(*args, **kwargs)
+
+        with mock.patch.object(hashing, 'make_password', side_effect=record_depth):
+            response = self.client.post('/api/auth/register/', {
+                'username': 'new-user', 'password': 'long-enough-1', 'password_confirm': 'long-enough-1',
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(hashed_at, [depth])
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        # Workers run with the project settings, so use a weaker PBKDF2 hash
+        # rather than overriding PASSWORD_HASHERS in this process only
+        outdated = hashers.PBKDF2PasswordHasher().encode('correct-horse', hashers.get_hasher().salt(), iterations=1000)
+        User.objects.filter(pk=self.user.pk).update(password=outdated)
+        self.assertEqual(self.login('correct-horse').status_code, 200)
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.password, outdated)
+        self.assertTrue(self.user.check_password('correct-horse'))
+
+    @override_settings(TRACKLY_PASSWORD_POOL={'MAX_PENDING': 0, 'RETRY_AFTER': 2})
+    def test_saturated_pool_returns_503_with_retry_after(self):
+        response = self.login('correct-horse')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '2')
+        self.assertFalse(response.json()['success'])
+
+    @override_settings(TRACKLY_PASSWORD_POOL={'ENABLED': False})
+    def test_disabled_pool_hashes_inline(self):
+        self.assertEqual(self.login('correct-horse').status_code, 200)
@@ -0,0 +1,35 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework import status
+from project.models import Project
+from task.models import Task
+
+
+class PriorityRankTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password')
+        self.project = Project.objects.create(title='Project', owner=self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_list_orders_by_priority_rank(self):
+        for priority in ['medium', 'low', 'high']:
+            Task.objects.create(title=priority, project=self.project, priority=priority)
+
+        response = self.client.get('/api/tasks/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['priority'] for item in response.data['data']], ['high', 'medium', 'low'])
+        self.assertNotIn('priority_rank', response.data['data'][0])
+
+    def test_rank_follows_priority_updates(self):
+        task = Task.objects.create(title='Task', project=self.project, priority='low')
+        self.assertEqual(task.priority_rank, 1)
+
+        response = self.client.patch(f'/api/tasks/{task.id}/', {'priority': 'high'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['priority'], 'high')
+        task.refresh_from_db()
+        self.assertEqual(task.priority_rank, 3)
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from project.models import Project
+from project.services import ProjectService
+from task.models import Task
+from task.services import TaskService
+
+
+class ProjectCountersTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password')
+        self.project = Project.objects.create(title='Sprint', owner=self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self.yesterday = (timezone.now().date() - timedelta(days=1)).isoformat()
+
+    def counters(self):
+        self.project.refresh_from_db()
+        return (self.project.todo_count, self.project.in_progress_count,
+                self.project.completed_count, self.project.overdue_count)
+
+    def test_write_paths_keep_counters_in_sync(self):
+        response = self.client.post('/api/tasks/', {
+            'title': 'Late', 'project': self.project.id, 'due_date': self.yesterday,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        late_id = response.data['data']['id']
+        self.client.post('/api/tasks/bulk/', {'tasks': [
+            {'title': 'A', 'project': self.project.id},
+            {'title': 'B', 'project': self.project.id, 'status': 'in_progress'},
+        ]}, format='json')
+        self.assertEqual(self.counters(), (2, 1, 0, 1))
+
+        self.client.patch(f'/api/tasks/{late_id}/update_status/', {'status': 'completed'}, format='json')
+        self.assertEqual(self.counters(), (1, 1, 1, 0))
+
+        self.client.patch(f'/api/tasks/{late_id}/', {'status': 'in_progress'}, format='json')
+        self.assertEqual(self.counters(), (1, 2, 0, 1))
+
+        self.client.post('/api/tasks/bulk/transition/', {
+            'project': self.project.id, 'status': 'completed',
+        }, format='json')
+        self.assertEqual(self.counters(), (0, 0, 3, 0))
+
+        self.client.delete(f'/api/tasks/{late_id}/')
+        self.assertEqual(self.counters(), (0, 0, 2, 0))
+
+    def test_project_update_keeps_concurrent_counter_changes(self):
+        loaded = Project.objects.get(pk=self.project.pk)
+        # A task write commits between loading and saving the project
+        TaskService.create_task(title='Open', project=self.project)
+
+        ProjectService.update_project(loaded, title='Renamed')
+
+        self.assertEqual(self.counters(), (1, 0, 0, 0))
+        self.assertEqual(self.project.title, 'Renamed')
+
+    def test_progress_endpoint(self):
+        Task.objects.create(title='Done', project=self.project, status='completed')
+        Task.objects.create(title='Open', project=self.project)
+        call_command('recompute_project_counters', stdout=StringIO())
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/projects/{self.project.id}/progress/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['total'], 2)
+        self.assertEqual(response.data['data']['percent_complete'], 50.0)
+
+    def test_recompute_command_repairs_drift(self):
+        Task.objects.create(title='Open', project=self.project, due_date=self.yesterday)
+        # direct writes bypass TaskService, like a task passing its due date
+        Project.objects.filter(pk=self.project.pk).update(todo_count=7, overdue_count=0)
+
+        call_command('recompute_project_counters', stdout=StringIO())
+
+        self.assertEqual(self.counters(), (1, 0, 0, 1))
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from project.models import Project
+from task.models import Task
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+    Assert that an endpoint runs a fixed number of queries.
+
+    Every request is replayed for a user with a single task and for a user
+    with many tasks spread over several projects; both must hit the budget
+    exactly, so an N+1 on any row shows up as a failure.
+    """
+    large_task_count = 25
+
+    def setUp(self):
+        self.small = self.create_account('small', projects=1, tasks_per_project=1)
+        self.large = self.create_account('large', projects=5, tasks_per_project=self.large_task_count // 5)
+
+    def create_account(self, username, projects, tasks_per_project):
+        user = User.objects.create_user(username=username, password='password')
+        yesterday = timezone.now().date() - timedelta(days=1)
+        for p in range(projects):
+            project = Project.objects.create(title=f'{username} project {p}', owner=user)
+            Task.objects.bulk_create([
+                Task(title=f'Task {t}', project=project, due_date=yesterday)
+                for t in range(tasks_per_project)
+            ])
+        return user
+
+    def assertQueryBudget(self, budget, method, url_for, data_for=None):
+        for user in (self.small, self.large):
+            client = APIClient()
+            client.force_authenticate(user=user)
+            url = url_for(user)
+            data = data_for(user) if data_for else None
+            with CaptureQueriesContext(connection) as queries:
+                response = getattr(client, method)(url, data, format='json')
+            self.assertLess(response.status_code, 300, response.data)
+            self.assertEqual(
+                len(queries), budget,
+                f'{method.upper()} {url} as {user.username} ran {len(queries)} queries, budget is {budget}:\n'
+                + '\n'.join(q['sql'] for q in queries.captured_queries)
+            )
+
+    def first_task(self, user):
+        return Task.objects.filter(project__owner=user).first()
+
+
+class TaskQueryBudgetTest(QueryBudgetTestCase):
+    def test_list(self):
+        # validator aggregate + page + count
+        self.assertQueryBudget(3, 'get', lambda user: '/api/tasks/')
+
+    def test_retrieve(self):
+        # validator aggregate + row
+        self.assertQueryBudget(2, 'get', lambda user: f'/api/tasks/{self.first_task(user).id}/')
+
+    def test_overdue(self):
+        # count() reuses the evaluated queryset
+        self.assertQueryBudget(1, 'get', lambda user: '/api/tasks/overdue/')
+
+    def test_update_status(self):
+        # load + UPDATE + project counters UPDATE + outbox INSERT
+        self.assertQueryBudget(
+            4, 'patch',
+            lambda user: f'/api/tasks/{self.first_task(user).id}/update_status/',
+            lambda user: {'status': 'completed'}
+        )
+
+    def test_create(self):
+        # SAVEPOINT, project+owner, INSERT, project counters UPDATE, outbox INSERT, RELEASE
+        self.assertQueryBudget(
+            6, 'post',
+            lambda user: '/api/tasks/',
+            lambda user: {'title': 'New', 'project': Project.objects.filter(owner=user).first().id}
+        )
+
+
+class ProjectQueryBudgetTest(QueryBudgetTestCase):
+    def test_list(self):
+        # validator aggregate + page + count
+        self.assertQueryBudget(3, 'get', lambda user: '/api/projects/')
@@ -0,0 +1,66 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from project.models import Project
+from task.models import Task
+from Trackly import response_cache
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password')
+        self.project = Project.objects.create(title='Project', owner=self.owner)
+        self.task = Task.objects.create(title='Task', project=self.project)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        response_cache.reset_stats()
+
+    def test_repeated_list_is_served_from_cache(self):
+        self.client.get('/api/tasks/', {'project': self.project.id})
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/tasks/', {'project': self.project.id})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'][0]['title'], 'Task')
+        self.assertEqual(response_cache.get_stats()['hits'], 1)
+        self.assertEqual(response_cache.get_stats()['misses'], 1)
+
+    def test_version_is_bumped_again_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.patch(f'/api/projects/{self.project.id}/', {'title': 'Renamed'}, format='json')
+        self.assertTrue(callbacks)
+
+        # A list read racing the write caches the pre-commit rows under the first bump
+        stale = response_cache.build_key(self.owner.pk, 'project-list', {})
+        response_cache.get_cache().set(stale, {'data': [{'title': 'Project'}]})
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(response_cache.build_key(self.owner.pk, 'project-list', {}), stale)
+        self.assertEqual(self.client.get('/api/projects/').data['data'][0]['title'], 'Renamed')
+
+    def test_writes_invalidate_the_owner_listings(self):
+        self.client.get('/api/projects/')
+        self.client.get('/api/tasks/')
+
+        self.client.patch(f'/api/projects/{self.project.id}/', {'title': 'Renamed'}, format='json')
+        self.client.post('/api/tasks/bulk/transition/', {'ids': [self.task.id], 'status': 'completed'}, format='json')
+
+        projects = self.client.get('/api/projects/')
+        tasks = self.client.get('/api/tasks/')
+        self.assertEqual(projects.data['data'][0]['title'], 'Renamed')
+        self.assertEqual(tasks.data['data'][0]['project_name'], 'Renamed')
+        self.assertEqual(tasks.data['data'][0]['status'], 'completed')
+        self.assertEqual(response_cache.get_stats()['hits'], 0)
+
+    def test_other_users_keep_their_cache(self):
+        other = User.objects.create_user(username='other', password='password')
+        client = APIClient()
+        client.force_authenticate(user=other)
+        client.get('/api/projects/')
+
+        Task.objects.create(title='Another', project=self.project)
+
+        with self.assertNumQueries(0):
+            client.get('/api/projects/')
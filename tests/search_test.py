@@ -0,0 +1,120 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from project.models import Project
+from task.models import Task
+from task.services import TaskService
+from Trackly import search
+
+
+class TaskSearchTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='password')
+        self.project = Project.objects.create(title='Website', owner=self.user)
+        self.title_hit = Task.objects.create(title='Fix login redirect', project=self.project)
+        self.description_hit = Task.objects.create(
+            title='Audit sessions', description='Check the login flow for stale sessions', project=self.project,
+        )
+        Task.objects.create(title='Write release notes', project=self.project)
+        other = User.objects.create_user(username='other', password='password')
+        Task.objects.create(title='Login for someone else', project=Project.objects.create(title='Other', owner=other))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search_ids(self, query, path='/api/tasks/'):
+        response = self.client.get(path, {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.json()['data']]
+
+    def test_results_are_ranked_and_scoped_to_the_owner(self):
+        self.assertEqual(self.search_ids('login'), [self.title_hit.id, self.description_hit.id])
+        self.assertEqual(self.client.get('/api/tasks/', {'q': 'login'}).json()['count'], 2)
+
+    def test_stemming_prefixes_and_filters(self):
+        self.assertEqual(self.search_ids('redirects'), [self.title_hit.id])
+        self.assertEqual(self.search_ids('sess'), [self.description_hit.id])
+        self.assertEqual(self.search_ids('login stale'), [self.description_hit.id])
+        response = self.client.get('/api/tasks/', {'q': 'login', 'status': 'completed'})
+        self.assertEqual(response.json()['data'], [])
+
+    def test_query_syntax_is_treated_as_text(self):
+        for query in ('"login', 'login AND', 'NEAR(', '***', 'title:login'):
+            response = self.client.get('/api/tasks/', {'q': query})
+            self.assertEqual(response.status_code, 200, query)
+
+    def test_index_follows_every_write_path(self):
+        task = TaskService.create_task(title='Quarterly budget', project=self.project)
+        self.assertEqual(self.search_ids('budget'), [task.id])
+
+        TaskService.update_task(task, title='Annual forecast')
+        self.assertEqual(self.search_ids('budget'), [])
+        self.assertEqual(self.search_ids('forecast'), [task.id])
+
+        # Queryset updates bypass signals but not the triggers
+        Task.objects.filter(pk=task.pk).update(description='Includes headcount')
+        self.assertEqual(list(search.search(Task.objects.all(), 'headcount').values_list('id', flat=True)), [task.id])
+
+        TaskService.bulk_create_tasks([{'title': f'Forecast draft {i}', 'project': self.project} for i in range(3)])
+        self.assertEqual(len(self.search_ids('forecast')), 4)
+
+        Task.objects.filter(title__startswith='Forecast draft').delete()
+        task.delete()
+        self.assertEqual(self.search_ids('forecast'), [])
+
+    def test_cursor_pages_follow_relevance_order(self):
+        for i in range(5):
+            Task.objects.create(title=f'Login task {i}', project=self.project)
+        expected = self.search_ids('login')
+        seen = []
+        response = self.client.get('/api/tasks/', {'q': 'login', 'page_size': 2}).json()
+        seen.extend(row['id'] for row in response['data'])
+        while response['next']:
+            response = self.client.get('/api/tasks/', {'q': 'login', 'page_size': 2, 'cursor': response['next']}).json()
+            seen.extend(row['id'] for row in response['data'])
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), 7)
+
+    def test_project_and_async_search(self):
+        Project.objects.create(title='Mobile app', description='Login screen redesign', owner=self.user)
+        response = self.client.get('/api/projects/', {'q': 'website'})
+        self.assertEqual([row['title'] for row in response.json()['data']], ['Website'])
+
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        sync = Client().get('/api/tasks/', {'q': 'login'}, **headers)
+        async_ = Client().get('/api/async/tasks/', {'q': 'login'}, **headers)
+        self.assertEqual(async_.content, sync.content)
+
+    def test_async_search_in_a_fresh_process(self):
+        # No earlier sync request has looked up the index
+        for index in search.INDEXES.values():
+            index._enabled.clear()
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        response = Client().get('/api/async/tasks/', {'q': 'login'}, **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual([row['id'] for row in response.json()['data']], [self.title_hit.id, self.description_hit.id])
+
+    def test_triggers_are_restored_after_a_table_rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER task_task_fts_insert')
+        search.ensure_triggers(sender=None, using='default')
+        task = Task.objects.create(title='Restored trigger', project=self.project)
+        self.assertEqual(self.search_ids('restored'), [task.id])
+
+    def test_falls_back_to_substring_matching_without_an_index(self):
+        with mock.patch.object(search.SearchIndex, 'is_enabled', return_value=False):
+            self.assertCountEqual(self.search_ids('login'), [self.title_hit.id, self.description_hit.id])
+
+    def test_search_composes_with_other_querysets(self):
+        results = search.search(Task.objects.filter(project__owner=self.user), 'login')
+        self.assertEqual(results.query.extra, {})
+        self.assertEqual(list(results.filter(title__startswith='Fix').values_list('id', flat=True)), [self.title_hit.id])
+        both = results.order_by().values('id').union(Task.objects.filter(title__startswith='Write').order_by().values('id'))
+        self.assertEqual(len(both), 3)
+        self.assertEqual(
+            list(Task.objects.filter(pk__in=results.values('pk')).order_by('id').values_list('id', flat=True)),
+            [self.title_hit.id, self.description_hit.id],
+        )
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from project.models import Project
+from sync.models import Tombstone
+from task.models import Task
+
+
+@override_settings(TRACKLY_SYNC={'SETTLE_SECONDS': 0})
+class SyncTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='password')
+        self.project = Project.objects.create(title='Website', owner=self.user)
+        self.tasks = [Task.objects.create(title=f'Task {i}', project=self.project) for i in range(5)]
+        other = User.objects.create_user(username='other', password='password')
+        Task.objects.create(title='Foreign', project=Project.objects.create(title='Other', owner=other))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sync(self, since=None, **params):
+        if since:
+            params['since'] = since
+        response = self.client.get('/api/sync/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def sync_all(self, since=None, **params):
+        """Follow ``has_more`` to the end; returns the merged data and the final cursor."""
+        merged = {'projects': [], 'tasks': [], 'deleted': {'projects': [], 'tasks': []}}
+        while True:
+            body = self.sync(since, **params)
+            for key in ('projects', 'tasks'):
+                merged[key] += body['data'][key]
+                merged['deleted'][key] += body['data']['deleted'][key]
+            since = body['cursor']
+            if not body['has_more']:
+                return merged, since
+
+    def test_full_sync_pages_through_everything(self):
+        data, cursor = self.sync_all(page_size=2)
+
+        self.assertEqual([row['id'] for row in data['projects']], [self.project.id])
+        self.assertEqual(sorted(row['id'] for row in data['tasks']), sorted(task.id for task in self.tasks))
+        listed = self.client.get(f'/api/tasks/{self.tasks[0].id}/').json()['data']
+        del listed['project_name'], listed['project_owner']
+        self.assertIn(listed, data['tasks'])
+
+        # Nothing changed since
+        data, _ = self.sync_all(cursor)
+        self.assertEqual(data, {'projects': [], 'tasks': [], 'deleted': {'projects': [], 'tasks': []}})
+
+    def test_returns_only_changes_and_deletions(self):
+        _, cursor = self.sync_all()
+
+        self.client.patch(f'/api/tasks/{self.tasks[0].id}/update_status/', {'status': 'completed'}, format='json')
+        self.client.post('/api/tasks/bulk/transition/', {'ids': [self.tasks[1].id], 'priority': 'high'}, format='json')
+        self.client.delete(f'/api/tasks/{self.tasks[2].id}/')
+        created = self.client.post('/api/tasks/', {'title': 'New', 'project': self.project.id}, format='json')
+
+        data, cursor = self.sync_all(cursor)
+        self.assertEqual(
+            sorted(row['id'] for row in data['tasks']),
+            sorted([self.tasks[0].id, self.tasks[1].id, created.json()['data']['id']]),
+        )
+        self.assertEqual(data['deleted'], {'projects': [], 'tasks': [self.tasks[2].id]})
+        # Counter changes are part of the project's representation
+        self.assertEqual([row['completed_count'] for row in data['projects']], [1])
+
+    def test_project_rename_reaches_clients(self):
+        data, cursor = self.sync_all()
+        self.assertNotIn('project_name', data['tasks'][0])
+
+        self.client.patch(f'/api/projects/{self.project.id}/', {'title': 'Renamed'}, format='json')
+
+        data, _ = self.sync_all(cursor)
+        self.assertEqual([(row['id'], row['title']) for row in data['projects']], [(self.project.id, 'Renamed')])
+        # Tasks carry only the project id, so none of them holds the old title
+        self.assertEqual(data['tasks'], [])
+
+    def test_project_deletion_covers_its_tasks(self):
+        _, cursor = self.sync_all()
+        self.client.delete(f'/api/projects/{self.project.id}/')
+
+        data, _ = self.sync_all(cursor)
+        self.assertEqual(data['deleted'], {'projects': [self.project.id], 'tasks': []})
+        self.assertEqual(Tombstone.objects.count(), 1)
+
+    @override_settings(TRACKLY_SYNC={'SETTLE_SECONDS': 60})
+    def test_recent_writes_are_held_back(self):
+        data, cursor = self.sync_all()
+        self.assertEqual(data['tasks'], [])
+
+        # The held-back rows come through once they have settled
+        with override_settings(TRACKLY_SYNC={'SETTLE_SECONDS': 0}):
+            data, _ = self.sync_all(cursor)
+        self.assertEqual(len(data['tasks']), 5)
+
+    def test_invalid_and_expired_cursors(self):
+        response = self.client.get('/api/sync/', {'since': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+        _, cursor = self.sync_all()
+        with override_settings(TRACKLY_SYNC={'TOMBSTONE_RETENTION_DAYS': 0}):
+            response = self.client.get('/api/sync/', {'since': cursor})
+        self.assertEqual(response.status_code, 410)
+
+    def test_compact_tombstones(self):
+        self.client.delete(f'/api/tasks/{self.tasks[0].id}/')
+        self.client.delete(f'/api/tasks/{self.tasks[1].id}/')
+        Tombstone.objects.filter(object_id=self.tasks[0].id).update(deleted_at=timezone.now() - timedelta(days=31))
+
+        out = StringIO()
+        call_command('compact_tombstones', stdout=out)
+        self.assertIn('Deleted 1 tombstone', out.getvalue())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [self.tasks[1].id])
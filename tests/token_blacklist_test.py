@@ -0,0 +1,87 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from user.tokens import BloomFilter, FilteredRefreshToken, blacklist_filter
+
+
+class BloomFilterTest(TestCase):
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        members = [f'member-{i}' for i in range(2000)]
+        for value in members:
+            bloom.add(value)
+        self.assertTrue(all(value in bloom for value in members))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class FilteredRefreshTokenTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='password')
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post('/api/auth/refresh_token/', {'refresh': str(token)}, format='json')
+
+    def blacklist_queries(self, queries):
+        return [q['sql'] for q in queries.captured_queries if 'token_blacklist_blacklistedtoken' in q['sql']]
+
+    def test_valid_tokens_skip_the_blacklist_query(self):
+        token = FilteredRefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(token).status_code, 200)  # builds the filter
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.blacklist_queries(queries), [])
+
+    def test_logout_blacklists_immediately(self):
+        token = FilteredRefreshToken.for_user(self.user)
+        self.refresh(token)
+        self.client.force_authenticate(user=self.user)
+        self.client.post('/api/auth/logout/', {'refresh': str(token)}, format='json')
+
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    @override_settings(TRACKLY_TOKEN_BLACKLIST_FILTER={'REFRESH_INTERVAL': 0})
+    def test_picks_up_rows_blacklisted_elsewhere(self):
+        token = FilteredRefreshToken.for_user(self.user)
+        self.refresh(token)
+        # e.g. another worker or the admin
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token['jti']))
+
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_rebuild_loads_existing_blacklist(self):
+        token = FilteredRefreshToken.for_user(self.user)
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token['jti']))
+        blacklist_filter.reset()
+
+        self.assertTrue(blacklist_filter.might_contain(token['jti']))
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+
+class PurgeExpiredTokensTest(TestCase):
+    def test_deletes_only_expired_tokens_in_batches(self):
+        user = User.objects.create_user(username='owner', password='password')
+        now = timezone.now()
+        expired = OutstandingToken.objects.bulk_create([
+            OutstandingToken(user=user, jti=f'old-{i}', token='t', expires_at=now - timedelta(hours=1))
+            for i in range(7)
+        ])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in expired[:3]])
+        live = FilteredRefreshToken.for_user(user)
+        live.blacklist()
+
+        call_command('purge_expired_tokens', batch_size=3, stdout=StringIO())
+
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [live['jti']])
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
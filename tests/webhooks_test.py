@@ -0,0 +1,199 @@
+import hashlib
+import hmac
+import json
+import socket
+import threading
+from datetime import timedelta
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from project.models import Project
+from task.services import TaskService
+from webhooks import delivery
+from webhooks.models import OutboxEvent, WebhookEndpoint
+
+
+class StubReceiver(BaseHTTPRequestHandler):
+    """Records each POST and answers with the next of ``statuses`` (200 when they run out)."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        server = self.server
+        server.requests.append({'headers': dict(self.headers), 'body': body, 'client': self.client_address})
+        status = server.statuses.pop(0) if server.statuses else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+# The stub receiver listens on loopback
+LOCAL = {'SETTLE_SECONDS': 0, 'ALLOW_PRIVATE_HOSTS': True}
+
+
+@override_settings(TRACKLY_WEBHOOKS=LOCAL)
+class WebhookTest(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubReceiver)
+        self.server.requests = []
+        self.server.statuses = []
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.user = User.objects.create_user(username='owner', password='password')
+        self.project = Project.objects.create(title='Website', owner=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def register(self):
+        response = self.client.post(
+            '/api/webhooks/', {'url': f'http://127.0.0.1:{self.server.server_port}/hook'}, format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()['data']
+
+    def deliver(self):
+        call_command('deliver_webhooks', '--once', stdout=open('/dev/null', 'w'))
+
+    def received_events(self):
+        return [event for request in self.server.requests for event in json.loads(request['body'])['events']]
+
+    def test_write_paths_record_events_in_their_transaction(self):
+        task = self.client.post('/api/tasks/', {'title': 'A', 'project': self.project.id}, format='json').json()['data']
+        self.client.patch(f'/api/tasks/{task["id"]}/', {'title': 'B'}, format='json')
+        self.client.patch(f'/api/tasks/{task["id"]}/update_status/', {'status': 'completed'}, format='json')
+        self.client.post('/api/tasks/bulk/', {'tasks': [{'title': 'C', 'project': self.project.id}]}, format='json')
+        self.client.post('/api/tasks/bulk/transition/', {'project': self.project.id, 'priority': 'high'}, format='json')
+        self.client.delete(f'/api/tasks/{task["id"]}/')
+        self.client.patch(f'/api/projects/{self.project.id}/', {'title': 'Site'}, format='json')
+        self.client.patch(f'/api/projects/{self.project.id}/update_status/', {'status': 'archived'}, format='json')
+        self.client.delete(f'/api/projects/{self.project.id}/')
+
+        recorded = [f'{model}.{action}' for model, action in OutboxEvent.objects.order_by('id').values_list('model', 'action')]
+        self.assertEqual(recorded, [
+            'task.created', 'task.updated', 'task.updated', 'task.created', 'task.updated', 'task.updated',
+            'task.deleted', 'project.updated', 'project.updated', 'project.deleted',
+        ])
+
+        count = OutboxEvent.objects.count()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            TaskService.create_task(title='Rolled back', project=Project.objects.create(title='P', owner=self.user))
+            raise RuntimeError
+        self.assertEqual(OutboxEvent.objects.count(), count)
+
+    @override_settings(TRACKLY_WEBHOOKS={**LOCAL, 'BATCH_SIZE': 2, 'CONCURRENCY': 1})
+    def test_delivers_signed_coalesced_batches_over_one_connection(self):
+        endpoint = self.register()
+        first = TaskService.create_task(title='First', project=self.project)
+        TaskService.update_task(first, title='First, renamed')
+        second = TaskService.create_task(title='Second', project=self.project)
+        TaskService.update_task_status(second, 'completed')
+        gone = TaskService.create_task(title='Gone', project=self.project)
+        TaskService.delete_task(gone)
+        last_event_id = OutboxEvent.objects.order_by('id').last().id
+        self.deliver()
+
+        events = self.received_events()
+        self.assertEqual([(event['type'], event['object_id']) for event in events],
+                         [('task.created', first.id), ('task.created', second.id)])
+        self.assertEqual(events[0]['data']['title'], 'First, renamed')
+        self.assertEqual(events[1]['data']['status'], 'completed')
+        # Three batches of two events; the last coalesces to nothing and is not sent
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(len({request['client'] for request in self.server.requests}), 1)
+        for request in self.server.requests:
+            expected = 'sha256=' + hmac.new(endpoint['secret'].encode(), request['body'], hashlib.sha256).hexdigest()
+            self.assertEqual(request['headers']['X-Trackly-Signature'], expected)
+        self.assertEqual(WebhookEndpoint.objects.get().last_event_id, last_event_id)
+
+        # Delivered events are pruned
+        self.assertEqual(OutboxEvent.objects.count(), 0)
+
+    def test_failures_back_off_then_deactivate(self):
+        self.register()
+        self.server.statuses = [500, 503]
+        task = TaskService.create_task(title='Retry me', project=self.project)
+        self.deliver()
+
+        endpoint = WebhookEndpoint.objects.get()
+        self.assertEqual((endpoint.failures, endpoint.last_error), (1, 'HTTP 500'))
+        self.assertGreater(endpoint.next_attempt_at, timezone.now())
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+        # Not due yet
+        self.deliver()
+        self.assertEqual(len(self.server.requests), 1)
+
+        WebhookEndpoint.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        with override_settings(TRACKLY_WEBHOOKS={**LOCAL, 'MAX_FAILURES': 2}):
+            self.deliver()
+        endpoint.refresh_from_db()
+        self.assertFalse(endpoint.is_active)
+        self.assertEqual(OutboxEvent.objects.count(), 0)
+
+        # Reactivated endpoints receive what happens from then on
+        response = self.client.patch(f'/api/webhooks/{endpoint.id}/', {'is_active': True}, format='json')
+        self.assertEqual(response.json()['data']['failures'], 0)
+        TaskService.update_task(task, title='Back')
+        self.deliver()
+        self.assertEqual([event['data']['title'] for event in self.received_events()], ['Retry me', 'Retry me', 'Back'])
+
+    def test_unreachable_endpoint(self):
+        WebhookEndpoint.objects.create(owner=self.user, url='http://127.0.0.1:1/hook')
+        TaskService.create_task(title='Lost', project=self.project)
+        self.assertEqual(delivery.Deliverer().run_round(), (1, 0, 0))
+        self.assertIn('Error', WebhookEndpoint.objects.get().last_error)
+
+    @override_settings(TRACKLY_WEBHOOKS={'SETTLE_SECONDS': 0})
+    def test_rejects_non_public_destinations(self):
+        for url in ('http://127.0.0.1:8000/hook', 'http://169.254.169.254/latest/meta-data/',
+                    'http://10.0.0.5/hook', 'http://[::1]/hook', 'http://[::ffff:192.168.1.1]/hook',
+                    'ftp://203.0.113.7/hook'):
+            response = self.client.post('/api/webhooks/', {'url': url}, format='json')
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn('url', response.json()['errors'])
+        response = self.client.post('/api/webhooks/', {'url': 'https://93.184.216.34/hook'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        endpoint_id = response.json()['data']['id']
+        response = self.client.patch(f'/api/webhooks/{endpoint_id}/', {'url': 'http://localhost/hook'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        # Checked again before delivery, e.g. after a DNS change
+        WebhookEndpoint.objects.filter(pk=endpoint_id).update(url=f'http://127.0.0.1:{self.server.server_port}/hook')
+        TaskService.create_task(title='Internal', project=self.project)
+        self.deliver()
+        self.assertEqual(self.server.requests, [])
+        self.assertIn('non-public', WebhookEndpoint.objects.get().last_error)
+
+    @override_settings(TRACKLY_WEBHOOKS={'SETTLE_SECONDS': 0})
+    def test_rejects_hosts_rebinding_to_private_addresses(self):
+        resolve = socket.getaddrinfo
+        answers = ['93.184.216.34']
+
+        def rebinding(host, port, *args, **kwargs):
+            # Public for the check, then the stub receiver on loopback
+            if host == 'rebind.example':
+                address = answers.pop(0) if answers else '127.0.0.1'
+                return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (address, port))]
+            return resolve(host, port, *args, **kwargs)
+
+        WebhookEndpoint.objects.create(owner=self.user, url=f'http://rebind.example:{self.server.server_port}/hook')
+        TaskService.create_task(title='Internal', project=self.project)
+        with mock.patch('socket.getaddrinfo', side_effect=rebinding):
+            self.deliver()
+
+        self.assertEqual(answers, [])
+        self.assertEqual(self.server.requests, [])
+        endpoint = WebhookEndpoint.objects.get()
+        self.assertEqual((endpoint.failures, endpoint.last_error), (1, 'rebind.example connected to a non-public address'))
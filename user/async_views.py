@@ -0,0 +1,19 @@
+from rest_framework import status
+from Trackly.async_views import AsyncReadView
+from .authentication import aload_user_fields
+from .serializers import UserProfileSerializer
+
+
+class ProfileView(AsyncReadView):
+    """Async ``GET /api/auth/profile/``; the user comes from the async token lookup."""
+
+    async def respond(self, request):
+        serializer = UserProfileSerializer(await aload_user_fields(request.user))
+        return self.render(
+            {
+                'success': True,
+                'message': 'Profile retrieved successfully',
+                'data': serializer.data
+            },
+            status.HTTP_200_OK
+        )
@@ -0,0 +1,216 @@
+"""
+JWT authentication for the API.
+
+``CachedJWTAuthentication`` keeps what authentication checks about a user
+(id, ``is_active`` and a digest of the password hash) in a cache for a short
+TTL, so most requests validate the token without querying ``auth_user``. On
+a hit ``request.user`` has only ``id`` and ``is_active`` loaded; views that
+show or change profile fields call ``load_user_fields`` first.
+
+Entries are dropped whenever a ``User`` is saved or deleted (profile
+updates, deactivation, password changes; see ``user/signals.py``). The
+cache is the shared ``responses`` alias, so with a file or Redis backend a
+deactivation reaches every worker at once. Queryset ``update()`` calls
+bypass the signals and are only picked up once the TTL expires.
+
+Each authentication is timed. The duration and whether the cache was hit are
+stored on the request for ``AuthTimingMiddleware`` and added to per-process
+counters readable with ``get_stats()`` and to the exported cache metrics.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from Trackly import metrics
+
+
+DEFAULT_AUTH_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'responses',
+    'TIMEOUT': 60,
+}
+
+# Loaded on cache hits; everything else is deferred
+AUTH_FIELDS = ('id', 'is_active')
+
+_stats_lock = threading.Lock()
+_stats = {'requests': 0, 'hits': 0, 'misses': 0, 'seconds': 0.0}
+
+
+def get_config():
+    return {**DEFAULT_AUTH_CACHE, **getattr(settings, 'TRACKLY_AUTH_CACHE', {})}
+
+
+def get_cache():
+    return caches[get_config()['ALIAS']]
+
+
+def user_cache_key(user_id):
+    return f'trackly:auth-user:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    get_cache().delete(user_cache_key(user_id))
+
+
+def cache_entry(user):
+    """What authentication checks about ``user``; the password hash itself is not cached."""
+    return {'id': user.pk, 'is_active': user.is_active, 'password_digest': get_md5_hash_password(user.password)}
+
+
+def load_user_fields(user):
+    """Load the fields a cache hit left deferred, in one query."""
+    deferred = user.get_deferred_fields()
+    if deferred:
+        user.refresh_from_db(fields=deferred)
+    return user
+
+
+async def aload_user_fields(user):
+    deferred = user.get_deferred_fields()
+    if deferred:
+        await user.arefresh_from_db(fields=deferred)
+    return user
+
+
+def get_stats():
+    """Authentication counters for this process, including the mean duration in ms."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['mean_ms'] = stats['seconds'] * 1000 / stats['requests'] if stats['requests'] else 0.0
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.update(requests=0, hits=0, misses=0, seconds=0.0)
+
+
+def record_timing(request, seconds, cache_state):
+    """Attach the timing to the underlying ``HttpRequest`` and count it."""
+    http_request = getattr(request, '_request', request)
+    http_request.auth_timing = {'seconds': seconds, 'cache': cache_state}
+    with _stats_lock:
+        _stats['requests'] += 1
+        _stats['seconds'] += seconds
+        if cache_state == 'hit':
+            _stats['hits'] += 1
+        elif cache_state == 'miss':
+            _stats['misses'] += 1
+    if cache_state is not None:
+        metrics.count_cache('auth', cache_state == 'hit')
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` with coroutine entry points for async views.
+
+    Header parsing and token validation are pure CPU work and are reused as-is;
+    only the user lookup goes through the async ORM.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        return self.check_user(user, validated_token)
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+    def check_user(self, user, validated_token):
+        self.check_entry(cache_entry(user), validated_token)
+        return user
+
+    def check_entry(self, entry, validated_token):
+        if not entry['is_active']:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != entry['password_digest']:
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+
+class CachedJWTAuthentication(AsyncJWTAuthentication):
+    """JWT authentication that checks the user against a short-lived cache entry."""
+    cache_state = None
+
+    def cached_user(self, entry, validated_token):
+        self.check_entry(entry, validated_token)
+        return self.user_model.from_db(DEFAULT_DB_ALIAS, AUTH_FIELDS, [entry[field] for field in AUTH_FIELDS])
+
+    def authenticate(self, request):
+        started = time.perf_counter()
+        self.cache_state = None
+        try:
+            return super().authenticate(request)
+        finally:
+            record_timing(request, time.perf_counter() - started, self.cache_state)
+
+    async def aauthenticate(self, request):
+        started = time.perf_counter()
+        self.cache_state = None
+        try:
+            return await super().aauthenticate(request)
+        finally:
+            record_timing(request, time.perf_counter() - started, self.cache_state)
+
+    def get_user(self, validated_token):
+        config = get_config()
+        if not config['ENABLED']:
+            return super().get_user(validated_token)
+
+        cache = get_cache()
+        key = user_cache_key(self.get_user_id(validated_token))
+        entry = cache.get(key)
+        if entry is None:
+            self.cache_state = 'miss'
+            user = super().get_user(validated_token)
+            cache.set(key, cache_entry(user), config['TIMEOUT'])
+            return user
+        self.cache_state = 'hit'
+        return self.cached_user(entry, validated_token)
+
+    async def aget_user(self, validated_token):
+        config = get_config()
+        if not config['ENABLED']:
+            return await super().aget_user(validated_token)
+
+        cache = get_cache()
+        key = user_cache_key(self.get_user_id(validated_token))
+        entry = await cache.aget(key)
+        if entry is None:
+            self.cache_state = 'miss'
+            user = await super().aget_user(validated_token)
+            await cache.aset(key, cache_entry(user), config['TIMEOUT'])
+            return user
+        self.cache_state = 'hit'
+        return self.cached_user(entry, validated_token)
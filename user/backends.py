@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from . import hashing
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ``ModelBackend`` that hashes and verifies passwords on the hashing pool.
+
+    ``hashing.PasswordPoolSaturated`` propagates through ``authenticate()``
+    to the view.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user (#20760).
+            hashing.make_password(password)
+        else:
+            def setter(raw_password):
+                # Upgrade the stored hash, as User.check_password does
+                user.password = hashing.make_password(raw_password)
+                user.save(update_fields=['password'])
+
+            if hashing.check_password(password, user.password, setter) and self.user_can_authenticate(user):
+                return user
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            await hashing.amake_password(password)
+        else:
+            async def setter(raw_password):
+                user.password = await hashing.amake_password(raw_password)
+                await user.asave(update_fields=['password'])
+
+            if await hashing.acheck_password(password, user.password, setter) and self.user_can_authenticate(user):
+                return user
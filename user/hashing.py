@@ -0,0 +1,156 @@
+"""
+Password hashing on a bounded process pool.
+
+PBKDF2 is deliberately CPU-bound. Run inline, a burst of logins occupies
+every worker thread and core, and unrelated endpoints queue behind it.
+``make_password`` and ``check_password`` here do the same work as
+``django.contrib.auth.hashers`` in a small process pool, so hashing can use
+at most ``WORKERS`` cores. At most ``MAX_PENDING`` hashes may be queued or
+running per web process; beyond that ``PasswordPoolSaturated`` is raised,
+and the views turn it into ``503`` with ``Retry-After``.
+
+The pool is created lazily in each web process (after any pre-fork), and the
+blocking calls are safe from WSGI threads and from ASGI's sync-to-async
+threads alike. ``amake_password``/``acheck_password`` are awaitable versions
+for async code.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+DEFAULT_PASSWORD_POOL = {
+    'ENABLED': True,
+    'WORKERS': max(1, (os.cpu_count() or 2) // 2),
+    'MAX_PENDING': None,  # defaults to 4 * WORKERS
+    'TIMEOUT': 10,
+    'RETRY_AFTER': 1,
+}
+
+
+# Forking a threaded web worker is unsafe; forkserver/spawn start clean children
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when too many hashes are already queued in this process."""
+
+    def __init__(self, retry_after):
+        super().__init__('Password hashing pool is saturated')
+        self.retry_after = retry_after
+
+
+def get_config():
+    config = {**DEFAULT_PASSWORD_POOL, **getattr(settings, 'TRACKLY_PASSWORD_POOL', {})}
+    if config['MAX_PENDING'] is None:
+        config['MAX_PENDING'] = 4 * config['WORKERS']
+    return config
+
+
+def _init_worker(settings_module):
+    if not settings.configured:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+        import django
+        django.setup()
+
+
+def _make_password(password, salt, hasher):
+    return hashers.make_password(password, salt, hasher)
+
+
+def _verify_password(password, encoded):
+    return hashers.verify_password(password, encoded)
+
+
+class PasswordPool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._pending = 0
+
+    def _get_executor(self, config):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=config['WORKERS'],
+                    mp_context=multiprocessing.get_context(START_METHOD),
+                    initializer=_init_worker,
+                    initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'Trackly.settings'),),
+                )
+                self._pid = os.getpid()
+                self._pending = 0
+            return self._executor
+
+    def submit(self, func, *args):
+        """Queue ``func`` on the pool or raise ``PasswordPoolSaturated``."""
+        config = get_config()
+        executor = self._get_executor(config)
+        with self._lock:
+            if self._pending >= config['MAX_PENDING']:
+                raise PasswordPoolSaturated(config['RETRY_AFTER'])
+            self._pending += 1
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def run(self, func, *args):
+        config = get_config()
+        try:
+            return self.submit(func, *args).result(timeout=config['TIMEOUT'])
+        except FutureTimeoutError:
+            raise PasswordPoolSaturated(config['RETRY_AFTER'])
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+pool = PasswordPool()
+
+
+def make_password(password, salt=None, hasher='default'):
+    if not get_config()['ENABLED'] or password is None:
+        return hashers.make_password(password, salt, hasher)
+    return pool.run(_make_password, password, salt, hasher)
+
+
+def check_password(password, encoded, setter=None):
+    """``hashers.check_password`` with the verification on the pool."""
+    if not get_config()['ENABLED'] or not password or not hashers.is_password_usable(encoded):
+        return hashers.check_password(password, encoded, setter)
+    is_correct, must_update = pool.run(_verify_password, password, encoded)
+    if setter and is_correct and must_update:
+        setter(password)
+    return is_correct
+
+
+async def amake_password(password, salt=None, hasher='default'):
+    if not get_config()['ENABLED'] or password is None:
+        return hashers.make_password(password, salt, hasher)
+    return await asyncio.wrap_future(pool.submit(_make_password, password, salt, hasher))
+
+
+async def acheck_password(password, encoded, setter=None):
+    if not get_config()['ENABLED'] or not password or not hashers.is_password_usable(encoded):
+        return await hashers.acheck_password(password, encoded, setter)
+    is_correct, must_update = await asyncio.wrap_future(pool.submit(_verify_password, password, encoded))
+    if setter and is_correct and must_update:
+        await setter(password)
+    return is_correct
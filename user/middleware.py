@@ -0,0 +1,26 @@
+from django.utils.deprecation import MiddlewareMixin
+
+from Trackly import instrumentation
+from Trackly.instrumentation import append_server_timing
+
+
+class AuthTimingMiddleware(MiddlewareMixin):
+    """
+    Report the JWT authentication time as a ``Server-Timing`` entry.
+
+    Like the other timings, the header is only sent with
+    ``TRACKLY_INSTRUMENTATION['SERVER_TIMING']``; the counters and metrics
+    are recorded either way.
+    """
+
+    def process_response(self, request, response):
+        config = instrumentation.get_config()
+        if not (config['ENABLED'] and config['SERVER_TIMING']):
+            return response
+        timing = getattr(request, 'auth_timing', None)
+        if timing is not None:
+            entry = 'auth;dur=%.3f' % (timing['seconds'] * 1000)
+            if timing['cache']:
+                entry += ';desc="%s"' % timing['cache']
+            append_server_timing(response, entry)
+        return response
@@ -3,6 +3,8 @@ from django.contrib.auth.models import User
 from django.db import transaction
 from rest_framework import serializers
 
+from . import hashing
+
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration."""
@@ -20,7 +22,15 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        user = User.objects.create_user(**validated_data)
+        password = validated_data.pop('password')
+        # Passed by callers that hash before opening a transaction
+        password_hash = validated_data.pop('password_hash', None)
+        # Same as create_user(), with the hash computed on the hashing pool
+        user = User(**validated_data)
+        user.username = User.normalize_username(user.username)
+        user.email = User.objects.normalize_email(user.email)
+        user.password = password_hash or hashing.make_password(password)
+        user.save()
         return user
 
 
@@ -0,0 +1,14 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .authentication import invalidate_cached_user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    """Profile updates, deactivation and password changes all save the user."""
+    invalidate_cached_user(instance.pk)
+    # A request racing the transaction may re-cache the old row before commit
+    transaction.on_commit(lambda: invalidate_cached_user(instance.pk))
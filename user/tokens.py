@@ -0,0 +1,136 @@
+"""
+Refresh tokens with an in-process blacklist filter.
+
+simplejwt checks every refresh token against the ``token_blacklist`` tables
+with a JOIN on the JTI. ``FilteredRefreshToken`` first asks a Bloom filter of
+blacklisted JTIs: a miss means the token is certainly not blacklisted and the
+query is skipped; a hit (a blacklisted token or a rare false positive) falls
+through to the usual database check.
+
+The filter is built on first use from the unexpired blacklisted tokens
+(expired tokens are rejected before the blacklist is consulted). Tokens this
+process blacklists are added immediately. Rows written by other processes
+are picked up by an incremental refresh, by primary key, at most every
+``REFRESH_INTERVAL`` seconds; that interval is how long another worker can
+still accept a token that was just blacklisted elsewhere. Set it to ``0`` to
+refresh before every check.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+DEFAULT_BLACKLIST_FILTER = {
+    'ENABLED': True,
+    'REFRESH_INTERVAL': 1.0,
+    'FALSE_POSITIVE_RATE': 0.001,
+    'MIN_CAPACITY': 10_000,
+    # Re-read this many ids below the newest one seen, so rows whose
+    # transactions commit out of id order are not skipped
+    'ID_LOOKBACK': 1000,
+}
+
+
+def get_config():
+    return {**DEFAULT_BLACKLIST_FILTER, **getattr(settings, 'TRACKLY_TOKEN_BLACKLIST_FILTER', {})}
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, sized for ``capacity`` items at ``error_rate``."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class BlacklistFilter:
+    """Bloom filter of blacklisted JTIs, kept in step with ``BlacklistedToken``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.bloom = None
+            self.entries = 0
+            self.last_id = 0
+            self.refreshed_at = 0.0
+
+    def might_contain(self, jti):
+        self.refresh()
+        return jti in self.bloom
+
+    def add(self, jti):
+        self.refresh()
+        with self._lock:
+            self.bloom.add(jti)
+
+    def refresh(self, force=False):
+        config = get_config()
+        if not force and self.bloom is not None and time.monotonic() - self.refreshed_at < config['REFRESH_INTERVAL']:
+            return
+        with self._lock:
+            if self.bloom is None or self.entries > self.bloom.capacity:
+                self._rebuild(config)
+            else:
+                self._load(self.bloom, BlacklistedToken.objects.filter(id__gt=self.last_id - config['ID_LOOKBACK']))
+            self.refreshed_at = time.monotonic()
+
+    def _rebuild(self, config):
+        rows = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        capacity = max(config['MIN_CAPACITY'], rows.count() * 2)
+        bloom = BloomFilter(capacity, config['FALSE_POSITIVE_RATE'])
+        self.entries = 0
+        self.last_id = 0
+        self._load(bloom, rows)
+        self.bloom = bloom
+
+    def _load(self, bloom, rows):
+        for row_id, jti in rows.order_by('id').values_list('id', 'token__jti').iterator(chunk_size=10_000):
+            bloom.add(jti)
+            if row_id > self.last_id:
+                self.entries += 1
+                self.last_id = row_id
+
+
+blacklist_filter = BlacklistFilter()
+
+
+class FilteredRefreshToken(RefreshToken):
+    """``RefreshToken`` that only queries the blacklist for JTIs the filter may contain."""
+
+    def check_blacklist(self):
+        if not get_config()['ENABLED']:
+            return super().check_blacklist()
+        if blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        if get_config()['ENABLED']:
+            blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
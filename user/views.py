@@ -3,15 +3,19 @@ from rest_framework import serializers
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.db import transaction
+from Trackly.db_router import ReplicaReadMixin
+from .authentication import load_user_fields
+from . import hashing
+from .hashing import PasswordPoolSaturated
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer
+from .tokens import FilteredRefreshToken
 
 
-class UserViewSet(viewsets.GenericViewSet):
+class UserViewSet(ReplicaReadMixin, viewsets.GenericViewSet):
     """
     ViewSet for user authentication and profile management.
     Provides registration, login, logout, and profile operations.
@@ -33,25 +37,28 @@ class UserViewSet(viewsets.GenericViewSet):
         return UserProfileSerializer
     
     @action(detail=False, methods=['post'])
-    @transaction.atomic
     def register(self, request):
         """Register a new user."""
         try:
             serializer = self.get_serializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             
-            # Check if username already exists
-            if User.objects.filter(username=serializer.validated_data['username']).exists():
-                return Response(
-                    {
-                        'success': False,
-                        'message': 'Username already exists'
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            # Hash before the transaction: SQLite takes the write lock at BEGIN
+            # (IMMEDIATE), and hashing may queue on the password pool
+            password_hash = hashing.make_password(serializer.validated_data['password'])
+            with transaction.atomic():
+                # Check if username already exists
+                if User.objects.filter(username=serializer.validated_data['username']).exists():
+                    return Response(
+                        {
+                            'success': False,
+                            'message': 'Username already exists'
+                        },
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                
+                user = serializer.save(password_hash=password_hash)
+            refresh = FilteredRefreshToken.for_user(user)
             
             return Response(
                 {
@@ -74,6 +81,16 @@ class UserViewSet(viewsets.GenericViewSet):
                 },
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except PasswordPoolSaturated as e:
+            response = Response(
+                {
+                    'success': False,
+                    'message': 'Too many registrations in progress, retry shortly'
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+            response['Retry-After'] = str(e.retry_after)
+            return response
         except Exception as e:
             return Response(
                 {
@@ -98,7 +115,7 @@ class UserViewSet(viewsets.GenericViewSet):
             
             if user:
                 if user.is_active:
-                    refresh = RefreshToken.for_user(user)
+                    refresh = FilteredRefreshToken.for_user(user)
                     return Response(
                         {
                             'success': True,
@@ -127,6 +144,16 @@ class UserViewSet(viewsets.GenericViewSet):
                     },
                     status=status.HTTP_401_UNAUTHORIZED
                 )
+        except PasswordPoolSaturated as e:
+            response = Response(
+                {
+                    'success': False,
+                    'message': 'Too many logins in progress, retry shortly'
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+            response['Retry-After'] = str(e.retry_after)
+            return response
         except Exception as e:
             return Response(
                 {
@@ -143,7 +170,7 @@ class UserViewSet(viewsets.GenericViewSet):
         try:
             refresh_token = request.data.get('refresh')
             if refresh_token:
-                token = RefreshToken(refresh_token)
+                token = FilteredRefreshToken(refresh_token)
                 token.blacklist()
             
             return Response(
@@ -165,7 +192,7 @@ class UserViewSet(viewsets.GenericViewSet):
     @action(detail=False, methods=['get'])
     def profile(self, request):
         """Get user profile."""
-        serializer = UserProfileSerializer(request.user)
+        serializer = UserProfileSerializer(load_user_fields(request.user))
         return Response(
             {
                 'success': True,
@@ -180,7 +207,7 @@ class UserViewSet(viewsets.GenericViewSet):
         """Update user profile."""
         try:
             serializer = UserProfileSerializer(
-                request.user, 
+                load_user_fields(request.user), 
                 data=request.data, 
                 partial=True
             )
@@ -228,7 +255,7 @@ class UserViewSet(viewsets.GenericViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             return Response(
                 {
                     'success': True,
@@ -0,0 +1,277 @@
+"""
+Batched webhook delivery from the outbox.
+
+Each round of ``Deliverer.run_round``:
+
+1. claims up to ``ENDPOINTS_PER_ROUND`` active endpoints that are due and
+   have events after their ``last_event_id``, with a lease so concurrent
+   workers skip them;
+2. reads up to ``BATCH_SIZE`` of each endpoint's events and coalesces the
+   events of each object into one, carrying the object's current
+   representation (a task created and updated twice is sent once, as
+   ``task.created`` with its latest fields);
+3. POSTs one JSON body per endpoint, ``CONCURRENCY`` at a time, over a
+   pool of keep-alive connections;
+4. moves ``last_event_id`` past the batch on a 2xx response, or schedules
+   a retry with exponential backoff and jitter otherwise. Endpoints failing
+   ``MAX_FAILURES`` times in a row are deactivated.
+
+Bodies are signed with the endpoint's secret: ``X-Trackly-Signature`` is
+``sha256=`` followed by the hex HMAC-SHA256 of the body. URLs are checked
+against non-public addresses before every POST, and so is the address each
+connection reaches (see ``destinations.py``).
+"""
+import hashlib
+import hmac
+import json
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import urllib3
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from rest_framework import serializers
+from Trackly.fast_serializers import ValuesSerializer
+from project.models import Project
+from project.serializers import ProjectSerializer
+from task.models import Task
+from task.serializers import TaskSerializer
+from .destinations import DisallowedDestination, check_url, pool_classes
+from .models import OutboxEvent, WebhookEndpoint
+
+
+DEFAULT_WEBHOOKS = {
+    # Outbox events read per endpoint and POST
+    'BATCH_SIZE': 500,
+    'ENDPOINTS_PER_ROUND': 64,
+    # POSTs in flight, and pooled connections per host
+    'CONCURRENCY': 8,
+    'TIMEOUT': 5.0,
+    'LEASE_SECONDS': 60,
+    'BACKOFF_SECONDS': 2.0,
+    'MAX_BACKOFF_SECONDS': 3600.0,
+    'MAX_FAILURES': 10,
+    # Events younger than this wait for the next round (see ``Deliverer.run_round``)
+    'SETTLE_SECONDS': 1.0,
+    # Allow URLs on loopback, private and link-local addresses (development only)
+    'ALLOW_PRIVATE_HOSTS': False,
+}
+
+SERIALIZERS = {
+    'project': (Project, ProjectSerializer),
+    'task': (Task, TaskSerializer),
+}
+EVENT_FIELDS = ('id', 'model', 'object_id', 'action', 'created_at')
+FETCH_CHUNK_SIZE = 500
+
+_timestamp = serializers.DateTimeField()
+
+
+def get_config():
+    return {**DEFAULT_WEBHOOKS, **getattr(settings, 'TRACKLY_WEBHOOKS', {})}
+
+
+def sign(secret, body):
+    return 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def coalesce(events):
+    """
+    One ``(event, action)`` per object of ``events`` (oldest first), ordered by its last event.
+
+    ``event`` is the object's last event. An object created in the batch
+    stays ``created``; one deleted is ``deleted``, or left out if it was
+    also created in the batch.
+    """
+    first_actions = {}
+    last_events = {}
+    for event in events:
+        key = (event['model'], event['object_id'])
+        first_actions.setdefault(key, event['action'])
+        last_events.pop(key, None)
+        last_events[key] = event
+    result = []
+    for key, event in last_events.items():
+        first = first_actions[key]
+        if event['action'] == 'deleted':
+            if first == 'created':
+                continue
+            result.append((event, 'deleted'))
+        else:
+            result.append((event, 'created' if first == 'created' else 'updated'))
+    return result
+
+
+def representations(model, ids):
+    """``{id: representation}`` of the ``model`` objects that still exist."""
+    model_class, serializer_class = SERIALIZERS[model]
+    fast = ValuesSerializer.for_serializer(serializer_class)
+    ids = sorted(ids)
+    result = {}
+    for start in range(0, len(ids), FETCH_CHUNK_SIZE):
+        rows = fast.get_queryset(model_class.objects.filter(pk__in=ids[start:start + FETCH_CHUNK_SIZE]))
+        for row in fast.to_representation(rows):
+            result[row['id']] = row
+    return result
+
+
+def backoff(failures, config):
+    """Seconds before retrying after ``failures`` consecutive failures, with jitter."""
+    delay = min(config['BACKOFF_SECONDS'] * 2 ** (failures - 1), config['MAX_BACKOFF_SECONDS'])
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def prune():
+    """Delete the outbox events no active endpoint still has to receive; returns how many."""
+    waiting = WebhookEndpoint.objects.filter(
+        owner_id=OuterRef('owner_id'), is_active=True, last_event_id__lt=OuterRef('id'),
+    )
+    return OutboxEvent.objects.filter(~Exists(waiting)).delete()[0]
+
+
+class Deliverer:
+    """Delivers outbox events; holds the connection pool and the sending threads."""
+
+    def __init__(self, config=None):
+        self.config = config or get_config()
+        self.pool = urllib3.PoolManager(
+            num_pools=self.config['ENDPOINTS_PER_ROUND'],
+            maxsize=self.config['CONCURRENCY'],
+            block=True,
+            retries=False,
+            timeout=urllib3.Timeout(total=self.config['TIMEOUT']),
+        )
+        self.pool.pool_classes_by_scheme = pool_classes(self.config['ALLOW_PRIVATE_HOSTS'])
+        self.executor = ThreadPoolExecutor(self.config['CONCURRENCY'], thread_name_prefix='webhooks')
+
+    def close(self):
+        self.executor.shutdown()
+        self.pool.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def run_round(self):
+        """
+        Deliver one batch to each claimed endpoint; returns ``(endpoints, requests, events)``.
+
+        Outbox ids are assigned before the writing transaction commits, so
+        an event could become visible after an endpoint's ``last_event_id``
+        moved past it. Only events older than ``SETTLE_SECONDS`` are read,
+        which covers transactions shorter than that.
+        """
+        now = timezone.now()
+        settled = OutboxEvent.objects.filter(created_at__lt=now - timedelta(seconds=self.config['SETTLE_SECONDS']))
+        endpoints = self.claim(settled, now)
+        if not endpoints:
+            return 0, 0, 0
+        batches = [
+            (endpoint, list(
+                settled.filter(owner_id=endpoint.owner_id, id__gt=endpoint.last_event_id)
+                .order_by('id').values(*EVENT_FIELDS)[:self.config['BATCH_SIZE']]
+            ))
+            for endpoint in endpoints
+        ]
+        deliveries = self.build(batches)
+        results = self.executor.map(self.post, deliveries)
+
+        sent = events = 0
+        now = timezone.now()
+        for (endpoint, last_event_id, payload_events, _), error in zip(deliveries, results):
+            if error is None:
+                WebhookEndpoint.objects.filter(pk=endpoint.pk).update(
+                    last_event_id=last_event_id, failures=0, last_error='', next_attempt_at=None, leased_until=None,
+                )
+                if payload_events:
+                    sent += 1
+                    events += payload_events
+            else:
+                failures = endpoint.failures + 1
+                WebhookEndpoint.objects.filter(pk=endpoint.pk).update(
+                    failures=failures,
+                    last_error=error[:200],
+                    next_attempt_at=now + timedelta(seconds=backoff(failures, self.config)),
+                    leased_until=None,
+                    is_active=failures < self.config['MAX_FAILURES'],
+                )
+        return len(endpoints), sent, events
+
+    def claim(self, settled, now):
+        """Lease the due endpoints with ``settled`` events to deliver, most behind first."""
+        free = Q(leased_until__isnull=True) | Q(leased_until__lte=now)
+        pending = settled.filter(owner_id=OuterRef('owner_id'), id__gt=OuterRef('last_event_id'))
+        ids = list(
+            WebhookEndpoint.objects.filter(free, Exists(pending), is_active=True)
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by('last_event_id', 'id').values_list('id', flat=True)[:self.config['ENDPOINTS_PER_ROUND']]
+        )
+        if not ids:
+            return []
+        until = now + timedelta(seconds=self.config['LEASE_SECONDS'])
+        WebhookEndpoint.objects.filter(free, pk__in=ids).update(leased_until=until)
+        # Endpoints another worker leased in the meantime carry its lease, not ours
+        return list(WebhookEndpoint.objects.filter(pk__in=ids, leased_until=until).order_by('last_event_id', 'id'))
+
+    def build(self, batches):
+        """``(endpoint, last_event_id, event_count, body)`` per batch; ``body`` is ``None`` if nothing is left."""
+        coalesced = [(endpoint, events, coalesce(events)) for endpoint, events in batches]
+        wanted = {model: set() for model in SERIALIZERS}
+        for _, _, merged in coalesced:
+            for event, action in merged:
+                if action != 'deleted':
+                    wanted[event['model']].add(event['object_id'])
+        current = {model: representations(model, ids) for model, ids in wanted.items() if ids}
+
+        deliveries = []
+        for endpoint, events, merged in coalesced:
+            payload = []
+            for event, action in merged:
+                data = None
+                if action != 'deleted':
+                    data = current[event['model']].get(event['object_id'])
+                    if data is None:
+                        # Deleted since; its own event follows in a later batch
+                        continue
+                payload.append({
+                    'id': event['id'],
+                    'type': f'{event["model"]}.{action}',
+                    'object_id': event['object_id'],
+                    'occurred_at': _timestamp.to_representation(event['created_at']),
+                    'data': data,
+                })
+            body = None
+            if payload:
+                body = json.dumps({'events': payload}, separators=(',', ':')).encode()
+            deliveries.append((endpoint, events[-1]['id'], len(payload), body))
+        return deliveries
+
+    def post(self, delivery):
+        """Send one delivery; returns ``None`` on success or the error."""
+        endpoint, _, _, body = delivery
+        if body is None:
+            return None
+        headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': 'Trackly-Webhooks/1.0',
+            'X-Trackly-Delivery': str(uuid.uuid4()),
+            'X-Trackly-Signature': sign(endpoint.secret, body),
+        }
+        try:
+            check_url(endpoint.url, self.config['ALLOW_PRIVATE_HOSTS'])
+        except DisallowedDestination as exc:
+            return str(exc)
+        try:
+            response = self.pool.request('POST', endpoint.url, body=body, headers=headers)
+        except DisallowedDestination as exc:
+            return str(exc)
+        except (urllib3.exceptions.HTTPError, ValueError) as exc:
+            return f'{type(exc).__name__}: {exc}'
+        if 200 <= response.status < 300:
+            return None
+        return f'HTTP {response.status}'
@@ -0,0 +1,87 @@
+"""
+Which webhook URLs the worker may POST to.
+
+Endpoints are registered by any user and the worker runs inside the
+network, so a URL resolving to a loopback, private, link-local or otherwise
+non-public address (``127.0.0.1``, ``10.0.0.0/8``, ``169.254.169.254``, ...)
+would let users reach internal services. ``check_url`` resolves the host and
+rejects such addresses when an endpoint is registered or changed, and before
+every delivery.
+
+A host can answer the check with a public address and the connection with a
+private one (DNS rebinding), so the delivery pools also use connection
+classes that check the address each socket actually connected to before
+anything is sent (``pool_classes``).
+
+``TRACKLY_WEBHOOKS['ALLOW_PRIVATE_HOSTS']`` turns the check off, for
+development against receivers on the same machine.
+"""
+import ipaddress
+import socket
+from urllib.parse import urlsplit
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class DisallowedDestination(ValueError):
+    pass
+
+
+def is_public(address):
+    address = ipaddress.ip_address(address.split('%', 1)[0])
+    if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    return address.is_global and not address.is_multicast
+
+
+def check_url(url, allow_private_hosts=False):
+    """Raise ``DisallowedDestination`` unless ``url`` is http(s) and its host resolves to public addresses only."""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise DisallowedDestination('Only http and https URLs with a host are allowed')
+    if allow_private_hosts:
+        return
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)}
+    except (OSError, ValueError, UnicodeError):
+        raise DisallowedDestination(f'Could not resolve {parts.hostname}')
+    if not all(is_public(address) for address in addresses):
+        raise DisallowedDestination(f'{parts.hostname} resolves to a non-public address')
+
+
+class CheckedConnectionMixin:
+    """Refuse sockets connected to a non-public peer, before TLS or the request."""
+    allow_private_hosts = False
+
+    def _new_conn(self):
+        sock = super()._new_conn()
+        if not self.allow_private_hosts and not is_public(sock.getpeername()[0]):
+            sock.close()
+            raise DisallowedDestination(f'{self.host} connected to a non-public address')
+        return sock
+
+
+class CheckedHTTPConnection(CheckedConnectionMixin, HTTPConnection):
+    pass
+
+
+class CheckedHTTPSConnection(CheckedConnectionMixin, HTTPSConnection):
+    pass
+
+
+def pool_classes(allow_private_hosts=False):
+    """``PoolManager.pool_classes_by_scheme`` whose connections are checked as above."""
+    connections = {
+        'http': (HTTPConnectionPool, CheckedHTTPConnection),
+        'https': (HTTPSConnectionPool, CheckedHTTPSConnection),
+    }
+    return {
+        scheme: type(pool_class.__name__, (pool_class,), {
+            'ConnectionCls': type(connection_class.__name__, (connection_class,), {
+                'allow_private_hosts': allow_private_hosts,
+            }),
+        })
+        for scheme, (pool_class, connection_class) in connections.items()
+    }
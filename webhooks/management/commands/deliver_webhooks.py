@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from webhooks.delivery import Deliverer, prune
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver outbox events to the registered webhook endpoints in batches. Runs until '
+        'stopped, polling every --interval seconds when idle; with --once it exits when '
+        'nothing is left to deliver. Several workers may run side by side.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit once nothing is due.')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds to sleep when there is nothing to deliver.')
+        parser.add_argument('--prune-interval', type=float, default=60.0,
+                            help='Seconds between deletions of the events every endpoint has received.')
+
+    def handle(self, *args, **options):
+        requests = events = pruned = 0
+        last_prune = time.monotonic()
+        with Deliverer() as deliverer:
+            while True:
+                claimed, sent, delivered = deliverer.run_round()
+                requests += sent
+                events += delivered
+                idle = not claimed
+                if idle or time.monotonic() - last_prune >= options['prune_interval']:
+                    pruned += prune()
+                    last_prune = time.monotonic()
+                if idle:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Delivered {events} event(s) in {requests} request(s); pruned {pruned} event(s).'
+        ))
@@ -0,0 +1,66 @@
+import secrets
+
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+
+
+def generate_secret():
+    return secrets.token_hex(32)
+
+
+class OutboxEvent(models.Model):
+    """A project or task change, written in the transaction that made it."""
+    MODEL_CHOICES = [
+        ('project', 'Project'),
+        ('task', 'Task'),
+    ]
+    
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+    
+    # No foreign key: events outlive the rows they describe
+    owner_id = models.IntegerField()
+    model = models.CharField(max_length=10, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        indexes = [
+            # Each endpoint reads its owner's events after its last delivered id
+            models.Index(fields=['owner_id', 'id'], name='outbox_owner_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.model}.{self.action} {self.object_id}"
+
+
+class WebhookEndpoint(models.Model):
+    """
+    A URL receiving its owner's project and task events.
+
+    ``last_event_id`` is the newest ``OutboxEvent`` delivered to it, so
+    every endpoint keeps its own position in the outbox.
+    """
+    owner = models.ForeignKey(User, related_name='webhook_endpoints', on_delete=models.CASCADE)
+    url = models.URLField(max_length=500)
+    # Signs each delivery (``X-Trackly-Signature``)
+    secret = models.CharField(max_length=64, default=generate_secret)
+    is_active = models.BooleanField(default=True)
+    last_event_id = models.BigIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    last_error = models.CharField(max_length=200, blank=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    # Claimed by a delivery worker until then
+    leased_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.url} - {self.owner.username}"
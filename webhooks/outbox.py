@@ -0,0 +1,20 @@
+"""
+Transactional outbox of project and task changes.
+
+Write paths call ``record`` inside the transaction that changes the rows, so
+an event exists exactly when its change committed. The
+``deliver_webhooks`` command reads the outbox and posts the events to each
+owner's webhook endpoints (see ``webhooks/delivery.py``).
+
+Events are recorded whether or not the owner has an endpoint; delivery
+prunes the ones no active endpoint still needs.
+"""
+from .models import OutboxEvent
+
+
+def record(action, model, owner_id, object_ids):
+    """Add one ``model``/``action`` event per id; call it inside the writing transaction."""
+    OutboxEvent.objects.bulk_create([
+        OutboxEvent(owner_id=owner_id, model=model, object_id=object_id, action=action)
+        for object_id in object_ids
+    ])
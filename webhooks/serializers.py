@@ -0,0 +1,19 @@
+from rest_framework import serializers
+from .delivery import get_config
+from .destinations import DisallowedDestination, check_url
+from .models import WebhookEndpoint
+
+
+class WebhookEndpointSerializer(serializers.ModelSerializer):
+    """Registered endpoint; the secret is returned so receivers can verify signatures."""
+    class Meta:
+        model = WebhookEndpoint
+        fields = ('id', 'url', 'secret', 'is_active', 'failures', 'last_error', 'next_attempt_at', 'created_at')
+        read_only_fields = ('secret', 'failures', 'last_error', 'next_attempt_at', 'created_at')
+
+    def validate_url(self, value):
+        try:
+            check_url(value, get_config()['ALLOW_PRIVATE_HOSTS'])
+        except DisallowedDestination as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
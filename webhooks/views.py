@@ -0,0 +1,98 @@
+from django.db.models import Max
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .models import OutboxEvent, WebhookEndpoint
+from .serializers import WebhookEndpointSerializer
+
+
+def latest_event_id():
+    return OutboxEvent.objects.aggregate(last=Max('id'))['last'] or 0
+
+
+class WebhookEndpointViewSet(viewsets.GenericViewSet):
+    """
+    Register, list, change and remove the user's webhook endpoints.
+
+    An endpoint receives the events recorded while it is active: from its
+    registration, or from setting ``is_active`` again after it was
+    deactivated (by the user, or after repeated failures).
+    """
+    serializer_class = WebhookEndpointSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+    
+    def get_queryset(self):
+        return WebhookEndpoint.objects.filter(owner=self.request.user)
+    
+    def list(self, request, *args, **kwargs):
+        """List the user's webhook endpoints."""
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response(
+            {
+                'success': True,
+                'message': 'Webhook endpoints retrieved successfully',
+                'data': serializer.data
+            },
+            status=status.HTTP_200_OK
+        )
+    
+    def create(self, request, *args, **kwargs):
+        """Register an endpoint for the user's project and task events."""
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'success': False,
+                    'message': 'Validation error',
+                    'errors': serializer.errors
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer.save(owner=request.user, last_event_id=latest_event_id())
+        return Response(
+            {
+                'success': True,
+                'message': 'Webhook endpoint registered successfully',
+                'data': serializer.data
+            },
+            status=status.HTTP_201_CREATED
+        )
+    
+    def partial_update(self, request, *args, **kwargs):
+        """Change the URL or (re)activate the endpoint."""
+        endpoint = self.get_object()
+        serializer = self.get_serializer(endpoint, data=request.data, partial=True)
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'success': False,
+                    'message': 'Validation error',
+                    'errors': serializer.errors
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        changes = {}
+        if serializer.validated_data.get('is_active') and not endpoint.is_active:
+            # Events from while it was inactive have been pruned; start afresh
+            changes = {'last_event_id': latest_event_id(), 'failures': 0, 'last_error': '', 'next_attempt_at': None}
+        serializer.save(**changes)
+        return Response(
+            {
+                'success': True,
+                'message': 'Webhook endpoint updated successfully',
+                'data': serializer.data
+            },
+            status=status.HTTP_200_OK
+        )
+    
+    def destroy(self, request, *args, **kwargs):
+        """Remove an endpoint; undelivered events for it are dropped."""
+        self.get_object().delete()
+        return Response(
+            {
+                'success': True,
+                'message': 'Webhook endpoint deleted successfully'
+            },
+            status=status.HTTP_204_NO_CONTENT
+        )